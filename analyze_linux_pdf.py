@@ -2,18 +2,42 @@
 分析 Linux教程.pdf 的结构
 识别章节、代码块等元素
 """
-from app.services.pdf import PDFParser, PDFExtractor
-import sys
-import os
 import re
 from pathlib import Path
 
-os.chdir("backend")
-sys.path.insert(0, ".")
+# 预编译正则（模块级，每个进程只编译一次）
+# 标题模式：用 [ \t] 代替 \s 防止跨行吞并，并为各重复项设置上界，
+# 避免以数字开头的长正文行触发大量回溯；编号后的点号与空白仍可省略
+_CHAPTER_RE = re.compile(
+    r'^(?:第[一二三四五六七八九十\d]{1,6}章|Chapter[ \t]+\d+'
+    r'|[0-9]{1,3}(?:\.[0-9]{1,3}){0,4}\.?[ \t]*[^\n]{1,50})[ \t]*$',
+    re.MULTILINE | re.IGNORECASE
+)
+_SECTION_RE = re.compile(
+    r'^(?:[0-9]{1,3}\.[0-9]{1,3}\.?[ \t]+[^\n]{1,80}'
+    r'|[一二三四五六七八九十]{1,4}[、.][ \t]*[^\n]{1,80})[ \t]*$',
+    re.MULTILINE
+)
+# 各模式的匹配可能相互重叠（如代码块内的行内代码），因此逐个扫描分别计数
+_CODE_PATTERNS = (
+    re.compile(r'```[\s\S]*?```', re.MULTILINE),  # Markdown 代码块
+    re.compile(r'`[^`]+`', re.MULTILINE),  # 行内代码
+    re.compile(r'^\s*[$#]\s+\w+', re.MULTILINE),  # Shell 命令
+    re.compile(r'^\s{4,}\w+', re.MULTILINE),  # 缩进代码
+)
+_CODE_MARKER_RE = re.compile(r'[$#]\s+\w+|```')
+_CMD_KEYWORDS_RE = re.compile(
+    r'(sudo|apt|yum|cd|ls|mkdir|chmod)', re.IGNORECASE)
+_CHAPNUM_RE = re.compile(r'^[0-9]+\.[0-9]+', re.MULTILINE)
+_CJK_RE = re.compile(r'[\u4e00-\u9fff]')
+_LATIN_RE = re.compile(r'[a-zA-Z]{3,}')
 
 
 def analyze_linux_tutorial():
     """分析 Linux 教程的文档结构"""
+    # 延迟导入：仅在调用时依赖 backend 包，导入本模块不产生副作用
+    from app.services.pdf import PDFParser, PDFExtractor
+
     print("=" * 70)
     print("📚 Linux 教程 PDF 结构分析")
     print("=" * 70)
@@ -35,27 +59,28 @@ def analyze_linux_tutorial():
     # 2. 提取文本
     print("\n2️⃣ 提取文本内容...")
     extractor = PDFExtractor(pdf_path)
-    structured_text = extractor.extract_structured_text()
 
-    total_chars = sum(len(page['text']) for page in structured_text)
+    # 单次流式遍历：只保留分析所需的前 10 页窗口，其余页面仅累计统计
+    head_pages = []
+    total_chars = 0
+    page_count = 0
+    for page in extractor.extract_structured_text_iter():
+        if page_count < 10:
+            head_pages.append(page)
+        # 提取器已为每页记录 char_count，无需再次计算 len()
+        total_chars += page['char_count']
+        page_count += 1
+
     print(f"   总字符数: {total_chars:,}")
-    print(f"   有效页数: {len(structured_text)}")
+    print(f"   有效页数: {page_count}")
 
     # 3. 分析章节结构
     print("\n3️⃣ 章节结构分析:")
-    chapter_pattern = re.compile(
-        r'^(第[一二三四五六七八九十\d]+章|Chapter\s+\d+|[0-9]+\.?\s*[^\n]{1,50})\s*$',
-        re.MULTILINE | re.IGNORECASE
-    )
-    section_pattern = re.compile(
-        r'^([0-9]+\.[0-9]+\.?\s+[^\n]{1,80}|[一二三四五六七八九十]+[、\.]\s*[^\n]{1,80})\s*$',
-        re.MULTILINE
-    )
-
-    all_text = '\n\n'.join([page['text'] for page in structured_text[:10]])
+    all_text = '\n\n'.join(page['text'] for page in head_pages)
+    head_text = all_text[:5000]
 
-    chapters = chapter_pattern.findall(all_text)
-    sections = section_pattern.findall(all_text[:5000])
+    chapters = _CHAPTER_RE.findall(all_text)
+    sections = _SECTION_RE.findall(head_text)
 
     print(f"   检测到章节标题: {len(chapters)} 个")
     if chapters:
@@ -71,37 +96,32 @@ def analyze_linux_tutorial():
 
     # 4. 分析代码块
     print("\n4️⃣ 代码块分析:")
-    code_patterns = [
-        r'```[\s\S]*?```',  # Markdown 代码块
-        r'`[^`]+`',  # 行内代码
-        r'^\s*[$#]\s+\w+',  # Shell 命令
-        r'^\s{4,}\w+',  # 缩进代码
-    ]
+    sample_text = '\n'.join(page['text'] for page in head_pages[:5])
 
-    sample_text = '\n'.join([page['text'] for page in structured_text[:5]])
-
-    for i, pattern in enumerate(code_patterns, 1):
-        matches = re.findall(pattern, sample_text, re.MULTILINE)
+    for i, pattern in enumerate(_CODE_PATTERNS, 1):
+        matches = pattern.findall(sample_text)
         print(f"   模式 {i}: 找到 {len(matches)} 个匹配")
         if matches and i <= 2:
             print(f"      示例: {matches[0][:60]}...")
 
     # 5. 显示前几页内容示例
     print("\n5️⃣ 内容示例 (第1-2页):")
-    for i, page in enumerate(structured_text[:2], 1):
+    for i, page in enumerate(head_pages[:2], 1):
         print(f"\n   --- 第 {i} 页 ---")
         text_preview = page['text'][:300]
         print(f"   {text_preview}...")
-        print(f"   字符数: {len(page['text'])}")
+        print(f"   字符数: {page['char_count']}")
 
     # 6. 识别文档类型特征
     print("\n6️⃣ 文档特征识别:")
+    head_1k = all_text[:1000]
     features = {
-        '包含代码': bool(re.search(r'[$#]\s+\w+|```', all_text[:5000])),
-        '包含命令': bool(re.search(r'(sudo|apt|yum|cd|ls|mkdir|chmod)', all_text[:5000], re.IGNORECASE)),
-        '包含章节编号': bool(re.search(r'^[0-9]+\.[0-9]+', all_text[:5000], re.MULTILINE)),
-        '包含中文': bool(re.search(r'[\u4e00-\u9fff]', all_text[:1000])),
-        '包含英文': bool(re.search(r'[a-zA-Z]{3,}', all_text[:1000])),
+        '包含代码': bool(_CODE_MARKER_RE.search(head_text)),
+        '包含命令': bool(_CMD_KEYWORDS_RE.search(head_text)),
+        '包含章节编号': bool(_CHAPNUM_RE.search(head_text)),
+        # isascii() 读取的是字符串对象上的缓存标志（O(1)），纯 ASCII 时无需扫描
+        '包含中文': not head_1k.isascii() and bool(_CJK_RE.search(head_1k)),
+        '包含英文': bool(_LATIN_RE.search(head_1k)),
     }
 
     for feature, exists in features.items():
@@ -114,4 +134,9 @@ def analyze_linux_tutorial():
 
 
 if __name__ == "__main__":
+    import os
+    import sys
+
+    os.chdir("backend")
+    sys.path.insert(0, ".")
     analyze_linux_tutorial()
@@ -2,44 +2,62 @@
 深度分析 Linux教程.pdf 的章节结构
 提取目录、章节、小节信息
 """
-from app.services.pdf import PDFParser, PDFExtractor
-import sys
-import os
 import re
 from pathlib import Path
 from collections import defaultdict
 
-os.chdir("backend")
-sys.path.insert(0, ".")
+# 预编译正则（模块级，每个进程只编译一次）
+_HEADING_PATTERNS = {
+    'chapter_num': re.compile(r'^第\s*([一二三四五六七八九十百\d]+)\s*章\s+([^\n]{3,50})', re.MULTILINE),
+    'section_dot': re.compile(r'^(\d+\.?\d*\.?\d*)\s+([^\n]{3,80})$', re.MULTILINE),
+    'section_chinese': re.compile(r'^([一二三四五六七八九十]+)[、.]\s*([^\n]{3,60})$', re.MULTILINE),
+    'subsection': re.compile(r'^(\d+\.\d+\.\d+)\s+([^\n]{3,80})$', re.MULTILINE),
+}
+_PAGE_HEADING_RE = re.compile(
+    r'^(第.{1,10}章\s+.{3,50}|^\d+\.?\d*\s+[^\n]{5,60})',
+    re.MULTILINE
+)
+# 各指标的匹配可能相互重叠，因此逐个扫描分别计数；
+# 带分组的模式 findall 返回捕获到的关键词，用作示例
+_CODE_INDICATORS = {
+    'shell命令': re.compile(r'[\$#]\s*(sudo|apt|cd|ls|mkdir|chmod|cat|echo)\s', re.MULTILINE | re.IGNORECASE),
+    'C语言': re.compile(r'(int|void|char|return|printf|include)\s*[\(\{]', re.MULTILINE | re.IGNORECASE),
+    '配置文件': re.compile(r'^\s*[A-Za-z_]+\s*=\s*.+$', re.MULTILINE | re.IGNORECASE),
+    '代码缩进': re.compile(r'^\s{4,}\w+', re.MULTILINE | re.IGNORECASE),
+}
 
 
 def extract_toc_and_structure():
     """提取目录和文档结构"""
+    # 在函数内导入，模块被导入时不要求 backend 已在 sys.path 中
+    from app.services.pdf import PDFExtractor
+
     print("=" * 70)
     print("📖 提取 Linux 教程目录结构")
     print("=" * 70)
 
     pdf_path = Path("../Linux教程.pdf")
     extractor = PDFExtractor(pdf_path)
-    structured_text = extractor.extract_structured_text()
+
+    # 单次流式遍历：前 60 页按窗口保留，之后的页面只累计统计
+    window_pages = []
+    total_chars = 0
+    page_count = 0
+    for page in extractor.extract_structured_text_iter():
+        if page_count < 60:
+            window_pages.append(page)
+        total_chars += page['char_count']
+        page_count += 1
 
     # 提取前30页（通常包含目录）
-    toc_pages = structured_text[:30]
-    toc_text = '\n'.join([page['text'] for page in toc_pages])
+    toc_pages = window_pages[:30]
+    toc_text = '\n'.join(page['text'] for page in toc_pages)
 
     print("\n1️⃣ 分析目录结构...")
 
-    # 多种章节模式
-    patterns = {
-        'chapter_num': re.compile(r'^第\s*([一二三四五六七八九十百\d]+)\s*章\s+([^\n]{3,50})', re.MULTILINE),
-        'section_dot': re.compile(r'^(\d+\.?\d*\.?\d*)\s+([^\n]{3,80})$', re.MULTILINE),
-        'section_chinese': re.compile(r'^([一二三四五六七八九十]+)[、.]\s*([^\n]{3,60})$', re.MULTILINE),
-        'subsection': re.compile(r'^(\d+\.\d+\.\d+)\s+([^\n]{3,80})$', re.MULTILINE),
-    }
-
     all_headings = []
 
-    for pattern_name, pattern in patterns.items():
+    for pattern_name, pattern in _HEADING_PATTERNS.items():
         matches = pattern.findall(toc_text)
         for match in matches:
             all_headings.append({
@@ -71,19 +89,16 @@ def extract_toc_and_structure():
 
     # 2. 分析实际内容页
     print("\n\n2️⃣ 分析实际内容页 (第31-60页)...")
-    content_pages = structured_text[30:60]
+    content_pages = window_pages[30:60]
 
     for i, page in enumerate(content_pages[:10], 31):
         text = page['text']
-        if len(text) > 100:
-            print(f"\n   --- 第 {i} 页 ({len(text)} 字符) ---")
+        char_count = page['char_count']
+        if char_count > 100:
+            print(f"\n   --- 第 {i} 页 ({char_count} 字符) ---")
 
             # 查找章节标题
-            chapter_match = re.search(
-                r'^(第.{1,10}章\s+.{3,50}|^\d+\.?\d*\s+[^\n]{5,60})',
-                text,
-                re.MULTILINE
-            )
+            chapter_match = _PAGE_HEADING_RE.search(text)
             if chapter_match:
                 print(f"   📌 标题: {chapter_match.group(0).strip()}")
 
@@ -95,19 +110,11 @@ def extract_toc_and_structure():
 
     # 3. 查找代码块特征
     print("\n\n3️⃣ 代码块特征分析...")
-    sample_pages = structured_text[40:60]
-    sample_text = '\n'.join([p['text'] for p in sample_pages])
-
-    code_indicators = {
-        'shell命令': r'[\$#]\s*(sudo|apt|cd|ls|mkdir|chmod|cat|echo)\s',
-        'C语言': r'(int|void|char|return|printf|include)\s*[\(\{]',
-        '配置文件': r'^\s*[A-Za-z_]+\s*=\s*.+$',
-        '代码缩进': r'^\s{4,}\w+',
-    }
-
-    for indicator, pattern in code_indicators.items():
-        matches = re.findall(pattern, sample_text,
-                             re.MULTILINE | re.IGNORECASE)
+    sample_pages = window_pages[40:60]
+    sample_text = '\n'.join(p['text'] for p in sample_pages)
+
+    for indicator, pattern in _CODE_INDICATORS.items():
+        matches = pattern.findall(sample_text)
         if matches:
             print(f"   ✅ {indicator}: 找到 {len(matches)} 处")
             if matches[:2]:
@@ -115,13 +122,12 @@ def extract_toc_and_structure():
 
     # 4. 章节长度统计
     print("\n\n4️⃣ 估算章节长度...")
-    print(f"   总页数: {len(structured_text)}")
-    print(
-        f"   平均每页字符: {sum(len(p['text']) for p in structured_text) / len(structured_text):.0f}")
+    print(f"   总页数: {page_count}")
+    print(f"   平均每页字符: {total_chars / page_count:.0f}")
 
     # 假设有10-20个章节
     estimated_chapters = 15
-    avg_chapter_pages = len(structured_text) / estimated_chapters
+    avg_chapter_pages = page_count / estimated_chapters
     print(f"   估算章节数: ~{estimated_chapters}")
     print(f"   平均每章页数: ~{avg_chapter_pages:.0f}")
 
@@ -129,4 +135,9 @@ def extract_toc_and_structure():
 
 
 if __name__ == "__main__":
+    import os
+    import sys
+
+    os.chdir("backend")
+    sys.path.insert(0, ".")
     extract_toc_and_structure()
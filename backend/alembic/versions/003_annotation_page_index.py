@@ -0,0 +1,29 @@
+"""Cover annotation page-ordered reads with a composite index
+
+Revision ID: 003_annotation_page_index
+Revises: 002_annotations_tags
+Create Date: 2025-10-09 10:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '003_annotation_page_index'
+down_revision = '002_annotations_tags'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # (document_id, page_number, created_at) serves both the WHERE and the
+    # ORDER BY of per-document listings; the old two-column index is a prefix
+    op.create_index('idx_annotations_document_page_created', 'annotations',
+                    ['document_id', 'page_number', 'created_at'])
+    op.drop_index('idx_annotations_page', table_name='annotations')
+
+
+def downgrade() -> None:
+    op.create_index('idx_annotations_page', 'annotations',
+                    ['document_id', 'page_number'])
+    op.drop_index('idx_annotations_document_page_created',
+                  table_name='annotations')
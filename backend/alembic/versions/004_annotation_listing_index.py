@@ -0,0 +1,33 @@
+"""Extend the annotation listing index with the id tiebreaker
+
+Revision ID: 004_annotation_listing_index
+Revises: 003_annotation_page_index
+Create Date: 2025-10-10 10:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '004_annotation_listing_index'
+down_revision = '003_annotation_page_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Listings order by (page_number, created_at, id) and keyset pages seek
+    # on that same tuple, so the index carries id as its last column.
+    # Built concurrently so writes to annotations are not blocked on PostgreSQL.
+    with op.get_context().autocommit_block():
+        op.create_index('idx_annotations_document_listing', 'annotations',
+                        ['document_id', 'page_number', 'created_at', 'id'],
+                        postgresql_concurrently=True)
+    op.drop_index('idx_annotations_document_page_created',
+                  table_name='annotations')
+
+
+def downgrade() -> None:
+    op.create_index('idx_annotations_document_page_created', 'annotations',
+                    ['document_id', 'page_number', 'created_at'])
+    op.drop_index('idx_annotations_document_listing',
+                  table_name='annotations')
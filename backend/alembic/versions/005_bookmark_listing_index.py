@@ -0,0 +1,44 @@
+"""Index bookmark listings for keyset pagination
+
+Revision ID: 005_bookmark_listing_index
+Revises: 004_annotation_listing_index
+Create Date: 2025-10-11 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '005_bookmark_listing_index'
+down_revision = '004_annotation_listing_index'
+branch_labels = None
+depends_on = None
+
+
+def _has_bookmarks() -> bool:
+    return sa.inspect(op.get_bind()).has_table('bookmarks')
+
+
+def upgrade() -> None:
+    # Bookmark listings filter by user (and usually document) and page
+    # newest-first on (created_at, id); the old (user_id, document_id)
+    # index is a prefix of this one. The bookmarks table is created from the
+    # models (create_all), so it may not exist yet, and either index may or
+    # may not exist.
+    if not _has_bookmarks():
+        return
+    with op.get_context().autocommit_block():
+        op.create_index('idx_bookmarks_user_document_created', 'bookmarks',
+                        ['user_id', 'document_id', 'created_at', 'id'],
+                        postgresql_concurrently=True, if_not_exists=True)
+    op.drop_index('idx_bookmarks_user_document', table_name='bookmarks',
+                  if_exists=True)
+
+
+def downgrade() -> None:
+    if not _has_bookmarks():
+        return
+    op.create_index('idx_bookmarks_user_document', 'bookmarks',
+                    ['user_id', 'document_id'], if_not_exists=True)
+    op.drop_index('idx_bookmarks_user_document_created',
+                  table_name='bookmarks', if_exists=True)
@@ -0,0 +1,40 @@
+"""Track the AI summary state of bookmarks
+
+Revision ID: 006_bookmark_ai_status
+Revises: 005_bookmark_listing_index
+Create Date: 2025-10-12 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '006_bookmark_ai_status'
+down_revision = '005_bookmark_listing_index'
+branch_labels = None
+depends_on = None
+
+
+def _bookmark_columns() -> set:
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('bookmarks'):
+        return set()
+    return {column['name'] for column in inspector.get_columns('bookmarks')}
+
+
+def upgrade() -> None:
+    # Bookmarks generated through /bookmarks/generate are stored as
+    # 'pending' and summarized in the background. The bookmarks table is
+    # created from the models (create_all), so it may not exist yet or may
+    # already have the column.
+    columns = _bookmark_columns()
+    if columns and 'ai_status' not in columns:
+        op.add_column('bookmarks', sa.Column(
+            'ai_status', sa.String(20), nullable=False,
+            server_default='completed',
+            comment='AI summary state (pending/completed)'))
+
+
+def downgrade() -> None:
+    if 'ai_status' in _bookmark_columns():
+        op.drop_column('bookmarks', 'ai_status')
@@ -0,0 +1,54 @@
+"""Trigram indexes for bookmark text search
+
+Revision ID: 007_bookmark_search_trgm
+Revises: 006_bookmark_ai_status
+Create Date: 2025-10-12 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '007_bookmark_search_trgm'
+down_revision = '006_bookmark_ai_status'
+branch_labels = None
+depends_on = None
+
+# Columns matched by bookmark search (ILIKE '%query%')
+SEARCH_COLUMNS = ('selected_text', 'ai_summary', 'title', 'user_notes')
+
+
+def _index_name(column: str) -> str:
+    return f'idx_bookmarks_{column}_trgm'
+
+
+def _has_bookmarks() -> bool:
+    # The bookmarks table is created from the models (create_all), so it
+    # may not exist yet on a fresh database
+    bind = op.get_bind()
+    return (bind.dialect.name == 'postgresql'
+            and sa.inspect(bind).has_table('bookmarks'))
+
+
+def upgrade() -> None:
+    # Search matches substrings in mostly Chinese text, which full-text
+    # parsers do not split into words. pg_trgm GIN indexes serve the
+    # existing ILIKE '%query%' filters (combined by a BitmapOr) with the
+    # same results instead of a sequential scan. PostgreSQL only.
+    if not _has_bookmarks():
+        return
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    with op.get_context().autocommit_block():
+        for column in SEARCH_COLUMNS:
+            op.create_index(_index_name(column), 'bookmarks', [column],
+                            postgresql_using='gin',
+                            postgresql_ops={column: 'gin_trgm_ops'},
+                            postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    if not _has_bookmarks():
+        return
+    for column in SEARCH_COLUMNS:
+        op.drop_index(_index_name(column), table_name='bookmarks',
+                      if_exists=True)
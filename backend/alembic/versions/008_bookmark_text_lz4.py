@@ -0,0 +1,52 @@
+"""Compress long bookmark text columns with lz4
+
+Revision ID: 008_bookmark_text_lz4
+Revises: 007_bookmark_search_trgm
+Create Date: 2025-10-13 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '008_bookmark_text_lz4'
+down_revision = '007_bookmark_search_trgm'
+branch_labels = None
+depends_on = None
+
+# Multi-paragraph columns that PostgreSQL TOASTs
+TEXT_COLUMNS = ('selected_text', 'ai_summary', 'user_notes')
+
+
+def _lz4_available() -> bool:
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return False
+    if not sa.inspect(bind).has_table('bookmarks'):
+        return False
+    # Column compression needs PostgreSQL 14+ built with lz4; only then is
+    # lz4 a valid value of default_toast_compression
+    return bool(bind.execute(sa.text(
+        "SELECT 'lz4' = ANY(enumvals) FROM pg_settings "
+        "WHERE name = 'default_toast_compression'"
+    )).scalar())
+
+
+def upgrade() -> None:
+    # lz4 decompresses several times faster than the default pglz, which
+    # matters when listings read these columns for hundreds of rows. Only
+    # values written from now on use it; existing rows keep pglz until
+    # they are updated. This is a catalog-only change, no table rewrite.
+    if not _lz4_available():
+        return
+    for column in TEXT_COLUMNS:
+        op.execute(
+            f'ALTER TABLE bookmarks ALTER COLUMN {column} SET COMPRESSION lz4')
+
+
+def downgrade() -> None:
+    if not _lz4_available():
+        return
+    for column in TEXT_COLUMNS:
+        op.execute(
+            f'ALTER TABLE bookmarks ALTER COLUMN {column} SET COMPRESSION default')
@@ -0,0 +1,28 @@
+"""Index chunks by page range
+
+Revision ID: 009_chunk_page_index
+Revises: 008_bookmark_text_lz4
+Create Date: 2025-10-14 10:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '009_chunk_page_index'
+down_revision = '008_bookmark_text_lz4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # The reading-position context looks up a document's chunks covering a
+    # page. The models declare this index but 001 never created it, so
+    # databases built from create_all already have it.
+    with op.get_context().autocommit_block():
+        op.create_index('idx_chunks_pages', 'chunks',
+                        ['document_id', 'start_page', 'end_page'],
+                        postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_chunks_pages', table_name='chunks', if_exists=True)
@@ -0,0 +1,35 @@
+"""Add embedding cache table
+
+Revision ID: 010_embedding_cache
+Revises: 009_chunk_page_index
+Create Date: 2025-10-16 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '010_embedding_cache'
+down_revision = '009_chunk_page_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Vectors keyed by the hash of the text they encode, so unchanged
+    # chunks are not re-embedded when a document is processed again
+    op.create_table(
+        'embedding_cache',
+        sa.Column('text_hash', sa.String(64), nullable=False),
+        sa.Column('model', sa.String(255), nullable=False),
+        sa.Column('vector', sa.LargeBinary(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False,
+                  server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.Column('updated_at', sa.DateTime(), nullable=False,
+                  server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.PrimaryKeyConstraint('text_hash', 'model'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('embedding_cache')
@@ -7,6 +7,9 @@ from .auth import (
     get_current_active_user,
     get_current_superuser,
     get_optional_current_user,
+    CurrentUser,
+    ActiveUser,
+    SuperUser,
 )
 
 __all__ = [
@@ -16,4 +19,7 @@ __all__ = [
     "get_current_active_user",
     "get_current_superuser",
     "get_optional_current_user",
+    "CurrentUser",
+    "ActiveUser",
+    "SuperUser",
 ]
@@ -4,9 +4,10 @@ Authentication dependencies for FastAPI endpoints.
 Provides dependency injection for authentication and authorization.
 """
 
-from typing import Optional
-from fastapi import Depends, HTTPException, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from typing import Annotated, Optional
+import jwt
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.security import HTTPBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ...core.dependencies import get_db
@@ -16,8 +17,33 @@ from ...models.db import UserModel
 from ...repositories.user_repository import UserRepository
 from ...services.auth_service import AuthService
 
+
+class BearerToken(HTTPBearer):
+    """
+    HTTP Bearer scheme that yields the raw token string.
+
+    Registers the same OpenAPI security scheme as HTTPBearer, but skips
+    building an HTTPAuthorizationCredentials model on every request.
+    """
+
+    async def __call__(self, request: Request) -> Optional[str]:  # type: ignore[override]
+        authorization = request.headers.get("Authorization")
+        if authorization:
+            scheme, _, token = authorization.partition(" ")
+            if token and scheme.lower() == "bearer":
+                return token
+
+        if self.auto_error:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not authenticated"
+            )
+        return None
+
+
 # HTTP Bearer token scheme
-security = HTTPBearer()
+security = BearerToken()
+optional_security = BearerToken(auto_error=False)
 
 
 async def get_user_repository(db: AsyncSession = Depends(get_db)) -> UserRepository:
@@ -33,30 +59,32 @@ async def get_user_repository(db: AsyncSession = Depends(get_db)) -> UserReposit
     return UserRepository(db)
 
 
-async def get_auth_service(
-    user_repo: UserRepository = Depends(get_user_repository)
-) -> AuthService:
+async def get_auth_service(db: AsyncSession = Depends(get_db)) -> AuthService:
     """
     Get authentication service instance.
 
+    Builds the repository inline rather than through get_user_repository,
+    saving one dependency resolution per authenticated request. Kept async:
+    FastAPI dispatches sync dependencies to the threadpool.
+
     Args:
-        user_repo: User repository
+        db: Database session
 
     Returns:
         AuthService instance
     """
-    return AuthService(user_repo)
+    return AuthService(UserRepository(db))
 
 
 async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
+    token: str = Depends(security),
     auth_service: AuthService = Depends(get_auth_service)
 ) -> UserModel:
     """
     Get current authenticated user from JWT token.
 
     Args:
-        credentials: HTTP authorization credentials
+        token: Raw bearer token
         auth_service: Authentication service
 
     Returns:
@@ -65,8 +93,6 @@ async def get_current_user(
     Raises:
         HTTPException: If authentication fails
     """
-    token = credentials.credentials
-
     try:
         user = await auth_service.get_current_user(token)
         if user is None:
@@ -130,23 +156,29 @@ async def get_current_superuser(
     return current_user
 
 
+# Annotated parameter types for endpoints, e.g. ``current_user: ActiveUser``
+CurrentUser = Annotated[UserModel, Depends(get_current_user)]
+ActiveUser = Annotated[UserModel, Depends(get_current_active_user)]
+SuperUser = Annotated[UserModel, Depends(get_current_superuser)]
+
+
 def get_optional_current_user(
-    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security)
+    token: Optional[str] = Depends(optional_security)
 ) -> Optional[str]:
     """
     Get optional current user ID (for public endpoints).
 
     Args:
-        credentials: Optional HTTP authorization credentials
+        token: Optional raw bearer token
 
     Returns:
         User ID or None if not authenticated
     """
-    if credentials is None:
+    # A JWT always has three dot-separated segments; skip decoding otherwise
+    if not token or token.count(".") != 2:
         return None
 
-    token = credentials.credentials
     try:
         return AuthUtils.get_user_id_from_token(token)
-    except:
+    except (AuthenticationError, jwt.PyJWTError, ValueError):
         return None
@@ -0,0 +1,53 @@
+"""
+Keyset pagination helpers for API endpoints.
+
+A cursor is the opaque, URL-safe encoding of the sort key of the last
+row on a page; the next page seeks past that key instead of using OFFSET.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, List
+
+from fastapi import HTTPException, status
+
+
+def encode_cursor(*key: Any) -> str:
+    """
+    Encode a sort key into an opaque cursor.
+
+    Args:
+        key: Sort key values; datetimes are stored in ISO format
+
+    Returns:
+        URL-safe cursor string
+    """
+    values = [v.isoformat() if isinstance(v, datetime) else v for v in key]
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor: Cursor string from a previous response
+        size: Expected number of key values
+
+    Returns:
+        Raw key values; callers convert them to column types
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except ValueError:
+        values = None
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+    return values
@@ -0,0 +1,162 @@
+"""
+Response helpers for API endpoints.
+
+Endpoints that return a Response instance bypass FastAPI's
+jsonable_encoder and response_model re-validation; the decorator's
+response_model is still used for the OpenAPI schema. Everything else is
+rendered by OrjsonResponse, the application's default response class.
+"""
+
+import hashlib
+import os
+from decimal import Decimal
+from typing import Any, Optional
+from urllib.parse import quote
+from uuid import UUID
+
+import orjson
+from fastapi import Request, status
+from fastapi.responses import FileResponse, JSONResponse, Response
+from pydantic import BaseModel
+
+
+def _orjson_default(obj: Any) -> Any:
+    """Encode the types orjson does not handle natively."""
+    if isinstance(obj, (UUID, Decimal)):
+        return str(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dump_json(content: Any) -> bytes:
+    """Serialize plain Python data (dicts, lists, datetimes) with orjson."""
+    return orjson.dumps(
+        content,
+        default=_orjson_default,
+        option=orjson.OPT_NON_STR_KEYS,
+    )
+
+
+class OrjsonResponse(JSONResponse):
+    """JSON response rendered by orjson in a single C-level pass."""
+
+    def render(self, content: Any) -> bytes:
+        return dump_json(content)
+
+
+def model_response(
+    model: BaseModel,
+    status_code: int = status.HTTP_200_OK,
+    exclude_none: bool = False,
+    by_alias: bool = False
+) -> Response:
+    """
+    Serialize an already-validated schema straight to a JSON response.
+
+    Args:
+        model: Pydantic schema instance to send
+        status_code: HTTP status code of the response
+        exclude_none: Omit fields whose value is None
+        by_alias: Use serialization aliases as keys, as response_model does
+
+    Returns:
+        JSON response rendered by pydantic-core
+    """
+    return Response(
+        content=model.model_dump_json(exclude_none=exclude_none,
+                                      by_alias=by_alias),
+        status_code=status_code,
+        media_type="application/json"
+    )
+
+
+def body_etag(body: bytes) -> str:
+    """Strong ETag derived from the bytes of a response body."""
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Check a request's If-None-Match header against an ETag."""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    # Weak comparison, as RFC 9110 requires for If-None-Match
+    candidates = {tag.strip().removeprefix("W/")
+                  for tag in if_none_match.split(",")}
+    return etag in candidates or "*" in candidates
+
+
+def conditional_response(request: Request, body: bytes) -> Response:
+    """
+    Send a JSON body with an ETag, or 304 if the client already has it.
+
+    Args:
+        request: Incoming request, read for If-None-Match
+        body: Serialized JSON body
+
+    Returns:
+        200 response carrying the body and its ETag, or an empty 304
+    """
+    etag = body_etag(body)
+    # Let browsers keep the body but revalidate it on every use
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED,
+                        headers=headers)
+    return Response(content=body, media_type="application/json",
+                    headers=headers)
+
+
+def conditional_file_response(
+    request: Request,
+    path: str,
+    content_hash: str,
+    filename: str,
+    media_type: str,
+    max_age: int = 300,
+    accel_redirect: Optional[str] = None,
+    cache_control: Optional[str] = None
+) -> Response:
+    """
+    Send a stored file, or 304 if the client already has it.
+
+    Args:
+        request: Incoming request, read for If-None-Match
+        path: File path
+        content_hash: Hash of the file content, used as its ETag
+        filename: Download filename
+        media_type: Content type of the file
+        max_age: Seconds browsers may reuse the file without asking
+        accel_redirect: Internal NGINX URI of the file; if given, the body
+            is left to NGINX to send with sendfile
+        cache_control: Cache-Control value replacing the private max_age one
+
+    Returns:
+        File response with ETag and Last-Modified, or an empty 304
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+    """
+    stat_result = os.stat(path)
+    etag = f'"{content_hash}"'
+    headers = {"ETag": etag,
+               "Cache-Control": cache_control or f"private, max-age={max_age}"}
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED,
+                        headers=headers)
+    if accel_redirect is not None:
+        # NGINX sends the file from its internal location, keeping
+        # Content-Type, Content-Disposition and Cache-Control from here
+        headers["X-Accel-Redirect"] = accel_redirect
+        headers["Content-Disposition"] = _content_disposition(filename)
+        return Response(media_type=media_type, headers=headers)
+    # FileResponse adds Last-Modified from the stat result and keeps our ETag
+    return FileResponse(path, media_type=media_type, filename=filename,
+                        stat_result=stat_result, headers=headers)
+
+
+def _content_disposition(filename: str) -> str:
+    """Attachment header for a filename, RFC 5987-encoded if not ASCII-safe."""
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"attachment; filename*=utf-8''{quoted}"
+    return f'attachment; filename="{filename}"'
@@ -2,30 +2,72 @@
 Annotation API endpoints.
 
 Provides CRUD endpoints to create, list, update and delete annotations.
+Unexpected errors propagate to the application-level exception handler.
 """
 
-from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime
+from typing import Annotated, Any, List, Literal, Optional, Union
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, status
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import Response
+from pydantic import TypeAdapter, ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ....core.dependencies import get_db
 from ....core.logging import get_logger
+from ....models.db import AnnotationModel
 from ....schemas.annotation import (
+    AnnotationBatchCreate,
+    AnnotationBatchItem,
+    AnnotationBatchResult,
     AnnotationCreate,
     AnnotationResponse,
     AnnotationListResponse,
+    AnnotationSummaryListResponse,
     AnnotationUpdate,
 )
 from ....repositories.annotation_repository import AnnotationRepository
+from ....services import annotation_cache
+from ...pagination import decode_cursor, encode_cursor
+from ...responses import model_response
 
 logger = get_logger(__name__)
 router = APIRouter()
 
+# Upper bound on rows per bulk request, to keep each transaction small
+MAX_BULK_ANNOTATIONS = 500
+
+# Validates and serializes /bulk results in one pydantic-core pass
+_annotation_list_adapter = TypeAdapter(List[AnnotationResponse])
+
 
 async def get_annotation_repo(db: AsyncSession = Depends(get_db)) -> AnnotationRepository:
     return AnnotationRepository(db)
 
 
+# Parsed by pydantic-core during routing; malformed ids get a 422
+AnnotationId = Annotated[UUID, Path(description="Annotation ID")]
+
+
+def _encode_cursor(item: Any) -> str:
+    """Encode the listing sort key of the last returned annotation"""
+    return encode_cursor(item.page_number, item.created_at, item.id)
+
+
+def _decode_cursor(cursor: str) -> tuple:
+    """Decode a next_cursor value into a (page_number, created_at, id) key"""
+    page_number, created_at, annotation_id = decode_cursor(cursor, 3)
+    try:
+        return int(page_number), datetime.fromisoformat(created_at), str(annotation_id)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
 @router.post(
     "/",
     response_model=AnnotationResponse,
@@ -36,167 +78,181 @@ async def create_annotation(
     repo: AnnotationRepository = Depends(get_annotation_repo),
 ):
     """Create a new PDF annotation"""
-    try:
-        # Create model instance from schema
-        from ....models.db import AnnotationModel
-        model = AnnotationModel(
-            document_id=data.document_id,
-            user_id=data.user_id,
-            annotation_type=data.annotation_type,
-            page_number=data.page_number,
-            data=data.data,  # Store complete annotation data as JSON
-            content=data.content,
-            color=data.color,
-            tags=data.tags,
-            user_name=data.user_name,
-        )
-
-        # Save to database
-        created_model = await repo.create(model)
-
-        logger.info(
-            f"Created annotation {created_model.id} for document {data.document_id}")
-        return created_model
-    except Exception as e:
-        logger.error(f"Failed to create annotation: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=str(e)
-        )
+    # Create model instance from schema
+    model = AnnotationModel(
+        document_id=data.document_id,
+        user_id=data.user_id,
+        annotation_type=data.annotation_type,
+        page_number=data.page_number,
+        data=data.data,  # Store complete annotation data as JSON
+        content=data.content,
+        color=data.color,
+        tags=data.tags,
+        user_name=data.user_name,
+    )
+
+    # Save to database
+    created_model = await repo.create(model)
+
+    # Commit first: a read between invalidation and the request's
+    # commit would re-cache the pre-write rows
+    await repo.commit()
+    await annotation_cache.invalidate_documents([data.document_id])
+
+    logger.info(
+        f"Created annotation {created_model.id} for document {data.document_id}")
+    return model_response(
+        AnnotationResponse.model_validate(created_model),
+        status_code=status.HTTP_201_CREATED
+    )
 
 
 @router.get(
     "/documents/{document_id}",
-    response_model=AnnotationListResponse,
+    response_model=Union[AnnotationListResponse, AnnotationSummaryListResponse],
 )
 async def get_annotations_for_document(
-    document_id: str,
+    document_id: UUID,
     page_number: Optional[int] = None,
     annotation_type: Optional[str] = None,
-    limit: int = 1000,
-    offset: int = 0,
+    limit: int = Query(1000, ge=1, le=1000, description="Max results"),
+    offset: int = Query(0, ge=0),
+    view: Literal["full", "summary"] = Query(
+        "full", description="'summary' returns only the fields needed for rendering"),
+    cursor: Optional[str] = Query(
+        None, description="next_cursor of the previous page (keyset pagination)"),
+    include_total: bool = Query(
+        False, description="Also count all matches when paging with a cursor"),
     repo: AnnotationRepository = Depends(get_annotation_repo),
 ):
-    """Get all annotations for a document with optional filtering"""
-    try:
-        annotations, total = await repo.get_by_document(
+    """
+    Get all annotations for a document with optional filtering.
+
+    Without a cursor, pages by offset and always reports the total. With a
+    cursor, seeks past the previous page's last row, ignores offset and only
+    counts when include_total is set.
+    """
+    document_id = str(document_id)
+    if cursor is not None:
+        # The cursor alone positions the page; an offset would skip rows
+        offset = 0
+    cache_key = annotation_cache.listing_key(
+        document_id, view, page_number, annotation_type, limit, offset,
+        cursor, include_total)
+    cached = await annotation_cache.get_listing(cache_key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+
+    if view == "summary":
+        fetch = repo.get_summaries_by_document
+        response_cls = AnnotationSummaryListResponse
+    else:
+        fetch = repo.get_by_document
+        response_cls = AnnotationListResponse
+
+    if cursor is None:
+        annotations, total = await fetch(
             document_id=document_id,
             page_number=page_number,
             annotation_type=annotation_type,
             limit=limit,
             offset=offset
         )
-
         has_more = (offset + len(annotations)) < total
-        page = offset // limit + 1 if limit > 0 else 1
-
-        return AnnotationListResponse(
-            annotations=annotations,
-            total=total,
-            page=page,
-            page_size=limit,
-            has_more=has_more
-        )
-    except Exception as e:
-        logger.error(f"Failed to get annotations: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=str(e)
+        page = offset // limit + 1
+    else:
+        # One extra row tells whether another page follows, without a COUNT
+        annotations, total = await fetch(
+            document_id=document_id,
+            page_number=page_number,
+            annotation_type=annotation_type,
+            limit=limit + 1,
+            after=_decode_cursor(cursor),
+            with_total=include_total
         )
+        has_more = len(annotations) > limit
+        annotations = annotations[:limit]
+        page = 1
+
+    next_cursor = _encode_cursor(annotations[-1]) if has_more else None
+
+    response = model_response(response_cls(
+        annotations=annotations,
+        total=total,
+        page=page,
+        page_size=limit,
+        has_more=has_more,
+        next_cursor=next_cursor
+    ))
+    await annotation_cache.set_listing(document_id, cache_key, response.body)
+    return response
 
 
 @router.patch("/{annotation_id}", response_model=AnnotationResponse)
 async def update_annotation(
-    annotation_id: str,
+    annotation_id: AnnotationId,
     update: AnnotationUpdate,
     repo: AnnotationRepository = Depends(get_annotation_repo),
 ):
     """Update an existing annotation"""
-    try:
-        model = await repo.get_by_id(annotation_id)
-        if not model:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Annotation not found"
-            )
-
-        # Build update dictionary from non-None fields
-        update_data = {}
-        if update.data is not None:
-            update_data["data"] = update.data
-        if update.content is not None:
-            update_data["content"] = update.content
-        if update.color is not None:
-            update_data["color"] = update.color
-        if update.tags is not None:
-            update_data["tags"] = update.tags
-
-        updated = await repo.update(model, **update_data)
-        logger.info(f"Updated annotation {annotation_id}")
-        return updated
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Failed to update annotation: {e}")
+    # Only the fields sent by the client
+    update_data = update.model_dump(exclude_unset=True)
+
+    # UPDATE ... RETURNING: no returned row means it never existed
+    updated = await repo.update_fields(str(annotation_id), update_data)
+    if not updated:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=str(e)
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Annotation not found"
         )
 
+    await repo.commit()
+    await annotation_cache.invalidate_documents([updated.document_id])
+
+    logger.info(f"Updated annotation {annotation_id}")
+    return model_response(AnnotationResponse.model_validate(updated))
+
 
 @router.delete("/{annotation_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_annotation(
-    annotation_id: str,
+    annotation_id: AnnotationId,
     repo: AnnotationRepository = Depends(get_annotation_repo),
 ):
     """Delete an annotation"""
-    try:
-        # Convert annotation_id to UUID if needed
-        from uuid import UUID
-        try:
-            id_uuid = UUID(annotation_id) if isinstance(
-                annotation_id, str) else annotation_id
-        except ValueError:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Invalid annotation ID format"
-            )
-
-        # Check if annotation exists
-        model = await repo.get_by_id(id_uuid)
-        if not model:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Annotation not found"
-            )
-
-        # Delete by ID, not by model instance
-        deleted = await repo.delete(id_uuid)
-        if not deleted:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to delete annotation"
-            )
-
-        logger.info(f"Deleted annotation {annotation_id}")
-        return None
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Failed to delete annotation: {e}")
+    # Delete by ID; no returned row means it never existed
+    document_id = await repo.delete_returning_document(str(annotation_id))
+    if document_id is None:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=str(e)
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Annotation not found"
         )
 
+    await repo.commit()
+    await annotation_cache.invalidate_documents([document_id])
+
+    logger.info(f"Deleted annotation {annotation_id}")
+    return None
+
 
 @router.post(
     "/batch",
-    response_model=dict,
+    response_model=AnnotationBatchResult,
+    response_model_exclude_none=True,
     status_code=status.HTTP_201_CREATED,
+    # The body is parsed in the handler; document it for OpenAPI here
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {
+                    "schema": AnnotationBatchCreate.model_json_schema()
+                }
+            },
+        }
+    },
 )
 async def batch_create_annotations(
-    request: dict,
+    request: Request,
     repo: AnnotationRepository = Depends(get_annotation_repo),
 ):
     """
@@ -217,102 +273,106 @@ async def batch_create_annotations(
         ]
     }
     """
+    # 原始请求体直接交给 pydantic-core (jiter) 解析并校验，跳过 json.loads
     try:
-        annotations_data = request.get('annotations', [])
-        if not annotations_data:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="No annotations provided"
-            )
-
-        created_count = 0
-        errors = []
-        from ....models.db import AnnotationModel
-
-        for i, ann_data in enumerate(annotations_data):
-            try:
-                # 验证必填字段
-                required_fields = ['document_id',
-                                   'user_id', 'page_number', 'data']
-                missing = [f for f in required_fields if f not in ann_data]
-
-                if missing:
-                    error_msg = f"Item {i}: Missing {', '.join(missing)}"
-                    errors.append(error_msg)
-                    logger.warning(error_msg)
-                    continue
-
-                model = AnnotationModel(
-                    document_id=ann_data['document_id'],
-                    user_id=ann_data['user_id'],
-                    annotation_type=ann_data.get('annotation_type', 'pdfjs'),
-                    page_number=ann_data['page_number'],
-                    data=ann_data['data'],
-                    content=ann_data.get('content'),
-                    color=ann_data.get('color'),
-                    tags=ann_data.get('tags', []),
-                    user_name=ann_data.get('user_name'),
-                )
-                await repo.create(model)
-                created_count += 1
-
-            except Exception as e:
-                error_msg = f"Item {i}: {str(e)}"
-                errors.append(error_msg)
-                logger.error(error_msg)
-
-        logger.info(
-            f"Batch created {created_count}/{len(annotations_data)} annotations")
-
-        result = {
-            "status": "success" if created_count > 0 else "failed",
-            "created": created_count,
-            "total": len(annotations_data)
-        }
-        if errors:
-            result["errors"] = errors
+        body = AnnotationBatchCreate.model_validate_json(await request.body())
+    except ValidationError as e:
+        raise RequestValidationError(e.errors())
+    annotations_data = body.annotations
+    if not annotations_data:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No annotations provided"
+        )
 
-        return result
+    errors = []
+    payload = []
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Failed to batch create annotations: {e}")
+    # 逐条用 pydantic 校验，合法的条目一次性批量插入
+    for i, ann_data in enumerate(annotations_data):
+        try:
+            item = AnnotationBatchItem.model_validate(ann_data)
+        except ValidationError as e:
+            details = "; ".join(
+                f"{'.'.join(map(str, err['loc']))}: {err['msg']}"
+                for err in e.errors())
+            errors.append(f"Item {i}: {details}")
+            continue
+
+        payload.append(item.model_dump())
+
+    created_count = len(await repo.bulk_create(payload)) if payload else 0
+    await repo.commit()
+    await annotation_cache.invalidate_documents(
+        row['document_id'] for row in payload)
+
+    logger.info(
+        f"Batch created {created_count}/{len(annotations_data)} annotations")
+    if errors:
+        # One aggregated record instead of one log call per rejected item
+        logger.warning(
+            f"Batch rejected {len(errors)} annotations: {errors[:20]}")
+
+    result = AnnotationBatchResult(
+        status="success" if created_count > 0 else "failed",
+        created=created_count,
+        total=len(annotations_data),
+        errors=errors or None
+    )
+    return model_response(
+        result, status_code=status.HTTP_201_CREATED, exclude_none=True)
+
+
+@router.post(
+    "/bulk",
+    response_model=List[AnnotationResponse],
+    status_code=status.HTTP_201_CREATED,
+)
+async def bulk_create_annotations(
+    items: List[AnnotationCreate],
+    repo: AnnotationRepository = Depends(get_annotation_repo),
+):
+    """Create many annotations in a single INSERT statement"""
+    if not items:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=str(e)
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No annotations provided"
+        )
+    if len(items) > MAX_BULK_ANNOTATIONS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_BULK_ANNOTATIONS} annotations per request"
         )
 
+    created = await repo.bulk_create([item.model_dump() for item in items])
+    await repo.commit()
+    await annotation_cache.invalidate_documents(
+        item.document_id for item in items)
+    logger.info(f"Bulk created {len(created)} annotations")
+    body = _annotation_list_adapter.dump_json(
+        _annotation_list_adapter.validate_python(created, from_attributes=True))
+    return Response(
+        content=body,
+        status_code=status.HTTP_201_CREATED,
+        media_type="application/json"
+    )
+
 
 @router.delete(
     "/documents/{document_id}",
     status_code=status.HTTP_204_NO_CONTENT,
 )
 async def delete_annotations_by_document(
-    document_id: str,
+    document_id: UUID,
     repo: AnnotationRepository = Depends(get_annotation_repo),
 ):
     """删除文档的所有标注"""
-    try:
-        # 使用 repository 的 get_by_document 方法
-        annotations, total = await repo.get_by_document(
-            document_id=document_id,
-            limit=10000  # 一次性获取所有
-        )
-
-        # 删除所有标注
-        deleted_count = 0
-        for ann in annotations:
-            await repo.delete(ann.id)
-            deleted_count += 1
-
-        logger.info(
-            f"Deleted {deleted_count} annotations for document {document_id}")
-        return None
-
-    except Exception as e:
-        logger.error(f"Failed to delete annotations: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=str(e)
-        )
+    document_id = str(document_id)
+    # 单条 DELETE ... WHERE document_id 删除所有标注
+    deleted_count = await repo.delete_by_document(document_id)
+    await repo.commit()
+    await annotation_cache.invalidate_documents([document_id])
+
+    logger.info(
+        f"Deleted {deleted_count} annotations for document {document_id}")
+    return None
@@ -4,7 +4,11 @@ Authentication API endpoints.
 Handles user registration, login, and authentication operations.
 """
 
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ....core.dependencies import get_db
@@ -21,15 +25,32 @@ from ....schemas.user import (
     PasswordChangeRequest,
     MessageResponse
 )
-from ....models.db import UserModel
 from ...dependencies.auth import (
+    ActiveUser,
     get_auth_service,
-    get_current_active_user
 )
+from ...responses import model_response
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 logger = get_logger(__name__)
 
+# Serialized /me bodies keyed by (user_id, updated_at). Any write to the user
+# row bumps updated_at, so a changed user simply misses and is re-serialized.
+_ME_CACHE_MAXSIZE = 2048
+_me_cache: Dict[Tuple[str, Optional[datetime]], bytes] = {}
+
+
+def _serialized_me(user) -> bytes:
+    """Return the cached UserResponse JSON for a user, building it on miss."""
+    key = (user.id, user.updated_at)
+    body = _me_cache.get(key)
+    if body is None:
+        if len(_me_cache) >= _ME_CACHE_MAXSIZE:
+            _me_cache.pop(next(iter(_me_cache)))
+        body = UserResponse.model_validate(user).model_dump_json().encode()
+        _me_cache[key] = body
+    return body
+
 
 @router.post(
     "/register",
@@ -65,10 +86,13 @@ async def register(
 
         logger.info(f"User registered successfully: {user.username}")
 
-        return RegisterResponse(
-            access_token=access_token,
-            token_type="bearer",
-            user=UserResponse.model_validate(user)
+        return model_response(
+            RegisterResponse(
+                access_token=access_token,
+                token_type="bearer",
+                user=UserResponse.model_validate(user)
+            ),
+            status_code=status.HTTP_201_CREATED
         )
 
     except ValidationError as e:
@@ -116,11 +140,11 @@ async def login(
 
         logger.info(f"User logged in: {user.username}")
 
-        return LoginResponse(
+        return model_response(LoginResponse(
             access_token=access_token,
             token_type="bearer",
             user=UserResponse.model_validate(user)
-        )
+        ))
 
     except AuthenticationError as e:
         logger.warning(f"Login failed: {e}")
@@ -144,7 +168,7 @@ async def login(
     description="Get information about currently authenticated user"
 )
 async def get_me(
-    current_user: UserModel = Depends(get_current_active_user)
+    current_user: ActiveUser
 ):
     """
     Get current user information.
@@ -155,7 +179,8 @@ async def get_me(
     Returns:
         User information
     """
-    return UserResponse.model_validate(current_user)
+    return Response(content=_serialized_me(current_user),
+                    media_type="application/json")
 
 
 @router.post(
@@ -166,7 +191,7 @@ async def get_me(
 )
 async def change_password(
     password_data: PasswordChangeRequest,
-    current_user: UserModel = Depends(get_current_active_user),
+    current_user: ActiveUser,
     auth_service: AuthService = Depends(get_auth_service)
 ):
     """
@@ -224,7 +249,7 @@ async def change_password(
     description="Logout current user (client should discard token)"
 )
 async def logout(
-    current_user: UserModel = Depends(get_current_active_user)
+    current_user: ActiveUser
 ):
     """
     Logout user (client-side token removal).
@@ -4,13 +4,17 @@ Bookmark API endpoints.
 Handles bookmark CRUD operations, AI generation, and search functionality.
 """
 
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, status, Query
+from fastapi.responses import Response, StreamingResponse
+from pydantic import TypeAdapter
+from redis.exceptions import RedisError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from ....core.config import get_settings
 from ....core.dependencies import get_db
 from ....core.logging import get_logger
-from ....core.exceptions import BookmarkNotFoundError, UnauthorizedError
 from ....schemas.bookmark import (
     BookmarkCreate,
     BookmarkUpdate,
@@ -19,27 +23,158 @@ from ....schemas.bookmark import (
     BookmarkSearchRequest,
     BookmarkGenerateRequest,
 )
-from ....schemas.user import UserResponse
+from ....models.db import AI_STATUS_PENDING
+from ....services import bookmark_cache, bookmark_events
 from ....services.bookmark_service import BookmarkService
 from ....repositories.bookmark_repository import BookmarkRepository
-from ....infrastructure.ai.gemini_client import GeminiClient
-from ...dependencies.auth import get_current_active_user
+from ....infrastructure.ai.gemini_client import GeminiClient, get_gemini_client
+from ....infrastructure.cache import RateLimiter, hit_all
+from ....infrastructure.database.session import get_session_factory
+from ...dependencies.auth import ActiveUser
+from ...pagination import decode_cursor, encode_cursor
+from ...responses import conditional_response, dump_json
 
 logger = get_logger(__name__)
 router = APIRouter()
+settings = get_settings()
+
+# How long a summary stream waits for a pending bookmark
+SUMMARY_STREAM_TIMEOUT = 120.0
+
+MAX_BULK_BOOKMARKS = 200
+
+_bookmark_list_adapter = TypeAdapter(List[BookmarkResponse])
+
+# Per-user limits on endpoints that call Gemini; the hourly bucket bounds
+# sustained use that stays under the per-minute burst
+_ai_rate_limits = (
+    RateLimiter("ratelimit:genbookmark:minute",
+                settings.bookmark_ai_rate_per_minute, 60),
+    RateLimiter("ratelimit:genbookmark:hour",
+                settings.bookmark_ai_rate_per_hour, 3600),
+)
+_bulk_rate_limits = (
+    RateLimiter("ratelimit:bulkbookmark:hour",
+                settings.bookmark_bulk_rate_per_hour, 3600),
+)
 
 
 # ==================== Dependency Injection ====================
 
 async def get_bookmark_service(
     db: AsyncSession = Depends(get_db),
+    ai_client: GeminiClient = Depends(get_gemini_client),
 ) -> BookmarkService:
-    """Get bookmark service instance."""
+    """Get bookmark service instance backed by the shared Gemini client."""
     bookmark_repo = BookmarkRepository(db)
-    ai_client = GeminiClient()
     return BookmarkService(bookmark_repo=bookmark_repo, ai_client=ai_client)
 
 
+async def _enforce_rate_limits(
+    limiters: Tuple[RateLimiter, ...], user_id: str, detail: str
+) -> None:
+    """Raise 429 with the given detail if the user has exhausted any of the limiters."""
+    # Checked together so a rejected request is not charged to any window
+    exceeded = await hit_all(limiters, user_id)
+    if exceeded is not None:
+        limiter, retry_after = exceeded
+        logger.warning("Rate limit {} exceeded by user {}", limiter.prefix, user_id)
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=detail,
+            headers={"Retry-After": str(retry_after)}
+        )
+
+
+async def ai_ratelimit(current_user: ActiveUser) -> None:
+    """Limit how often a user can trigger AI bookmark summaries."""
+    await _enforce_rate_limits(
+        _ai_rate_limits, current_user.id, "Too many AI bookmark generations")
+
+
+async def bulk_ratelimit(current_user: ActiveUser) -> None:
+    """Limit how often a user can start a bulk import."""
+    await _enforce_rate_limits(
+        _bulk_rate_limits, current_user.id, "Too many bulk bookmark requests")
+
+
+def _decode_bookmark_cursor(cursor: Optional[str]) -> Optional[Tuple[datetime, str]]:
+    """Decode a next_cursor value into a (created_at, id) key."""
+    if cursor is None:
+        return None
+    created_at, bookmark_id = decode_cursor(cursor, 2)
+    try:
+        return datetime.fromisoformat(created_at), str(bookmark_id)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def _listing_body(bookmarks: list, limit: int, total: Optional[int]) -> bytes:
+    """
+    Serialize a page of listing rows in the BookmarkListResponse shape.
+
+    The rows are column mappings whose keys are the BookmarkResponse
+    fields, so they go to orjson as plain dicts without pydantic.
+
+    Args:
+        bookmarks: Rows from the listing query, one more than limit if
+            another page follows
+        limit: Page size
+        total: Optional total count
+
+    Returns:
+        JSON body
+    """
+    next_cursor = None
+    if len(bookmarks) > limit:
+        last = bookmarks[limit - 1]
+        next_cursor = encode_cursor(last["created_at"], last["id"])
+    return dump_json({
+        "bookmarks": [dict(row) for row in bookmarks[:limit]],
+        "total": total,
+        "next_cursor": next_cursor,
+    })
+
+
+async def _summarize_bookmarks(
+    pending: List[Tuple[str, str, List[Dict[str, str]]]],
+    user_id: str,
+    ai_client: GeminiClient,
+) -> None:
+    """
+    Background job: generate the AI summaries of pending bookmarks.
+
+    Runs after the response is sent, so it uses its own database session.
+
+    Args:
+        pending: (bookmark_id, selected_text, conversation_history) per bookmark
+        user_id: Owner user ID
+        ai_client: Shared Gemini client
+    """
+    try:
+        async with get_session_factory()() as session:
+            service = BookmarkService(BookmarkRepository(session), ai_client)
+            bookmarks = await service.complete_bookmark_summaries(pending)
+    except Exception as e:
+        logger.exception("Failed to summarize {} bookmarks: {}", len(pending), e)
+        return
+
+    await bookmark_cache.invalidate_user(user_id)
+    for bookmark in bookmarks:
+        await bookmark_events.publish_ready(
+            bookmark.id,
+            BookmarkResponse.model_validate(bookmark).model_dump_json().encode()
+        )
+
+
+def _sse_event(event: str, data: bytes = b"{}") -> bytes:
+    """Format one server-sent event."""
+    return b"event: " + event.encode() + b"\ndata: " + data + b"\n\n"
+
+
 # ==================== Endpoints ====================
 
 @router.post(
@@ -47,11 +182,12 @@ async def get_bookmark_service(
     response_model=BookmarkResponse,
     status_code=status.HTTP_201_CREATED,
     summary="Create a bookmark",
-    description="Create a new bookmark with AI-generated summary"
+    description="Create a new bookmark with AI-generated summary",
+    dependencies=[Depends(ai_ratelimit)]
 )
 async def create_bookmark(
     bookmark_data: BookmarkCreate,
-    current_user: UserResponse = Depends(get_current_active_user),
+    current_user: ActiveUser,
     service: BookmarkService = Depends(get_bookmark_service),
 ):
     """
@@ -68,37 +204,30 @@ async def create_bookmark(
     - **tags**: Optional tags
     - **color**: Highlight color (default: #FCD34D)
     """
-    try:
-        logger.info(
-            f"Creating bookmark for user {current_user.id} on document {bookmark_data.document_id}"
-        )
-
-        bookmark = await service.create_bookmark(
-            user_id=current_user.id,
-            document_id=bookmark_data.document_id,
-            selected_text=bookmark_data.selected_text,
-            page_number=bookmark_data.page_number,
-            position_x=bookmark_data.position.x,
-            position_y=bookmark_data.position.y,
-            position_width=bookmark_data.position.width,
-            position_height=bookmark_data.position.height,
-            conversation_history=bookmark_data.conversation_history,
-            chunk_id=bookmark_data.chunk_id,
-            title=bookmark_data.title,
-            user_notes=bookmark_data.user_notes,
-            tags=bookmark_data.tags or [],
-            color=bookmark_data.color,
-        )
-
-        logger.info(f"Bookmark created: {bookmark.id}")
-        return bookmark
-
-    except Exception as e:
-        logger.error(f"Failed to create bookmark: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to create bookmark: {str(e)}"
-        )
+    logger.info("Creating bookmark for user {} on document {}",
+                current_user.id, bookmark_data.document_id)
+
+    bookmark = await service.create_bookmark(
+        user_id=current_user.id,
+        document_id=bookmark_data.document_id,
+        selected_text=bookmark_data.selected_text,
+        page_number=bookmark_data.page_number,
+        position_x=bookmark_data.position.x,
+        position_y=bookmark_data.position.y,
+        position_width=bookmark_data.position.width,
+        position_height=bookmark_data.position.height,
+        conversation_history=bookmark_data.conversation_history,
+        chunk_id=bookmark_data.chunk_id,
+        title=bookmark_data.title,
+        user_notes=bookmark_data.user_notes,
+        tags=bookmark_data.tags or [],
+        color=bookmark_data.color,
+    )
+
+    await bookmark_cache.invalidate_user(current_user.id)
+
+    logger.info("Bookmark created: {}", bookmark.id)
+    return bookmark
 
 
 @router.post(
@@ -106,11 +235,13 @@ async def create_bookmark(
     response_model=BookmarkResponse,
     status_code=status.HTTP_201_CREATED,
     summary="Generate bookmark with AI",
-    description="Generate a bookmark with AI-powered summary from conversation"
+    description="Create a bookmark and generate its AI summary in the background",
+    dependencies=[Depends(ai_ratelimit)]
 )
 async def generate_bookmark(
     request: BookmarkGenerateRequest,
-    current_user: UserResponse = Depends(get_current_active_user),
+    current_user: ActiveUser,
+    background_tasks: BackgroundTasks,
     service: BookmarkService = Depends(get_bookmark_service),
 ):
     """
@@ -121,38 +252,114 @@ async def generate_bookmark(
     2. Has conversation with AI about the text
     3. Generates bookmark with conversation-aware summary
 
-    The AI will analyze both the selected text and conversation history
-    to generate a concise 50-100 word summary.
+    The bookmark is returned right away with ai_status "pending" and the
+    selected text as a provisional summary. The AI then analyzes the
+    selected text and conversation history in the background; follow
+    GET /bookmarks/{id}/summary-stream or poll GET /bookmarks/{id} until
+    ai_status is "completed".
     """
-    try:
-        logger.info(
-            f"Generating AI bookmark for user {current_user.id} on document {request.document_id}"
-        )
+    logger.info("Generating AI bookmark for user {} on document {}",
+                current_user.id, request.document_id)
+
+    bookmark = await service.create_pending_bookmark(
+        user_id=current_user.id,
+        document_id=request.document_id,
+        selected_text=request.selected_text,
+        page_number=request.page_number,
+        position_x=request.position.x,
+        position_y=request.position.y,
+        position_width=request.position.width,
+        position_height=request.position.height,
+        conversation_history=request.conversation_history or [],
+        chunk_id=request.chunk_id,
+        color=request.color,
+    )
+
+    await bookmark_cache.invalidate_user(current_user.id)
+    background_tasks.add_task(
+        _summarize_bookmarks,
+        [(bookmark.id, request.selected_text,
+          request.conversation_history or [])],
+        current_user.id,
+        service.ai_client,
+    )
+
+    logger.info("AI bookmark queued for summary: {}", bookmark.id)
+    return bookmark
 
-        bookmark = await service.create_bookmark(
-            user_id=current_user.id,
-            document_id=request.document_id,
-            selected_text=request.selected_text,
-            page_number=request.page_number,
-            position_x=request.position.x,
-            position_y=request.position.y,
-            position_width=request.position.width,
-            position_height=request.position.height,
-            conversation_history=request.conversation_history or [],
-            chunk_id=request.chunk_id,
-            color=request.color,
-        )
 
-        logger.info(f"AI bookmark generated: {bookmark.id}")
-        return bookmark
+@router.post(
+    "/bulk",
+    response_model=List[BookmarkResponse],
+    status_code=status.HTTP_201_CREATED,
+    summary="Create bookmarks in bulk",
+    description="Import many bookmarks at once; AI summaries follow in the background",
+    dependencies=[Depends(bulk_ratelimit)]
+)
+async def bulk_create_bookmarks(
+    items: List[BookmarkCreate],
+    current_user: ActiveUser,
+    background_tasks: BackgroundTasks,
+    service: BookmarkService = Depends(get_bookmark_service),
+):
+    """
+    Create many bookmarks in a single INSERT statement.
 
-    except Exception as e:
-        logger.error(f"Failed to generate bookmark: {str(e)}")
+    Every bookmark is returned with ai_status "pending", like
+    /bookmarks/generate. The AI summaries are generated concurrently in the
+    background and stored together.
+    """
+    if not items:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to generate bookmark: {str(e)}"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No bookmarks provided"
+        )
+    if len(items) > MAX_BULK_BOOKMARKS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_BULK_BOOKMARKS} bookmarks per request"
         )
 
+    bookmarks = await service.create_pending_bookmarks(
+        current_user.id,
+        [
+            {
+                'document_id': item.document_id,
+                'selected_text': item.selected_text,
+                'page_number': item.page_number,
+                'position_x': item.position.x,
+                'position_y': item.position.y,
+                'position_width': item.position.width,
+                'position_height': item.position.height,
+                'conversation_history': item.conversation_history,
+                'chunk_id': item.chunk_id,
+                'title': item.title,
+                'user_notes': item.user_notes,
+                'tags': item.tags,
+                'color': item.color,
+            }
+            for item in items
+        ]
+    )
+
+    await bookmark_cache.invalidate_user(current_user.id)
+    background_tasks.add_task(
+        _summarize_bookmarks,
+        [(bookmark.id, item.selected_text, item.conversation_history)
+         for bookmark, item in zip(bookmarks, items)],
+        current_user.id,
+        service.ai_client,
+    )
+
+    logger.info("Bulk created {} bookmarks", len(bookmarks))
+    return Response(
+        content=_bookmark_list_adapter.dump_json(
+            _bookmark_list_adapter.validate_python(
+                bookmarks, from_attributes=True)),
+        status_code=status.HTTP_201_CREATED,
+        media_type="application/json"
+    )
+
 
 @router.get(
     "/",
@@ -161,45 +368,99 @@ async def generate_bookmark(
     description="Get bookmarks with optional filters"
 )
 async def get_bookmarks(
+    request: Request,
+    current_user: ActiveUser,
     document_id: Optional[str] = Query(None, description="Filter by document"),
     page_number: Optional[int] = Query(
         None, ge=0, description="Filter by page"),
     limit: int = Query(100, ge=1, le=500, description="Max results"),
-    current_user: UserResponse = Depends(get_current_active_user),
+    cursor: Optional[str] = Query(
+        None, description="next_cursor of the previous page"),
+    include_total: bool = Query(False, description="Also count all matches"),
     service: BookmarkService = Depends(get_bookmark_service),
 ):
     """
-    Get bookmarks for current user.
+    Get bookmarks for current user, newest first.
 
     Supports filtering by:
     - **document_id**: Get bookmarks for specific document
     - **page_number**: Get bookmarks on specific page (requires document_id)
     - **limit**: Maximum number of results
+    - **cursor**: Continue after the previous page's next_cursor
+    - **include_total**: Also return the total number of matches
+
+    Responses carry an ETag; send it back in If-None-Match to get a 304
+    when the page has not changed.
     """
-    try:
-        logger.info(
-            f"Getting bookmarks for user {current_user.id} "
-            f"(document={document_id}, page={page_number})"
-        )
+    after = _decode_bookmark_cursor(cursor)
+    cache_key = bookmark_cache.list_key(
+        current_user.id, document_id, page_number, limit, cursor, include_total)
+    cached = await bookmark_cache.get_response(cache_key)
+    if cached is not None:
+        return conditional_response(request, cached)
+
+    logger.info("Getting bookmarks for user {} (document={}, page={})",
+                current_user.id, document_id, page_number)
+
+    # One extra row tells whether another page follows
+    bookmarks = await service.get_user_bookmarks(
+        user_id=current_user.id,
+        document_id=document_id,
+        page_number=page_number,
+        limit=limit + 1,
+        after=after,
+    )
+    total = await service.count_bookmarks(
+        current_user.id, document_id, page_number
+    ) if include_total else None
+
+    body = _listing_body(bookmarks, limit, total)
+    await bookmark_cache.set_response(current_user.id, cache_key, body)
+    return conditional_response(request, body)
 
-        bookmarks = await service.get_user_bookmarks(
-            user_id=current_user.id,
-            document_id=document_id,
-            page_number=page_number,
-            limit=limit,
-        )
 
-        return BookmarkListResponse(
-            bookmarks=bookmarks,
-            total=len(bookmarks)
-        )
+@router.get(
+    "/stream",
+    summary="Stream bookmarks",
+    description="Stream bookmarks as NDJSON, one bookmark per line",
+    response_class=StreamingResponse,
+)
+async def stream_bookmarks(
+    current_user: ActiveUser,
+    document_id: Optional[str] = Query(None, description="Filter by document"),
+    page_number: Optional[int] = Query(
+        None, ge=0, description="Filter by page"),
+    limit: Optional[int] = Query(
+        None, ge=1, description="Max results (default: all)"),
+    cursor: Optional[str] = Query(
+        None, description="next_cursor of a GET /bookmarks page"),
+):
+    """
+    Stream bookmarks for current user, newest first, as NDJSON.
 
-    except Exception as e:
-        logger.error(f"Failed to get bookmarks: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to get bookmarks: {str(e)}"
-        )
+    Takes the same filters as GET /bookmarks. Each line is one bookmark in
+    the BookmarkResponse shape; rows are sent as they come off the database
+    cursor, so memory use does not grow with the number of bookmarks.
+    """
+    after = _decode_bookmark_cursor(cursor)
+    logger.info("Streaming bookmarks for user {} (document={}, page={})",
+                current_user.id, document_id, page_number)
+
+    async def lines():
+        # The request's session is closed before the body is streamed
+        async with get_session_factory()() as session:
+            repo = BookmarkRepository(session)
+            async for bookmark in repo.stream_for_user(
+                current_user.id,
+                document_id=document_id,
+                page_number=page_number,
+                limit=limit,
+                after=after,
+            ):
+                yield BookmarkResponse.model_validate(
+                    bookmark).model_dump_json().encode() + b"\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
 
 
 @router.get(
@@ -210,37 +471,89 @@ async def get_bookmarks(
 )
 async def get_bookmark(
     bookmark_id: str,
-    current_user: UserResponse = Depends(get_current_active_user),
+    request: Request,
+    current_user: ActiveUser,
     service: BookmarkService = Depends(get_bookmark_service),
 ):
-    """Get a specific bookmark by ID."""
-    try:
-        bookmark = await service.bookmark_repo.get_by_id(bookmark_id)
+    """
+    Get a specific bookmark by ID.
+
+    The response carries an ETag; send it back in If-None-Match to get a
+    304 when the bookmark has not changed.
+    """
+    # Keys are scoped to the owner, so a hit needs no authorization check
+    cache_key = bookmark_cache.item_key(current_user.id, bookmark_id)
+    cached = await bookmark_cache.get_response(cache_key)
+    if cached is not None:
+        return conditional_response(request, cached)
 
-        if not bookmark:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Bookmark not found: {bookmark_id}"
-            )
+    # Bookmarks of other users are reported as missing
+    bookmark = await service.bookmark_repo.get_for_user(
+        bookmark_id, current_user.id)
 
-        # Authorization check
-        if bookmark.user_id != current_user.id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not authorized to access this bookmark"
-            )
+    if not bookmark:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Bookmark not found: {bookmark_id}"
+        )
 
-        return bookmark
+    body = BookmarkResponse.model_validate(
+        bookmark).model_dump_json().encode()
+    await bookmark_cache.set_response(current_user.id, cache_key, body)
+    return conditional_response(request, body)
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Failed to get bookmark: {str(e)}")
+
+@router.get(
+    "/{bookmark_id}/summary-stream",
+    summary="Stream bookmark summary",
+    description="Server-sent event fired when a bookmark's AI summary is ready",
+    response_class=StreamingResponse,
+)
+async def stream_bookmark_summary(
+    bookmark_id: str,
+    current_user: ActiveUser,
+    service: BookmarkService = Depends(get_bookmark_service),
+):
+    """
+    Wait for the AI summary of a bookmark created by /generate.
+
+    Emits a single event, then closes the stream:
+    - **ready**: data is the completed bookmark
+    - **timeout**: the summary did not finish in time; poll GET /bookmarks/{id}
+    - **error**: notifications are unavailable; poll GET /bookmarks/{id}
+    """
+    bookmark = await service.bookmark_repo.get_for_user(
+        bookmark_id, current_user.id)
+    if not bookmark:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to get bookmark: {str(e)}"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Bookmark not found: {bookmark_id}"
         )
 
+    ready = None
+    if bookmark.ai_status != AI_STATUS_PENDING:
+        ready = BookmarkResponse.model_validate(
+            bookmark).model_dump_json().encode()
+
+    async def events():
+        if ready is not None:
+            yield _sse_event("ready", ready)
+            return
+        try:
+            body = await bookmark_events.wait_ready(
+                bookmark_id, SUMMARY_STREAM_TIMEOUT)
+        except RedisError as e:
+            logger.warning("Summary stream unavailable: {}", e)
+            yield _sse_event("error")
+            return
+        yield _sse_event("ready", body) if body else _sse_event("timeout")
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"}
+    )
+
 
 @router.put(
     "/{bookmark_id}",
@@ -251,7 +564,7 @@ async def get_bookmark(
 async def update_bookmark(
     bookmark_id: str,
     update_data: BookmarkUpdate,
-    current_user: UserResponse = Depends(get_current_active_user),
+    current_user: ActiveUser,
     service: BookmarkService = Depends(get_bookmark_service),
 ):
     """
@@ -265,38 +578,22 @@ async def update_bookmark(
 
     AI summary and position cannot be changed after creation.
     """
-    try:
-        logger.info(
-            f"Updating bookmark {bookmark_id} for user {current_user.id}")
-
-        bookmark = await service.update_bookmark(
-            bookmark_id=bookmark_id,
-            user_id=current_user.id,
-            title=update_data.title,
-            user_notes=update_data.user_notes,
-            tags=update_data.tags,
-            color=update_data.color,
-        )
+    logger.info("Updating bookmark {} for user {}",
+                bookmark_id, current_user.id)
 
-        logger.info(f"Bookmark updated: {bookmark_id}")
-        return bookmark
+    bookmark = await service.update_bookmark(
+        bookmark_id=bookmark_id,
+        user_id=current_user.id,
+        title=update_data.title,
+        user_notes=update_data.user_notes,
+        tags=update_data.tags,
+        color=update_data.color,
+    )
 
-    except BookmarkNotFoundError as e:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=str(e)
-        )
-    except UnauthorizedError as e:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail=str(e)
-        )
-    except Exception as e:
-        logger.error(f"Failed to update bookmark: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to update bookmark: {str(e)}"
-        )
+    await bookmark_cache.invalidate_user(current_user.id)
+
+    logger.info("Bookmark updated: {}", bookmark_id)
+    return bookmark
 
 
 @router.delete(
@@ -307,38 +604,22 @@ async def update_bookmark(
 )
 async def delete_bookmark(
     bookmark_id: str,
-    current_user: UserResponse = Depends(get_current_active_user),
+    current_user: ActiveUser,
     service: BookmarkService = Depends(get_bookmark_service),
 ):
     """Delete a bookmark."""
-    try:
-        logger.info(
-            f"Deleting bookmark {bookmark_id} for user {current_user.id}")
+    logger.info("Deleting bookmark {} for user {}",
+                bookmark_id, current_user.id)
 
-        await service.delete_bookmark(
-            bookmark_id=bookmark_id,
-            user_id=current_user.id,
-        )
+    await service.delete_bookmark(
+        bookmark_id=bookmark_id,
+        user_id=current_user.id,
+    )
 
-        logger.info(f"Bookmark deleted: {bookmark_id}")
-        return None
+    await bookmark_cache.invalidate_user(current_user.id)
 
-    except BookmarkNotFoundError as e:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=str(e)
-        )
-    except UnauthorizedError as e:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail=str(e)
-        )
-    except Exception as e:
-        logger.error(f"Failed to delete bookmark: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to delete bookmark: {str(e)}"
-        )
+    logger.info("Bookmark deleted: {}", bookmark_id)
+    return None
 
 
 @router.post(
@@ -349,7 +630,7 @@ async def delete_bookmark(
 )
 async def search_bookmarks(
     search_request: BookmarkSearchRequest,
-    current_user: UserResponse = Depends(get_current_active_user),
+    current_user: ActiveUser,
     service: BookmarkService = Depends(get_bookmark_service),
 ):
     """
@@ -363,26 +644,23 @@ async def search_bookmarks(
 
     Optionally filter by document_id.
     """
-    try:
-        logger.info(
-            f"Searching bookmarks for user {current_user.id} "
-            f"with query: {search_request.query}"
-        )
-
-        bookmarks = await service.search_bookmarks(
-            user_id=current_user.id,
-            search_text=search_request.query,
-            document_id=search_request.document_id,
-        )
-
-        return BookmarkListResponse(
-            bookmarks=bookmarks,
-            total=len(bookmarks)
-        )
-
-    except Exception as e:
-        logger.error(f"Failed to search bookmarks: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to search bookmarks: {str(e)}"
-        )
+    after = _decode_bookmark_cursor(search_request.cursor)
+    logger.info("Searching bookmarks for user {} with query: {}",
+                current_user.id, search_request.query)
+
+    limit = search_request.limit
+    bookmarks = await service.search_bookmarks(
+        user_id=current_user.id,
+        search_text=search_request.query,
+        document_id=search_request.document_id,
+        limit=limit + 1,
+        after=after,
+    )
+    total = await service.count_bookmarks(
+        current_user.id,
+        document_id=search_request.document_id,
+        search_text=search_request.query,
+    ) if search_request.include_total else None
+
+    return Response(content=_listing_body(bookmarks, limit, total),
+                    media_type="application/json")
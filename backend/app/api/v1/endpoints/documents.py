@@ -4,11 +4,19 @@ Document management endpoints.
 Handles document upload, retrieval, processing, and chat operations.
 """
 
+import asyncio
+import hashlib
+import heapq
+import os
+import re
 import time
+from datetime import datetime
+from urllib.parse import quote
 from pathlib import Path
-from typing import List, Optional, Dict, Any
-from uuid import UUID
+from typing import List, Optional, Dict, Any, Tuple
+from uuid import UUID, uuid4
 
+import aiofiles
 from fastapi import (
     APIRouter,
     Depends,
@@ -17,33 +25,140 @@ from fastapi import (
     UploadFile,
     File,
     BackgroundTasks,
-    Request
+    Request,
+    Response
 )
-from fastapi.responses import FileResponse
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ....core.config import get_settings
 from ....core.dependencies import get_db
+from ....core.exceptions import PDFProcessingError, ProcessingError
 from ....core.logging import get_logger
+from ....infrastructure.cache import TTLCache
+from ....infrastructure.database.session import get_session_factory
 from ....repositories.document_repository import DocumentRepository
 from ....repositories.chunk_repository import ChunkRepository
-from ....services.document_processing_service import DocumentProcessingService
-from ....services.ai.embeddings import EmbeddingsService
-from ....services.ai.retrieval import RetrievalService
-from ....services.ai.llm import LLMService
+from ....services.document_processing_service import (
+    DocumentProcessingService,
+    thumbnail_path_for,
+)
+from ....services.pdf import PDFParser
+from ....services.ai.retrieval import get_retrieval_service
+from ....services.ai.llm import get_llm_service
 from ....schemas.document import (
     DocumentResponse,
     DocumentListResponse,
     DocumentStatistics,
 )
-from ....schemas.chunk import ChunkResponse, ChunkListResponse, BoundingBox
+from ....schemas.chunk import ChunkResponse, ChunkListResponse
 from ....schemas.chat import ChatRequest, ChatResponse
 from ....schemas.common import StatusResponse
+from ...responses import (
+    OrjsonResponse,
+    conditional_file_response,
+    conditional_response,
+    model_response,
+)
 
 logger = get_logger(__name__)
 settings = get_settings()
 router = APIRouter()
 
+# Read size when streaming an upload to disk
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+_document_list_adapter = TypeAdapter(List[DocumentResponse])
+_chunk_list_adapter = TypeAdapter(List[ChunkResponse])
+
+# Per-process cache of serialized documents: document_id -> (updated_at, body).
+# An entry is only served while the row's updated_at still matches, so
+# writes invalidate it implicitly.
+_document_cache: TTLCache[Tuple[datetime, bytes]] = TTLCache(maxsize=1024, ttl=60.0)
+
+# Per-process cache of chat answers for repeated questions:
+# (document_id, question digest, top_k, temperature) -> (answer, sources).
+# Sources cite chunk ids, so invalidate_chat_answers must run whenever a
+# document's chunks are replaced or deleted.
+_chat_cache: TTLCache[Tuple[str, List[Dict[str, Any]]]] = TTLCache(maxsize=4096, ttl=300.0)
+
+# Recently answered questions per document, for reusing the answer of a
+# rephrased question: document_id -> ((embedding, top_k, temperature, answer), ...).
+# Like _chat_cache, entries must be dropped when a document's chunks change.
+_recent_answers: TTLCache[Tuple[tuple, ...]] = TTLCache(maxsize=1024, ttl=300.0)
+RECENT_ANSWERS_PER_DOCUMENT = 32
+# Cosine similarity above which two questions are taken to ask the same thing
+SIMILAR_QUESTION_THRESHOLD = 0.97
+
+
+def _get_cached_document(document_id: str, updated_at: datetime) -> Optional[bytes]:
+    """Return a cached document body if it is current and not expired."""
+    entry = _document_cache.get(document_id)
+    if entry is None:
+        return None
+    cached_updated_at, body = entry
+    if cached_updated_at != updated_at:
+        _document_cache.pop(document_id)
+        return None
+    return body
+
+
+def _cache_document(document_id: str, updated_at: datetime, body: bytes) -> None:
+    """Store a document body for its current version."""
+    _document_cache.set(document_id, (updated_at, body))
+
+
+def invalidate_cached_document(document_id: str) -> None:
+    """Drop a document from the cache."""
+    _document_cache.pop(str(document_id))
+
+
+def invalidate_chat_answers(document_id: str) -> None:
+    """Drop the cached chat answers of a document whose chunks changed."""
+    document_id = str(document_id)
+    _chat_cache.pop_where(lambda key: key[0] == document_id)
+    _recent_answers.pop(document_id)
+
+
+def _chat_cache_key(document_id: UUID, payload: ChatRequest) -> tuple:
+    """Key a chat question by its normalized text and answer settings."""
+    question = " ".join(payload.question.split()).lower()
+    digest = hashlib.blake2b(question.encode(), digest_size=16).digest()
+    return (str(document_id), digest, payload.top_k, payload.temperature)
+
+
+def _find_similar_answer(
+    document_id: str,
+    embedding: Any,
+    payload: ChatRequest
+) -> Optional[Tuple[str, List[Dict[str, Any]]]]:
+    """
+    Answer of a recent near-identical question about the same document.
+
+    Embeddings are normalized, so their dot product is the cosine
+    similarity. Safe to call from a worker thread: entries are immutable
+    tuples replaced as a whole.
+    """
+    for other, top_k, temperature, answer in _recent_answers.get(document_id) or ():
+        if (top_k == payload.top_k and temperature == payload.temperature
+                and float(embedding @ other) >= SIMILAR_QUESTION_THRESHOLD):
+            return answer
+    return None
+
+
+def _remember_answer(
+    document_id: str,
+    embedding: Any,
+    payload: ChatRequest,
+    answer: Tuple[str, List[Dict[str, Any]]]
+) -> None:
+    """Record an answer for _find_similar_answer, newest first."""
+    recent = _recent_answers.get(document_id) or ()
+    entry = (embedding, payload.top_k, payload.temperature, answer)
+    _recent_answers.set(
+        document_id, (entry,) + recent[:RECENT_ANSWERS_PER_DOCUMENT - 1])
+
 
 async def get_document_service(
     db: AsyncSession = Depends(get_db)
@@ -59,36 +174,115 @@ async def get_document_service(
     """
     doc_repo = DocumentRepository(db)
     chunk_repo = ChunkRepository(db)
-    embedding_service = EmbeddingsService()
-    retrieval_service = RetrievalService()
+    # Shared so the embedding model is loaded once per process
+    retrieval_service = get_retrieval_service()
 
     return DocumentProcessingService(
         document_repo=doc_repo,
         chunk_repo=chunk_repo,
-        embedding_service=embedding_service,
+        embedding_service=retrieval_service.embeddings_service,
         retrieval_service=retrieval_service,
     )
 
 
-@router.post("/upload", response_model=DocumentResponse, status_code=status.HTTP_201_CREATED)
+async def _save_upload(file: UploadFile, file_path: Path) -> Tuple[int, str]:
+    """
+    Stream an uploaded file to disk in fixed-size chunks.
+
+    The SHA-256 of the content is computed on the same pass, so the file
+    need not be read back to detect duplicates.
+
+    Args:
+        file: Uploaded file
+        file_path: Destination path
+
+    Returns:
+        Tuple of (bytes written, SHA-256 hex digest)
+
+    Raises:
+        HTTPException: If the file exceeds max_file_size
+    """
+    size = 0
+    sha256 = hashlib.sha256()
+    try:
+        async with aiofiles.open(file_path, "wb") as f:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if size > settings.max_file_size:
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail=f"File exceeds limit of {settings.max_file_size} bytes"
+                    )
+                sha256.update(chunk)
+                await f.write(chunk)
+    except BaseException:
+        file_path.unlink(missing_ok=True)
+        raise
+    return size, sha256.hexdigest()
+
+
+async def _process_document_async(document_id: str, file_path: Path) -> None:
+    """
+    Background job: run the processing pipeline of an uploaded document.
+
+    Runs after the response is sent, so it uses its own database session.
+    Failures are recorded on the document row by the service.
+
+    Args:
+        document_id: ID of the PENDING document
+        file_path: Path to the saved PDF
+    """
+    async with get_session_factory()() as session:
+        service = await get_document_service(session)
+        document = await service.document_repo.get_by_id(document_id)
+        if document is None:
+            logger.warning(f"Document {document_id} vanished before processing")
+            return
+
+        try:
+            # TEMPORARY: Disable embeddings due to ChromaDB compatibility issues
+            await service.run_pipeline(
+                document,
+                file_path,
+                use_cache=True,
+                chunk_strategy="section",
+                generate_embeddings=False,  # Disabled temporarily
+            )
+        except ProcessingError:
+            # Already logged and stored as the document's processing_error
+            return
+        finally:
+            # Status changes can share a timestamp on second-resolution
+            # databases (SQLite), so updated_at alone may not reveal them
+            invalidate_cached_document(document_id)
+
+    logger.info(f"Document processed successfully: {document_id}")
+
+
+@router.post("/upload", response_model=DocumentResponse, status_code=status.HTTP_202_ACCEPTED)
 async def upload_document(
+    response: Response,
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
-    background_tasks: BackgroundTasks = None,
+    force: bool = False,
     service: DocumentProcessingService = Depends(get_document_service),
 ) -> DocumentResponse:
     """
-    Upload and process a PDF document.
+    Upload a PDF document and queue it for processing.
 
-    This endpoint:
-    1. Saves the uploaded file
-    2. Parses the PDF
-    3. Chunks the content
-    4. Generates embeddings
-    5. Stores in vector database
+    This endpoint saves the uploaded file, records the document with
+    status "pending" and returns right away with 202. Parsing, chunking
+    and embedding run in the background; poll GET /documents/{id} until
+    status is "completed" or "failed". If the same file was uploaded
+    before, the new copy is discarded and the existing document is
+    returned with 200 instead, unless force is set, in which case the
+    existing document is queued for processing again.
 
     Args:
-        file: Uploaded PDF file
+        response: Response, to report 200 for duplicates
         background_tasks: Background tasks for async processing
+        file: Uploaded PDF file
+        force: Reprocess the existing document if the file is a duplicate
         service: Document processing service
 
     Returns:
@@ -108,64 +302,58 @@ async def upload_document(
     upload_dir = Path(settings.upload_dir)
     upload_dir.mkdir(parents=True, exist_ok=True)
 
+    # Stream to a temporary name first: the final name may belong to a
+    # stored document, and duplicates never get one
+    temp_path = upload_dir / f".upload-{uuid4().hex}.part"
+    file_size, content_hash = await _save_upload(file, temp_path)
+    logger.info(f"Uploaded file received: {temp_path} ({file_size} bytes)")
+
     file_path = upload_dir / file.filename
+    if file_path.exists():
+        file_path = upload_dir / f"{file_path.stem}-{content_hash[:12]}.pdf"
 
     try:
-        # Write file to disk
-        with open(file_path, "wb") as f:
-            content = await file.read()
-            f.write(content)
-
-        logger.info(f"Uploaded file saved: {file_path}")
-
-        # Process document
-        # TEMPORARY: Disable embeddings due to ChromaDB compatibility issues
-        document, chunks = await service.process_document(
+        document, created = await service.register_document(
             file_path=file_path,
             filename=file.filename,
-            use_cache=True,
-            chunk_strategy="section",
-            generate_embeddings=False,  # Disabled temporarily
+            content_hash=content_hash,
+            file_size=file_size,
         )
 
-        logger.info(f"Document processed successfully: {document.id}")
-
-        # DEBUG: Check what we're getting
-        logger.debug(
-            f"document.doc_metadata type: {type(document.doc_metadata)}")
-        logger.debug(f"document.doc_metadata value: {document.doc_metadata}")
-        logger.debug(f"hasattr metadata: {hasattr(document, 'metadata')}")
-        if hasattr(document, 'metadata'):
-            logger.debug(f"document.metadata type: {type(document.metadata)}")
-
-        # Manually construct DocumentResponse to avoid SQLAlchemy metadata conflict
-        # CRITICAL:
-        # - DocumentResponse field is 'doc_metadata' with alias='metadata'
-        # - Pydantic requires using the ALIAS when constructing: metadata= (not doc_metadata=)
-        # - Database model has 'doc_metadata' field, document.metadata is SQLAlchemy internal
-        return DocumentResponse(
-            id=document.id,
-            filename=document.filename,
-            file_path=document.file_path,
-            file_size=document.file_size,
-            content_hash=document.content_hash,
-            status=document.status,
-            processing_started_at=document.processing_started_at,
-            processing_completed_at=document.processing_completed_at,
-            processing_error=document.processing_error,
-            chunk_count=document.chunk_count,
-            # Use ALIAS 'metadata' with DATABASE FIELD 'doc_metadata'
-            metadata=document.doc_metadata or {},
-            created_at=document.created_at,
-            updated_at=document.updated_at,
-        )
+        stored_path = Path(document.file_path)
+        if created:
+            try:
+                os.replace(temp_path, file_path)
+            except OSError:
+                # The record must not point to a missing file
+                await service.document_repo.delete(document.id)
+                await service.document_repo.commit()
+                raise
+            logger.info(f"Uploaded file saved: {file_path}")
+        else:
+            # Same content as a stored document: keep only the stored copy
+            temp_path.unlink(missing_ok=True)
+
+            if force:
+                await service.reset_document(document)
+                invalidate_cached_document(document.id)
+                invalidate_chat_answers(document.id)
+            else:
+                response.status_code = status.HTTP_200_OK
+
+        if created or force:
+            background_tasks.add_task(
+                _process_document_async, document.id, stored_path)
+            logger.info(f"Document queued for processing: {document.id}")
+
+        return DocumentResponse.model_validate(document)
 
     except Exception as e:
         logger.error(f"Failed to upload document: {str(e)}", exc_info=True)
 
-        # Clean up file on error
-        if file_path.exists():
-            file_path.unlink()
+        # Clean up the upload on error; the final name may be a stored
+        # document's file, so only the temporary copy is removed
+        temp_path.unlink(missing_ok=True)
 
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -173,12 +361,23 @@ async def upload_document(
         )
 
 
+async def _count_documents() -> int:
+    """
+    Count all documents on a session of its own.
+
+    An AsyncSession runs one statement at a time, so the count needs its
+    own connection to overlap with the page query.
+    """
+    async with get_session_factory()() as session:
+        return await DocumentRepository(session).count()
+
+
 @router.get("/", response_model=DocumentListResponse)
 async def list_documents(
     skip: int = 0,
     limit: int = 100,
     db: AsyncSession = Depends(get_db)
-) -> DocumentListResponse:
+) -> Response:
     """
     List all documents with pagination.
 
@@ -192,36 +391,18 @@ async def list_documents(
     """
     doc_repo = DocumentRepository(db)
 
-    # Get documents
-    documents = await doc_repo.get_all(skip=skip, limit=limit)
-    total = await doc_repo.count()
-
-    # Manually construct responses to avoid SQLAlchemy metadata conflict
-    doc_responses = [
-        DocumentResponse(
-            id=doc.id,
-            filename=doc.filename,
-            file_path=doc.file_path,
-            file_size=doc.file_size,
-            content_hash=doc.content_hash,
-            status=doc.status,
-            processing_started_at=doc.processing_started_at,
-            processing_completed_at=doc.processing_completed_at,
-            processing_error=doc.processing_error,
-            chunk_count=doc.chunk_count,
-            metadata=doc.doc_metadata or {},
-            created_at=doc.created_at,
-            updated_at=doc.updated_at,
-        )
-        for doc in documents
-    ]
+    # Fetch the page and the total concurrently
+    documents, total = await asyncio.gather(
+        doc_repo.get_rows(skip=skip, limit=limit),
+        _count_documents(),
+    )
 
-    return DocumentListResponse(
+    return model_response(DocumentListResponse(
         total=total,
         skip=skip,
         limit=limit,
-        documents=doc_responses
-    )
+        documents=_document_list_adapter.validate_python(documents)
+    ), by_alias=True)
 
 
 @router.get("/statistics", response_model=DocumentStatistics)
@@ -245,13 +426,19 @@ async def get_statistics(
 @router.get("/{document_id}", response_model=DocumentResponse)
 async def get_document(
     document_id: UUID,
+    request: Request,
     db: AsyncSession = Depends(get_db)
-) -> DocumentResponse:
+) -> Response:
     """
     Get document by ID.
 
+    Only updated_at is queried when the serialized document is cached for
+    that version. The response carries an ETag, and a matching
+    If-None-Match is answered with 304.
+
     Args:
         document_id: Document unique identifier
+        request: Incoming request, read for If-None-Match
         db: Database session
 
     Returns:
@@ -261,30 +448,29 @@ async def get_document(
         HTTPException: If document not found
     """
     doc_repo = DocumentRepository(db)
-    document = await doc_repo.get_by_id(document_id)
+    cache_key = str(document_id)
 
-    if not document:
+    updated_at = await doc_repo.get_updated_at(document_id)
+    if updated_at is None:
+        invalidate_cached_document(cache_key)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Document {document_id} not found"
         )
 
-    # Manually construct response to avoid SQLAlchemy metadata conflict
-    return DocumentResponse(
-        id=document.id,
-        filename=document.filename,
-        file_path=document.file_path,
-        file_size=document.file_size,
-        content_hash=document.content_hash,
-        status=document.status,
-        processing_started_at=document.processing_started_at,
-        processing_completed_at=document.processing_completed_at,
-        processing_error=document.processing_error,
-        chunk_count=document.chunk_count,
-        metadata=document.doc_metadata or {},
-        created_at=document.created_at,
-        updated_at=document.updated_at,
-    )
+    body = _get_cached_document(cache_key, updated_at)
+    if body is None:
+        document = await doc_repo.get_by_id(document_id)
+        if not document:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Document {document_id} not found"
+            )
+        body = DocumentResponse.model_validate(document).model_dump_json(
+            by_alias=True).encode()
+        _cache_document(cache_key, document.updated_at, body)
+
+    return conditional_response(request, body)
 
 
 @router.delete("/{document_id}", response_model=StatusResponse)
@@ -312,6 +498,8 @@ async def delete_document(
         HTTPException: If document not found
     """
     deleted = await service.delete_document(document_id)
+    invalidate_cached_document(document_id)
+    invalidate_chat_answers(document_id)
 
     if not deleted:
         raise HTTPException(
@@ -331,7 +519,7 @@ async def get_document_chunks(
     skip: int = 0,
     limit: int = 1000,
     db: AsyncSession = Depends(get_db)
-) -> ChunkListResponse:
+) -> Response:
     """
     Get all chunks for a document.
 
@@ -347,52 +535,119 @@ async def get_document_chunks(
     Raises:
         HTTPException: If document not found
     """
-    doc_repo = DocumentRepository(db)
     chunk_repo = ChunkRepository(db)
 
-    # Check if document exists
-    document = await doc_repo.get_by_id(document_id)
-    if not document:
+    # Get chunks, checking the document exists in the same query
+    chunks = await chunk_repo.get_page_for_document(document_id, skip=skip, limit=limit)
+    if chunks is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Document {document_id} not found"
         )
 
-    # Get chunks
-    chunks = await chunk_repo.get_by_document_id(document_id, skip=skip, limit=limit)
-
-    # Manually construct chunk responses to avoid SQLAlchemy metadata mapping issues
-    chunk_responses = []
-    for chunk in chunks:
-        # Extract bounding boxes from metadata if available
-        bounding_boxes = []
-        if chunk.chunk_metadata and 'bounding_boxes' in chunk.chunk_metadata:
-            bboxes = chunk.chunk_metadata['bounding_boxes']
-            if isinstance(bboxes, list):
-                bounding_boxes = [BoundingBox(
-                    **bbox) if isinstance(bbox, dict) else bbox for bbox in bboxes]
-
-        chunk_responses.append(ChunkResponse(
-            id=chunk.id,
-            document_id=chunk.document_id,
-            content=chunk.content,
-            chunk_index=chunk.chunk_index,
-            chunk_type=chunk.chunk_type,
-            start_page=chunk.start_page,
-            end_page=chunk.end_page,
-            token_count=chunk.token_count,
-            vector_id=chunk.vector_id,
-            bounding_boxes=bounding_boxes,
-            chunk_metadata=chunk.chunk_metadata or {},
-            created_at=chunk.created_at,
-            updated_at=chunk.updated_at,
-        ))
-
-    return ChunkListResponse(
+    # Validated once here and dumped by pydantic-core, skipping
+    # jsonable_encoder and the response_model pass over every chunk
+    return model_response(ChunkListResponse(
         document_id=document_id,
         total=len(chunks),
-        chunks=chunk_responses
-    )
+        chunks=_chunk_list_adapter.validate_python(chunks)
+    ), by_alias=True)
+
+
+@router.get(
+    "/{document_id}/chunks/stream",
+    response_class=StreamingResponse,
+)
+async def stream_document_chunks(
+    document_id: UUID,
+    db: AsyncSession = Depends(get_db)
+) -> StreamingResponse:
+    """
+    Stream all chunks of a document as NDJSON, one chunk per line.
+
+    Each line is one chunk in the ChunkResponse shape. Rows are sent as
+    they come off the database cursor, so memory use does not grow with
+    the size of the document; prefer this over GET /chunks for large
+    documents.
+
+    Args:
+        document_id: Document unique identifier
+        db: Database session
+
+    Returns:
+        NDJSON stream of chunks
+
+    Raises:
+        HTTPException: If document not found
+    """
+    doc_repo = DocumentRepository(db)
+    if not await doc_repo.exists(document_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Document {document_id} not found"
+        )
+
+    async def lines():
+        # The request's session is closed before the body is streamed
+        async with get_session_factory()() as session:
+            chunk_repo = ChunkRepository(session)
+            async for chunk in chunk_repo.stream_by_document_id(document_id):
+                yield ChunkResponse.model_validate(chunk).model_dump_json(
+                    by_alias=True).encode() + b"\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+_PAGE_NUMBER_RE = re.compile(r"\d+")
+
+
+def _source_page(meta: Dict[str, Any]) -> Optional[int]:
+    """Page of a retrieval hit: start_page, then page, then first of page_numbers."""
+    if meta.get('start_page') is not None:
+        return meta['start_page']
+    if meta.get('page') is not None:
+        return meta['page']
+    page_nums = meta.get('page_numbers')
+    if not page_nums:
+        return None
+    try:
+        # page_numbers might be a list or a string representation
+        if isinstance(page_nums, (list, tuple)):
+            return int(page_nums[0])
+        if isinstance(page_nums, str):
+            m = _PAGE_NUMBER_RE.search(page_nums)
+            if m:
+                return int(m.group(0))
+    except (TypeError, ValueError):
+        pass
+    return None
+
+
+def _chat_source(result: Dict[str, Any], document_id: UUID) -> Dict[str, Any]:
+    """Build the chat source entry of one retrieval hit."""
+    meta = result.get('metadata') or {}
+    text = result.get('text') or ""
+    dist = result.get('distance')
+
+    # Prefer explicit id from result; fallback to document_id + chunk_index
+    chunk_id = result.get('id')
+    if not chunk_id:
+        chunk_index = meta.get('chunk_index')
+        chunk_id = f"{document_id}_{chunk_index}" if chunk_index is not None else ""
+
+    page = _source_page(meta)
+    similarity = 1.0 - dist if isinstance(dist, (int, float)) else 0.0
+
+    return {
+        "chunk_id": chunk_id,
+        "content": text[:200] + "..." if len(text) > 200 else text,
+        # original keys (keep for backward compatibility)
+        "page": page,
+        "similarity": similarity,
+        # frontend-friendly aliases expected by React UI
+        "page_number": page,
+        "similarity_score": similarity,
+    }
 
 
 @router.post("/{document_id}/chat", response_model=ChatResponse)
@@ -433,45 +688,93 @@ async def chat_with_document(
                 f"top_k={payload.top_k}, temperature={payload.temperature}, "
                 f"history_len={len(payload.conversation_history) if payload.conversation_history else 0}")
 
-    # Also attempt to log raw JSON body for debugging frontend 422 issues
-    if request_obj is not None:
+    # Also log the raw JSON body for debugging frontend 422 issues; only
+    # at DEBUG level, as it parses the whole body a second time
+    if request_obj is not None and settings.log_level == "DEBUG":
         try:
             raw = await request_obj.json()
-            logger.debug(f"Chat raw request body: {raw}")
+            logger.debug("Chat raw request body: {}", raw)
         except Exception as e:
-            logger.debug(f"Failed to read raw request body: {e}")
+            logger.debug("Failed to read raw request body: {}", e)
 
     start_time = time.time()
 
     doc_repo = DocumentRepository(db)
 
-    # Check if document exists
-    document = await doc_repo.get_by_id(document_id)
-    if not document:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Document {document_id} not found"
+    # Repeated questions skip retrieval and generation
+    cache_key = _chat_cache_key(document_id, payload)
+    cached = _chat_cache.get(cache_key)
+    if cached is not None:
+        if not await doc_repo.exists(document_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Document {document_id} not found"
+            )
+        answer, sources = cached
+        logger.info(f"Chat answer served from cache: document_id={document_id}")
+        return ChatResponse(
+            answer=answer,
+            sources=sources,
+            document_id=document_id,
+            question=payload.question,
+            processing_time=time.time() - start_time,
         )
 
-    try:
-        # Initialize services
-        retrieval_service = RetrievalService()
-        llm_service = LLMService()
-
-        # Get collection name (use filename)
-        collection_name = document.filename
-
-        # Retrieve relevant chunks
-        results = retrieval_service.search_by_document(
+    retrieval_service = get_retrieval_service()
+    llm_service = get_llm_service()
+
+    def retrieve():
+        # The question is embedded once, for both the similar-question
+        # lookup and the vector search it may make unnecessary
+        embedding = retrieval_service.embeddings_service.encode_text(
+            payload.question)
+        similar = _find_similar_answer(str(document_id), embedding, payload)
+        if similar is not None:
+            return embedding, similar, None
+        return embedding, None, retrieval_service.search_by_document(
             query_text=payload.question,
             document_id=str(document_id),
             n_results=payload.top_k,
+            query_embedding=embedding,
         )
 
+    # Check the document exists while the (blocking) retrieval runs in a
+    # worker thread; results are discarded if it does not
+    document_exists, retrieved = await asyncio.gather(
+        doc_repo.exists(document_id),
+        asyncio.to_thread(retrieve),
+        return_exceptions=True,
+    )
+    if isinstance(document_exists, BaseException):
+        raise document_exists
+    if not document_exists:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Document {document_id} not found"
+        )
+
+    try:
+        if isinstance(retrieved, BaseException):
+            raise retrieved
+        embedding, similar, results = retrieved
+
+        if similar is not None:
+            _chat_cache.set(cache_key, similar)
+            answer, sources = similar
+            logger.info(
+                f"Chat answer reused from a similar question: document_id={document_id}")
+            return ChatResponse(
+                answer=answer,
+                sources=sources,
+                document_id=document_id,
+                question=payload.question,
+                processing_time=time.time() - start_time,
+            )
+
         # RetrievalService.search_by_document returns a list of formatted result dicts
         # each with keys: 'id', 'text' (or 'content'), 'metadata', 'distance'.
         # Debug: log raw retrieval results to help diagnose missing fields
-        logger.debug(f"Retrieval results raw: {results}")
+        logger.debug("Retrieval results raw: {}", results)
 
         if not results:
             # Instead of returning a 404 (which the frontend surfaces as "Not Found"),
@@ -484,29 +787,18 @@ async def chat_with_document(
                 answer="未能找到与问题相关的文档内容。请尝试缩短或更换问题，或确认文档已正确索引/嵌入。",
                 sources=[],
                 document_id=document_id,
-                question=payload.question if hasattr(
-                    payload, 'question') else "",
+                question=payload.question,
                 processing_time=0.0,
             )
 
-        # Normalize results into lists of docs/metadatas/distances
-        # Some result entries may use 'text' or 'content'
-        retrieved_docs = [r.get('text') or r.get(
-            'content') or '' for r in results]
-        metadatas = [r.get('metadata', {}) for r in results]
-        distances = [r.get('distance', None) for r in results]
-
-        # Prepare context
-        context = "\n\n".join(retrieved_docs)
-
         # Generate answer using LLMService.answer_question (RAG)
         answer_result = await llm_service.answer_question(
             question=payload.question,
             document_id=str(document_id),
             n_contexts=payload.top_k,
-            language=payload.language if hasattr(
-                payload, 'language') else 'zh',
+            language='zh',
             temperature=payload.temperature,
+            context_chunks=results,
         )
 
         # The service returns a dict with 'answer' and 'contexts'
@@ -514,75 +806,20 @@ async def chat_with_document(
             answer_result, dict) else answer_result
 
         # Prepare sources from original results to ensure chunk_id is present
-        sources = []
-        for r in results:
-            meta = r.get('metadata') or {}
-            text = r.get('text') or ""
-            dist = r.get('distance')
-            # Prefer explicit id from result; fallback to document_id + chunk_index
-            chunk_id = r.get('id')
-            if not chunk_id:
-                chunk_index = meta.get('chunk_index')
-                if chunk_index is not None:
-                    chunk_id = f"{document_id}_{chunk_index}"
-                else:
-                    chunk_id = ""
-
-            content_snippet = text[:200] + \
-                "..." if isinstance(text, str) and len(text) > 200 else text
-            similarity = (1 - dist) if (isinstance(dist,
-                                                   (int, float)) and dist is not None) else 0
-
-            # Build source object and include frontend-friendly aliases
-            page_val = None
-            # Prefer metadata start_page, then 'page', then first of page_numbers
-            if meta:
-                if meta.get('start_page') is not None:
-                    page_val = meta.get('start_page')
-                elif meta.get('page') is not None:
-                    page_val = meta.get('page')
-                elif meta.get('page_numbers'):
-                    try:
-                        page_nums = meta.get('page_numbers')
-                        # page_numbers might be a list or a string representation
-                        if isinstance(page_nums, (list, tuple)) and len(page_nums) > 0:
-                            page_val = int(page_nums[0])
-                        elif isinstance(page_nums, str):
-                            # attempt to parse digits
-                            import re
-                            m = re.search(r"\d+", page_nums)
-                            if m:
-                                page_val = int(m.group(0))
-                    except Exception:
-                        page_val = None
-
-            similarity_val = None
-            try:
-                if similarity is not None:
-                    similarity_val = float(similarity)
-            except Exception:
-                similarity_val = None
-
-            sources.append({
-                "chunk_id": chunk_id,
-                "content": content_snippet,
-                # original keys (keep for backward compatibility)
-                "page": page_val,
-                "similarity": similarity_val,
-                # frontend-friendly aliases expected by React UI
-                "page_number": page_val,
-                "similarity_score": similarity_val,
-            })
+        sources = [_chat_source(r, document_id) for r in results]
 
         processing_time = time.time() - start_time
 
-        return ChatResponse(
+        response = ChatResponse(
             answer=answer,
             sources=sources,
             document_id=document_id,
             question=payload.question,
             processing_time=processing_time,
         )
+        _chat_cache.set(cache_key, (answer, sources))
+        _remember_answer(str(document_id), embedding, payload, (answer, sources))
+        return response
 
     except HTTPException:
         raise
@@ -597,13 +834,18 @@ async def chat_with_document(
 @router.get("/{document_id}/file")
 async def get_document_file(
     document_id: UUID,
+    request: Request,
     db: AsyncSession = Depends(get_db)
-) -> FileResponse:
+) -> Response:
     """
     Get the original PDF file for a document.
 
+    The content hash is sent as the ETag, so a viewer reloading the same
+    document gets 304 instead of the whole file.
+
     Args:
         document_id: Document unique identifier
+        request: Incoming request, read for If-None-Match
         db: Database session
 
     Returns:
@@ -613,7 +855,7 @@ async def get_document_file(
         HTTPException: If document or file not found
     """
     doc_repo = DocumentRepository(db)
-    document = await doc_repo.get_by_id(document_id)
+    document = await doc_repo.get_file_info(document_id)
 
     if not document:
         raise HTTPException(
@@ -621,33 +863,38 @@ async def get_document_file(
             detail=f"Document {document_id} not found"
         )
 
-    file_path = Path(document.file_path)
-    if not file_path.exists():
+    try:
+        return conditional_file_response(
+            request,
+            document.file_path,
+            document.content_hash,
+            filename=document.filename,
+            media_type="application/pdf",
+            accel_redirect=_accel_redirect_uri(document.file_path),
+        )
+    except FileNotFoundError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"File not found: {document.file_path}"
         )
 
-    return FileResponse(
-        path=file_path,
-        media_type="application/pdf",
-        filename=document.filename
-    )
-
 
 @router.get("/{document_id}/thumbnail")
 async def get_document_thumbnail(
     document_id: UUID,
+    request: Request,
     db: AsyncSession = Depends(get_db)
-) -> FileResponse:
+) -> Response:
     """
     Get a thumbnail image for the first page of a document.
 
-    Note: This is a placeholder implementation that returns a default image.
-    Full implementation would require PDF-to-image conversion (e.g., using pdf2image).
+    The PNG is rendered once during processing; documents processed before
+    that have theirs rendered on first request. A document's content never
+    changes, so browsers and proxies may keep the image for a day.
 
     Args:
         document_id: Document unique identifier
+        request: Incoming request, read for If-None-Match
         db: Database session
 
     Returns:
@@ -657,7 +904,7 @@ async def get_document_thumbnail(
         HTTPException: If document not found
     """
     doc_repo = DocumentRepository(db)
-    document = await doc_repo.get_by_id(document_id)
+    document = await doc_repo.get_file_info(document_id)
 
     if not document:
         raise HTTPException(
@@ -665,20 +912,72 @@ async def get_document_thumbnail(
             detail=f"Document {document_id} not found"
         )
 
-    # TODO: Implement actual thumbnail generation
-    # For now, return the PDF file itself (browser can preview first page)
-    file_path = Path(document.file_path)
-    if not file_path.exists():
+    thumb_path = (document.doc_metadata or {}).get("thumbnail_path")
+    if not thumb_path or not Path(thumb_path).is_file():
+        try:
+            parser = PDFParser(document.file_path, use_cache=False)
+            thumb_path = await asyncio.to_thread(
+                parser.render_thumbnail,
+                thumbnail_path_for(document.file_path, str(document_id)))
+        except FileNotFoundError:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"File not found: {document.file_path}"
+            )
+        except PDFProcessingError as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=str(e)
+            )
+
+    try:
+        return conditional_file_response(
+            request,
+            str(thumb_path),
+            document.content_hash,
+            filename=f"{Path(document.filename).stem}_thumbnail.png",
+            media_type="image/png",
+            accel_redirect=_accel_redirect_uri(str(thumb_path)),
+            cache_control="public, max-age=86400, immutable",
+        )
+    except FileNotFoundError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"File not found: {document.file_path}"
+            detail=f"Thumbnail not found for document {document_id}"
         )
 
-    return FileResponse(
-        path=file_path,
-        media_type="application/pdf",
-        filename=f"{document.filename}_thumbnail.pdf"
-    )
+
+def _accel_redirect_uri(file_path: str) -> Optional[str]:
+    """
+    Internal NGINX URI of an uploaded file, if X-Accel-Redirect is enabled.
+
+    Returns None when x_accel_prefix is unset or the file lies outside
+    upload_dir, in which case the application sends the file itself.
+    """
+    if not settings.x_accel_prefix:
+        return None
+    try:
+        relative = Path(file_path).resolve().relative_to(
+            Path(settings.upload_dir).resolve())
+    except ValueError:
+        return None
+    return f"{settings.x_accel_prefix.rstrip('/')}/{quote(relative.as_posix())}"
+
+
+def _position_in_bboxes(
+    bboxes: List[Dict[str, Any]],
+    page: int,
+    x: float,
+    y: float
+) -> bool:
+    """Check whether a point on a page lies inside any of the boxes."""
+    for bbox in bboxes:
+        if bbox.get('page') != page:
+            continue
+        if (bbox.get('x0', 0) <= x <= bbox.get('x1', 999) and
+                bbox.get('y0', 0) <= y <= bbox.get('y1', 999)):
+            return True
+    return False
 
 
 @router.post("/{document_id}/current-context")
@@ -688,7 +987,7 @@ async def get_current_context(
     x: Optional[float] = None,
     y: Optional[float] = None,
     db: AsyncSession = Depends(get_db)
-) -> Dict[str, Any]:
+) -> Response:
     """
     Get relevant chunk context based on current reading position.
 
@@ -708,70 +1007,61 @@ async def get_current_context(
     Raises:
         HTTPException: If document not found
     """
-    doc_repo = DocumentRepository(db)
     chunk_repo = ChunkRepository(db)
 
-    # Check if document exists
-    document = await doc_repo.get_by_id(document_id)
-    if not document:
+    # Get chunks covering the current page, checking the document exists
+    # in the same query
+    page_chunks = await chunk_repo.get_covering_page(document_id, page)
+    if page_chunks is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Document {document_id} not found"
         )
 
-    # Get all chunks for the document
-    all_chunks = await chunk_repo.get_by_document_id(document_id, skip=0, limit=10000)
+    has_position = x is not None and y is not None
 
-    # Filter chunks that are on or near the current page
     relevant_chunks = []
-    for chunk in all_chunks:
-        if chunk.start_page <= page <= chunk.end_page:
-            # Calculate relevance score based on position
-            relevance = 1.0
-
-            # If coordinates provided, check if chunk overlaps with position
-            if x is not None and y is not None and chunk.chunk_metadata:
-                bboxes = chunk.chunk_metadata.get('bounding_boxes', [])
-                for bbox in bboxes:
-                    if (bbox.get('page') == page and
-                        bbox.get('x0', 0) <= x <= bbox.get('x1', 999) and
-                            bbox.get('y0', 0) <= y <= bbox.get('y1', 999)):
-                        relevance = 2.0  # Higher relevance for position match
-                        break
-
-            relevant_chunks.append({
-                'chunk_id': str(chunk.id),
-                'chunk_index': chunk.chunk_index,
-                'content': chunk.content,
-                'chunk_type': chunk.chunk_type,
-                'start_page': chunk.start_page,
-                'end_page': chunk.end_page,
-                'relevance': relevance,
-                'bounding_boxes': chunk.chunk_metadata.get('bounding_boxes', []) if chunk.chunk_metadata else []
-            })
-
-    # Sort by relevance and page proximity
-    relevant_chunks.sort(
+    for chunk in page_chunks:
+        bboxes = (chunk.chunk_metadata or {}).get('bounding_boxes') or []
+
+        # Higher relevance if the position falls inside one of the chunk's
+        # boxes on this page
+        relevance = 1.0
+        if has_position and _position_in_bboxes(bboxes, page, x, y):
+            relevance = 2.0
+
+        relevant_chunks.append({
+            'chunk_id': str(chunk.id),
+            'chunk_index': chunk.chunk_index,
+            'content': chunk.content,
+            'chunk_type': chunk.chunk_type,
+            'start_page': chunk.start_page,
+            'end_page': chunk.end_page,
+            'relevance': relevance,
+            'bounding_boxes': bboxes
+        })
+
+    # Top 5 by relevance and page proximity, without sorting the rest
+    top_chunks = heapq.nsmallest(
+        5, relevant_chunks,
         key=lambda c: (-c['relevance'], abs(c['start_page'] - page)))
 
-    # Return top 5 most relevant chunks
-    top_chunks = relevant_chunks[:5]
-
-    return {
+    # Plain data: hand it to orjson directly instead of jsonable_encoder
+    return OrjsonResponse({
         'document_id': str(document_id),
         'current_page': page,
         'current_position': {'x': x, 'y': y} if x is not None and y is not None else None,
         'relevant_chunks': top_chunks,
         'total_found': len(relevant_chunks)
-    }
+    })
 
 
-@router.get("/{document_id}/chunks/{chunk_id}")
+@router.get("/{document_id}/chunks/{chunk_id}", response_model=ChunkResponse)
 async def get_chunk_detail(
     document_id: UUID,
     chunk_id: UUID,
     db: AsyncSession = Depends(get_db)
-) -> ChunkResponse:
+) -> Response:
     """
     Get detailed information about a specific chunk.
 
@@ -786,45 +1076,18 @@ async def get_chunk_detail(
     Raises:
         HTTPException: If document or chunk not found
     """
-    doc_repo = DocumentRepository(db)
     chunk_repo = ChunkRepository(db)
 
-    # Check if document exists
-    document = await doc_repo.get_by_id(document_id)
-    if not document:
+    document_exists, chunk = await chunk_repo.get_in_document(document_id, chunk_id)
+    if not document_exists:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Document {document_id} not found"
         )
-
-    # Get chunk
-    chunk = await chunk_repo.get_by_id(chunk_id)
-    if not chunk or str(chunk.document_id) != str(document_id):
+    if chunk is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Chunk {chunk_id} not found in document {document_id}"
         )
 
-    # Extract bounding boxes from metadata if available
-    bounding_boxes = []
-    if chunk.chunk_metadata and 'bounding_boxes' in chunk.chunk_metadata:
-        bboxes = chunk.chunk_metadata['bounding_boxes']
-        if isinstance(bboxes, list):
-            bounding_boxes = [BoundingBox(
-                **bbox) if isinstance(bbox, dict) else bbox for bbox in bboxes]
-
-    return ChunkResponse(
-        id=chunk.id,
-        document_id=chunk.document_id,
-        content=chunk.content,
-        chunk_index=chunk.chunk_index,
-        chunk_type=chunk.chunk_type,
-        start_page=chunk.start_page,
-        end_page=chunk.end_page,
-        token_count=chunk.token_count,
-        vector_id=chunk.vector_id,
-        bounding_boxes=bounding_boxes,
-        chunk_metadata=chunk.chunk_metadata or {},
-        created_at=chunk.created_at,
-        updated_at=chunk.updated_at,
-    )
+    return model_response(ChunkResponse.model_validate(chunk), by_alias=True)
@@ -5,7 +5,9 @@ This module provides JWT-based authentication functionality.
 """
 
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional, Dict, Any
+import time
 import jwt
 from passlib.context import CryptContext
 
@@ -20,6 +22,21 @@ settings = get_settings()
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
+@lru_cache(maxsize=4096)
+def _decode_verified(token: str) -> Dict[str, Any]:
+    """
+    Verify a token's signature and decode its claims.
+
+    Cached per token string so repeated requests with the same token skip
+    signature verification; failures raise and are therefore never cached.
+    """
+    return jwt.decode(
+        token,
+        settings.secret_key,
+        algorithms=[settings.algorithm]
+    )
+
+
 class AuthUtils:
     """Utility class for authentication operations."""
 
@@ -109,12 +126,7 @@ class AuthUtils:
             AuthenticationError: If token is invalid or expired
         """
         try:
-            payload = jwt.decode(
-                token,
-                settings.secret_key,
-                algorithms=[settings.algorithm]
-            )
-            return payload
+            payload = _decode_verified(token)
         except jwt.ExpiredSignatureError:
             logger.warning("Token has expired")
             raise AuthenticationError("Token has expired")
@@ -125,6 +137,14 @@ class AuthUtils:
             logger.error(f"Error decoding token: {e}")
             raise AuthenticationError(f"Token verification failed: {str(e)}")
 
+        # A cached payload can outlive its exp claim; re-check it on every hit
+        exp = payload.get("exp")
+        if exp is not None and exp <= time.time():
+            logger.warning("Token has expired")
+            raise AuthenticationError("Token has expired")
+
+        return dict(payload)
+
     @staticmethod
     def get_user_id_from_token(token: str) -> Optional[str]:
         """
@@ -80,17 +80,36 @@ class Settings(BaseSettings):
         description="Enable SQLAlchemy SQL query logging"
     )
     database_pool_size: int = Field(
-        default=20,
+        default=25,
         ge=5,
         le=100,
         description="Database connection pool size"
     )
     database_max_overflow: int = Field(
-        default=10,
+        default=25,
         ge=0,
         le=50,
         description="Maximum overflow connections"
     )
+    database_pool_recycle: int = Field(
+        default=1800,
+        ge=60,
+        description="Seconds after which pooled connections are recycled"
+    )
+    database_pool_timeout: int = Field(
+        default=30,
+        ge=1,
+        description="Seconds to wait for a free pooled connection"
+    )
+    database_statement_cache_size: int = Field(
+        default=1024,
+        ge=0,
+        description="Prepared statements cached per pooled asyncpg connection"
+    )
+    database_external_pooler: bool = Field(
+        default=False,
+        description="Connect through PgBouncer in transaction mode (no app-side pool)"
+    )
 
     # ==================== Redis Settings ====================
     redis_url: str = Field(
@@ -102,6 +121,31 @@ class Settings(BaseSettings):
         ge=60,
         description="Redis cache TTL in seconds"
     )
+    annotation_cache_ttl: int = Field(
+        default=60,
+        ge=1,
+        description="TTL in seconds for cached annotation listings"
+    )
+    bookmark_cache_ttl: int = Field(
+        default=300,
+        ge=1,
+        description="TTL in seconds for cached bookmark responses"
+    )
+    bookmark_ai_rate_per_minute: int = Field(
+        default=10,
+        ge=1,
+        description="AI bookmark generations allowed per user per minute"
+    )
+    bookmark_ai_rate_per_hour: int = Field(
+        default=100,
+        ge=1,
+        description="AI bookmark generations allowed per user per hour"
+    )
+    bookmark_bulk_rate_per_hour: int = Field(
+        default=10,
+        ge=1,
+        description="Bulk bookmark imports allowed per user per hour"
+    )
 
     # ==================== Gemini AI Settings ====================
     gemini_api_key: str = Field(
@@ -174,6 +218,11 @@ class Settings(BaseSettings):
         default=3072,
         description="Vector embedding dimension (text-embedding-3-large)"
     )
+    embedding_batch_size: int = Field(
+        default=64,
+        ge=1,
+        description="Texts encoded per embedding model call when indexing"
+    )
     max_retrieval_results: int = Field(
         default=10,
         ge=1,
@@ -196,6 +245,11 @@ class Settings(BaseSettings):
         default=[".pdf"],
         description="Allowed file extensions"
     )
+    x_accel_prefix: Optional[str] = Field(
+        default=None,
+        description="Internal NGINX location serving upload_dir; when set, "
+                    "document files are handed to NGINX via X-Accel-Redirect"
+    )
 
     # ==================== PDF Processing Settings ====================
     pdf_processing_timeout: int = Field(
@@ -89,7 +89,8 @@ def setup_logging(settings: Settings) -> None:
             "{message}"
         )
 
-    # Add console handler
+    # Add console handler; enqueue moves the write to loguru's worker
+    # thread so request handlers never block on stdout
     logger.add(
         sys.stdout,
         format=console_format,
@@ -97,6 +98,7 @@ def setup_logging(settings: Settings) -> None:
         colorize=True,
         backtrace=settings.debug,
         diagnose=settings.debug,
+        enqueue=True,
     )
 
     # Add file handler with rotation
@@ -88,15 +88,16 @@ class GeminiClient:
                 }
             }
 
-            logger.debug(f"Sending request to: {url[:50]}...")
-            logger.debug(f"Payload: {payload}")
+            # Lazy arguments: the payload is only rendered at DEBUG level
+            logger.debug("Sending request to: {}...", url[:50])
+            logger.debug("Payload: {}", payload)
 
             response = await self.client.post(url, json=payload)
 
             response.raise_for_status()
             result = response.json()
 
-            logger.debug(f"Received response: {result}")
+            logger.debug("Received response: {}", result)
 
             # Extract content from response
             if "candidates" in result and len(result["candidates"]) > 0:
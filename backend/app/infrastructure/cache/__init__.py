@@ -0,0 +1,9 @@
+"""Cache infrastructure module"""
+
+from .redis_client import get_redis_client, close_redis_client
+from .response_cache import ResponseCache
+from .rate_limiter import RateLimiter, hit_all
+from .ttl_cache import TTLCache
+
+__all__ = ["get_redis_client", "close_redis_client", "ResponseCache", "RateLimiter",
+           "hit_all", "TTLCache"]
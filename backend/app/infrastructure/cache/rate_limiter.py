@@ -0,0 +1,107 @@
+"""
+Fixed-window rate limiting backed by Redis.
+
+Each (limiter, key) pair counts hits in a Redis counter that expires with
+its window. Several limiters of one key are checked and charged together
+by a Lua script, so concurrent workers share one budget per key and a
+rejected request uses up none of them. When Redis is unreachable requests
+are allowed rather than rejected.
+"""
+
+from typing import Optional, Sequence, Tuple
+
+from redis.exceptions import RedisError
+
+from ...core.logging import get_logger
+from .redis_client import get_redis_client, mark_redis_unavailable, redis_available
+
+logger = get_logger(__name__)
+
+# KEYS: one counter per limiter; ARGV: cost, then limit and window per key.
+# Returns {0, 0} when every limiter allows the hits, otherwise
+# {index of the first exhausted limiter, seconds until it resets}
+_HIT_SCRIPT = """
+local cost = tonumber(ARGV[1])
+for i, key in ipairs(KEYS) do
+    local hits = tonumber(redis.call('GET', key) or '0')
+    if hits + cost > tonumber(ARGV[2 * i]) then
+        return {i, redis.call('TTL', key)}
+    end
+end
+for i, key in ipairs(KEYS) do
+    if redis.call('INCRBY', key, cost) == cost then
+        redis.call('EXPIRE', key, ARGV[2 * i + 1])
+    end
+end
+return {0, 0}
+"""
+
+
+class RateLimiter:
+    """Allow at most `limit` hits per key in each `window` seconds."""
+
+    def __init__(self, prefix: str, limit: int, window: int):
+        """
+        Initialize rate limiter.
+
+        Args:
+            prefix: Key namespace, e.g. "ratelimit:genbookmark:minute"
+            limit: Hits allowed per window
+            window: Window length in seconds
+        """
+        self.prefix = prefix
+        self.limit = limit
+        self.window = window
+
+    async def hit(self, key: str, cost: int = 1) -> Optional[int]:
+        """
+        Record hits for a key.
+
+        Args:
+            key: Subject of the limit, e.g. a user ID
+            cost: Number of hits to record
+
+        Returns:
+            None if within the limit, otherwise seconds until it resets
+        """
+        exceeded = await hit_all((self,), key, cost)
+        return exceeded[1] if exceeded is not None else None
+
+
+async def hit_all(
+    limiters: Sequence[RateLimiter],
+    key: str,
+    cost: int = 1
+) -> Optional[Tuple[RateLimiter, int]]:
+    """
+    Record hits for a key against several limiters at once.
+
+    The hits are only recorded if every limiter allows them.
+
+    Args:
+        limiters: Limiters to check, e.g. a per-minute and a per-hour one
+        key: Subject of the limits, e.g. a user ID
+        cost: Number of hits to record
+
+    Returns:
+        None if within all limits, otherwise the first exhausted limiter
+        and the seconds until it resets
+    """
+    if not limiters or not redis_available():
+        return None
+
+    args = [cost]
+    for limiter in limiters:
+        args += [limiter.limit, limiter.window]
+    try:
+        redis = await get_redis_client()
+        index, ttl = await redis.eval(
+            _HIT_SCRIPT, len(limiters),
+            *(f"{limiter.prefix}:{key}" for limiter in limiters), *args)
+    except RedisError as e:
+        mark_redis_unavailable(e)
+        return None
+
+    if index == 0:
+        return None
+    return limiters[index - 1], max(int(ttl), 1)
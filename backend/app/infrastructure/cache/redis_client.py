@@ -0,0 +1,65 @@
+"""
+Redis client for IntelliPDF.
+
+Provides a shared asyncio Redis connection pool. Redis is optional at
+runtime: callers treat connection errors as cache misses, and after an
+error skip Redis for a while instead of paying a timeout per request.
+"""
+
+import time
+from typing import Optional
+
+from redis.asyncio import Redis
+
+from ...core.config import get_settings
+from ...core.logging import get_logger
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+
+# Singleton instance
+_redis_client: Optional[Redis] = None
+
+# After a Redis error, skip Redis for this long instead of paying a
+# connection timeout on every request
+_RETRY_AFTER = 30.0
+_unavailable_until = 0.0
+
+
+def redis_available() -> bool:
+    """Whether Redis may be used, i.e. no recent error is backing off."""
+    return time.monotonic() >= _unavailable_until
+
+
+def mark_redis_unavailable(e: Exception) -> None:
+    """Back off from Redis for a while after an error."""
+    global _unavailable_until
+    if redis_available():
+        logger.warning(
+            f"Redis unavailable, caches and rate limits bypassed for {_RETRY_AFTER:.0f}s: {e}")
+    _unavailable_until = time.monotonic() + _RETRY_AFTER
+
+
+async def get_redis_client() -> Redis:
+    """Get or create Redis client instance."""
+    global _redis_client
+    if _redis_client is None:
+        # Short timeouts so an unreachable Redis degrades to a cache miss
+        # instead of stalling the request
+        _redis_client = Redis.from_url(
+            settings.redis_url,
+            socket_connect_timeout=0.5,
+            socket_timeout=0.5,
+        )
+        logger.info("Redis client initialized")
+    return _redis_client
+
+
+async def close_redis_client() -> None:
+    """Close Redis client instance."""
+    global _redis_client
+    if _redis_client is not None:
+        await _redis_client.aclose()
+        _redis_client = None
+        logger.info("Redis client closed")
@@ -0,0 +1,94 @@
+"""
+Grouped cache-aside storage for serialized API responses.
+
+Each cached body belongs to a group (e.g. one document's annotations or
+one user's bookmarks). The keys of a group are tracked in a Redis set,
+so a write can drop the whole group at once. Redis failures are treated
+as cache misses.
+"""
+
+from typing import Iterable, Optional
+
+from redis.exceptions import RedisError
+
+from ...core.logging import get_logger
+from .redis_client import get_redis_client, mark_redis_unavailable, redis_available
+
+logger = get_logger(__name__)
+
+# Deletes each group's tracked keys and the tracking set in one atomic
+# step, so a concurrent set() cannot register a key that is then missed
+_INVALIDATE_SCRIPT = """
+for _, keys_set in ipairs(KEYS) do
+    local keys = redis.call('SMEMBERS', keys_set)
+    for i = 1, #keys, 1000 do
+        redis.call('DEL', unpack(keys, i, math.min(i + 999, #keys)))
+    end
+    redis.call('DEL', keys_set)
+end
+return 0
+"""
+
+
+class ResponseCache:
+    """Redis cache of response bodies, invalidated per group."""
+
+    def __init__(self, prefix: str, ttl: int):
+        """
+        Initialize response cache.
+
+        Args:
+            prefix: Key namespace, e.g. "ann"
+            ttl: Entry lifetime in seconds
+        """
+        self.prefix = prefix
+        self.ttl = ttl
+
+    def key(self, group: str, *parts) -> str:
+        """Build the cache key of one response within a group."""
+        return ":".join([self.prefix, group, *map(str, parts)])
+
+    def _keys_set(self, group: str) -> str:
+        return f"{self.prefix}:{group}:keys"
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """Return a cached body, or None on miss or Redis failure."""
+        if not redis_available():
+            return None
+        try:
+            redis = await get_redis_client()
+            return await redis.get(key)
+        except RedisError as e:
+            mark_redis_unavailable(e)
+            return None
+
+    async def set(self, group: str, key: str, body: bytes) -> None:
+        """Cache a body and register its key with the group."""
+        if not redis_available():
+            return
+        try:
+            redis = await get_redis_client()
+            async with redis.pipeline(transaction=True) as pipe:
+                pipe.set(key, body, ex=self.ttl)
+                pipe.sadd(self._keys_set(group), key)
+                pipe.expire(self._keys_set(group), self.ttl)
+                await pipe.execute()
+        except RedisError as e:
+            mark_redis_unavailable(e)
+
+    async def invalidate(self, groups: Iterable[str]) -> None:
+        """
+        Drop every cached body of the given groups.
+
+        Attempted even while reads and writes are bypassed after an error:
+        the entries outlive this worker's outage in Redis, and other
+        workers would keep serving them.
+        """
+        keys_sets = [self._keys_set(group) for group in set(groups)]
+        if not keys_sets:
+            return
+        try:
+            redis = await get_redis_client()
+            await redis.eval(_INVALIDATE_SCRIPT, len(keys_sets), *keys_sets)
+        except RedisError as e:
+            mark_redis_unavailable(e)
@@ -6,6 +6,7 @@ with connection pooling and proper lifecycle management.
 """
 
 from typing import AsyncGenerator
+from uuid import uuid4
 
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
@@ -13,7 +14,7 @@ from sqlalchemy.ext.asyncio import (
     async_sessionmaker,
     create_async_engine,
 )
-from sqlalchemy.pool import NullPool, QueuePool
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
 
 from ...core.config import Settings, get_settings
 from ...core.logging import get_logger
@@ -51,27 +52,43 @@ def get_engine(settings: Settings | None = None) -> AsyncEngine:
                 echo=settings.database_echo,
                 poolclass=NullPool,
             )
-        elif settings.is_production:
+        elif settings.database_external_pooler:
+            # PgBouncer in transaction mode pools server connections itself
+            # and cannot keep prepared statements across transactions
             _engine = create_async_engine(
                 settings.database_url,
                 echo=settings.database_echo,
-                poolclass=QueuePool,
+                poolclass=NullPool,
+                connect_args={
+                    "statement_cache_size": 0,
+                    "prepared_statement_cache_size": 0,
+                    # Unnamed statements still get asyncpg's sequential
+                    # names, which collide on a shared server connection
+                    "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+                }
+            )
+        else:
+            # Pool connections in every environment; NullPool would open a
+            # new server connection for each request session
+            _engine = create_async_engine(
+                settings.database_url,
+                echo=settings.database_echo,
+                poolclass=AsyncAdaptedQueuePool,
                 pool_size=settings.database_pool_size,
                 max_overflow=settings.database_max_overflow,
+                pool_timeout=settings.database_pool_timeout,
                 pool_pre_ping=True,
-                pool_recycle=3600,
+                pool_recycle=settings.database_pool_recycle,
                 connect_args={
+                    # Keep parsed/planned statements on each connection:
+                    # asyncpg's own cache and SQLAlchemy's adapter cache
+                    "statement_cache_size": settings.database_statement_cache_size,
+                    "prepared_statement_cache_size": settings.database_statement_cache_size,
                     "server_settings": {
                         "application_name": "intellipdf",
                     }
                 }
             )
-        else:
-            _engine = create_async_engine(
-                settings.database_url,
-                echo=settings.database_echo,
-                poolclass=NullPool,
-            )
 
         logger.info(
             f"Database engine created for {settings.environment} environment")
@@ -11,6 +11,9 @@ from .models_simple import (
     AnnotationReplyModel,
     TagModel,
     AIQuestionModel,
+    EmbeddingCacheModel,
+    AI_STATUS_PENDING,
+    AI_STATUS_COMPLETED,
 )
 
 __all__ = [
@@ -23,4 +26,7 @@ __all__ = [
     "AnnotationReplyModel",
     "TagModel",
     "AIQuestionModel",
+    "EmbeddingCacheModel",
+    "AI_STATUS_PENDING",
+    "AI_STATUS_COMPLETED",
 ]
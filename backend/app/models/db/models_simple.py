@@ -5,13 +5,15 @@ This module defines the database schema using SQLAlchemy 2.0 declarative models.
 All models are compatible with SQLite for development and PostgreSQL for production.
 """
 
+import os
+import time
 from datetime import datetime
 from typing import Optional
-from uuid import uuid4
+from uuid import UUID, uuid4
 
 from sqlalchemy import (
     String, Integer, Float, Boolean, Text, JSON, Enum,
-    ForeignKey, Index, UniqueConstraint
+    ForeignKey, Index, UniqueConstraint, LargeBinary
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -25,6 +27,26 @@ def generate_uuid() -> str:
     return str(uuid4())
 
 
+def generate_uuid7() -> str:
+    """
+    Generate a time-ordered UUIDv7 (RFC 9562) as string.
+
+    The leading 48 bits are the Unix time in milliseconds, so new ids sort
+    after older ones and inserts land on the right edge of the primary key
+    index instead of a random page.
+    """
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(
+        os.urandom(10), "big")
+    value = value & ~(0xF << 76) | 0x7 << 76  # version 7
+    value = value & ~(0x3 << 62) | 0x2 << 62  # RFC 9562 variant
+    return str(UUID(int=value))
+
+
+# Bookmark AI summary states
+AI_STATUS_PENDING = "pending"
+AI_STATUS_COMPLETED = "completed"
+
+
 class DocumentModel(Base, TimestampMixin):
     """Document database model."""
 
@@ -302,7 +324,7 @@ class BookmarkModel(Base, TimestampMixin):
     id: Mapped[str] = mapped_column(
         String(36),
         primary_key=True,
-        default=generate_uuid,
+        default=generate_uuid7,
         comment="Bookmark unique identifier"
     )
 
@@ -370,6 +392,13 @@ class BookmarkModel(Base, TimestampMixin):
         nullable=False,
         comment="AI-generated bookmark summary"
     )
+    ai_status: Mapped[str] = mapped_column(
+        String(20),
+        nullable=False,
+        default=AI_STATUS_COMPLETED,
+        server_default=AI_STATUS_COMPLETED,
+        comment="AI summary state (pending/completed)"
+    )
 
     # User Content
     title: Mapped[Optional[str]] = mapped_column(
@@ -404,7 +433,9 @@ class BookmarkModel(Base, TimestampMixin):
 
     # Indexes
     __table_args__ = (
-        Index("idx_bookmarks_user_document", "user_id", "document_id"),
+        # Serves newest-first listings and their (created_at, id) keyset seek
+        Index("idx_bookmarks_user_document_created",
+              "user_id", "document_id", "created_at", "id"),
         Index("idx_bookmarks_page", "document_id", "page_number"),
     )
 
@@ -654,11 +685,18 @@ class AnnotationModel(Base, TimestampMixin):
 
     # Indexes for common queries
     __table_args__ = (
-        Index("idx_annotations_document_page", "document_id", "page_number"),
+        # Matches the listing filter + ORDER BY (and keyset seek), so rows
+        # come back pre-sorted
+        Index("idx_annotations_document_listing",
+              "document_id", "page_number", "created_at", "id"),
         Index("idx_annotations_user", "user_id", "created_at"),
         Index("idx_annotations_type", "annotation_type", "created_at"),
     )
 
+    # Fetch server-generated timestamps with RETURNING on flush, so a new or
+    # updated annotation can be serialized without a refresh SELECT
+    __mapper_args__ = {"eager_defaults": True}
+
     def __repr__(self) -> str:
         return f"<AnnotationModel(id={self.id}, type={self.annotation_type}, page={self.page_number})>"
 
@@ -734,3 +772,36 @@ class AnnotationReplyModel(Base, TimestampMixin):
 
     def __repr__(self) -> str:
         return f"<AnnotationReplyModel(id={self.id}, annotation_id={self.annotation_id})>"
+
+
+class EmbeddingCacheModel(Base, TimestampMixin):
+    """
+    Embedding vectors cached by the content they were computed from.
+
+    Identical chunk text (re-uploads, reprocessing, shared boilerplate)
+    is encoded once per model and reused afterwards.
+    """
+
+    __tablename__ = "embedding_cache"
+
+    # Primary Key
+    text_hash: Mapped[str] = mapped_column(
+        String(64),
+        primary_key=True,
+        comment="SHA-256 of the embedded text"
+    )
+    model: Mapped[str] = mapped_column(
+        String(255),
+        primary_key=True,
+        comment="Embedding model name"
+    )
+
+    # Vector
+    vector: Mapped[bytes] = mapped_column(
+        LargeBinary,
+        nullable=False,
+        comment="Embedding packed as little-endian float16"
+    )
+
+    def __repr__(self) -> str:
+        return f"<EmbeddingCacheModel(text_hash={self.text_hash[:16]}, model={self.model})>"
@@ -8,6 +8,7 @@ from .document_repository import DocumentRepository
 from .chunk_repository import ChunkRepository
 from .annotation_repository import AnnotationRepository, AnnotationReplyRepository
 from .bookmark_repository import BookmarkRepository
+from .embedding_cache_repository import EmbeddingCacheRepository
 
 __all__ = [
     "DocumentRepository",
@@ -15,4 +16,5 @@ __all__ = [
     "AnnotationRepository",
     "AnnotationReplyRepository",
     "BookmarkRepository",
+    "EmbeddingCacheRepository",
 ]
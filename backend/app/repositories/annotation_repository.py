@@ -6,7 +6,7 @@ Provides CRUD methods for annotations with advanced filtering.
 
 from typing import Optional, List, Dict, Any
 from datetime import datetime
-from sqlalchemy import select, and_, func, desc
+from sqlalchemy import select, insert, update, delete, and_, func, desc, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from .base_repository import BaseRepository
@@ -22,6 +22,17 @@ class AnnotationRepository(BaseRepository[AnnotationModel]):
     def __init__(self, session: AsyncSession):
         super().__init__(AnnotationModel, session)
 
+    async def create(self, obj: AnnotationModel) -> AnnotationModel:
+        """
+        Create an annotation.
+        Server defaults come back through INSERT ... RETURNING (eager_defaults),
+        so no refresh SELECT is needed after the flush.
+        """
+        self.session.add(obj)
+        await self.session.flush()
+        logger.debug(f"Created AnnotationModel with id: {obj.id}")
+        return obj
+
     async def get_by_document(
         self,
         document_id: str,
@@ -30,51 +41,225 @@ class AnnotationRepository(BaseRepository[AnnotationModel]):
         user_id: Optional[str] = None,
         tags: Optional[List[str]] = None,
         limit: int = 1000,
-        offset: int = 0
-    ) -> tuple[List[AnnotationModel], int]:
+        offset: int = 0,
+        after: Optional[tuple] = None,
+        with_total: bool = True
+    ) -> tuple[List[AnnotationModel], Optional[int]]:
         """
         Get annotations for a document with optional filtering.
-        Returns (annotations, total_count).
+        'after' is a (page_number, created_at, id) keyset cursor.
+        Returns (annotations, total_count); total is None unless with_total.
         """
         try:
-            # Build WHERE clause
-            conditions = [AnnotationModel.document_id == document_id]
-
-            if page_number is not None:
-                conditions.append(AnnotationModel.page_number == page_number)
-            if annotation_type:
-                conditions.append(
-                    AnnotationModel.annotation_type == annotation_type)
-            if user_id:
-                conditions.append(AnnotationModel.user_id == user_id)
-            if tags:
-                # Check if any of the provided tags exist in the annotation's tags JSON array
-                for tag in tags:
-                    conditions.append(AnnotationModel.tags.contains([tag]))
-
-            # Count query
-            count_stmt = select(func.count()).select_from(
-                AnnotationModel).where(and_(*conditions))
-            count_result = await self.session.execute(count_stmt)
-            total = count_result.scalar() or 0
+            conditions = self._document_conditions(
+                document_id, page_number, annotation_type, user_id, tags)
+            rows, total = await self._fetch_page(
+                [AnnotationModel], conditions, limit, offset, after, with_total)
+            annotations = [row[0] for row in rows]
+
+            logger.info(
+                f"Found {len(annotations)}/{total} annotations for document: {document_id}")
+            return annotations, total
 
-            # Data query
+        except Exception as e:
+            logger.error(f"Error getting annotations by document: {e}")
+            raise
+
+    async def get_summaries_by_document(
+        self,
+        document_id: str,
+        page_number: Optional[int] = None,
+        annotation_type: Optional[str] = None,
+        user_id: Optional[str] = None,
+        limit: int = 1000,
+        offset: int = 0,
+        after: Optional[tuple] = None,
+        with_total: bool = True
+    ) -> tuple[List[Any], Optional[int]]:
+        """
+        Get the render-only columns of a document's annotations.
+        Selects plain columns instead of ORM entities, so content/tags are
+        never loaded and rows skip the identity map.
+        Returns (summary rows, total_count); total is None unless with_total.
+        """
+        try:
+            conditions = self._document_conditions(
+                document_id, page_number, annotation_type, user_id)
+            summaries, total = await self._fetch_page(
+                [
+                    AnnotationModel.id,
+                    AnnotationModel.page_number,
+                    AnnotationModel.annotation_type,
+                    AnnotationModel.color,
+                    AnnotationModel.data,
+                    AnnotationModel.created_at,
+                ],
+                conditions, limit, offset, after, with_total)
+
+            logger.info(
+                f"Found {len(summaries)}/{total} annotation summaries for document: {document_id}")
+            return summaries, total
+
+        except Exception as e:
+            logger.error(f"Error getting annotation summaries by document: {e}")
+            raise
+
+    @staticmethod
+    def _document_conditions(
+        document_id: str,
+        page_number: Optional[int] = None,
+        annotation_type: Optional[str] = None,
+        user_id: Optional[str] = None,
+        tags: Optional[List[str]] = None
+    ) -> list:
+        """Build the WHERE clause shared by the per-document listings"""
+        conditions = [AnnotationModel.document_id == document_id]
+
+        if page_number is not None:
+            conditions.append(AnnotationModel.page_number == page_number)
+        if annotation_type:
+            conditions.append(
+                AnnotationModel.annotation_type == annotation_type)
+        if user_id:
+            conditions.append(AnnotationModel.user_id == user_id)
+        if tags:
+            # Check if any of the provided tags exist in the annotation's tags JSON array
+            for tag in tags:
+                conditions.append(AnnotationModel.tags.contains([tag]))
+        return conditions
+
+    async def _fetch_page(
+        self,
+        columns: list,
+        conditions: list,
+        limit: int,
+        offset: int,
+        after: Optional[tuple] = None,
+        with_total: bool = True
+    ) -> tuple[list, Optional[int]]:
+        """Run a paginated listing and return (rows, total_count)"""
+        order_key = (
+            AnnotationModel.page_number,
+            AnnotationModel.created_at,
+            AnnotationModel.id,
+        )
+
+        if after is None and with_total:
+            # Single round-trip: COUNT(*) OVER () carries the total on every row
             stmt = (
-                select(AnnotationModel)
+                select(*columns, func.count().over().label("total"))
                 .where(and_(*conditions))
-                .order_by(AnnotationModel.page_number, AnnotationModel.created_at)
+                .order_by(*order_key)
                 .limit(limit)
                 .offset(offset)
             )
             result = await self.session.execute(stmt)
-            annotations = list(result.scalars().all())
+            rows = result.all()
+            if rows:
+                return rows, rows[0].total
+            if offset == 0:
+                return rows, 0
+            # Page past the end: no row to carry the window total
+            return rows, await self._count(conditions)
 
-            logger.info(
-                f"Found {len(annotations)}/{total} annotations for document: {document_id}")
-            return annotations, total
+        page_conditions = conditions
+        if after is not None:
+            # Keyset pagination: seek past the cursor instead of OFFSET-scanning
+            page_conditions = [*conditions, tuple_(*order_key) > tuple_(*after)]
+        stmt = (
+            select(*columns)
+            .where(and_(*page_conditions))
+            .order_by(*order_key)
+            .limit(limit)
+            .offset(offset)
+        )
+        result = await self.session.execute(stmt)
+        rows = result.all()
+        total = await self._count(conditions) if with_total else None
+        return rows, total
+
+    async def _count(self, conditions: list) -> int:
+        """Count annotations matching the listing conditions"""
+        count_stmt = select(func.count()).select_from(
+            AnnotationModel).where(and_(*conditions))
+        count_result = await self.session.execute(count_stmt)
+        return count_result.scalar() or 0
 
+    async def bulk_create(
+        self,
+        rows: List[Dict[str, Any]]
+    ) -> List[AnnotationModel]:
+        """
+        Insert many annotations with one multi-row INSERT ... RETURNING.
+        Returned models are in the same order as the input rows.
+        """
+        try:
+            stmt = insert(AnnotationModel).returning(
+                AnnotationModel, sort_by_parameter_order=True)
+            result = await self.session.scalars(stmt, rows)
+            annotations = list(result.all())
+            logger.info(f"Bulk inserted {len(annotations)} annotations")
+            return annotations
         except Exception as e:
-            logger.error(f"Error getting annotations by document: {e}")
+            logger.error(f"Error in bulk create: {e}")
+            raise
+
+    async def update_fields(
+        self,
+        annotation_id: str,
+        values: Dict[str, Any]
+    ) -> Optional[AnnotationModel]:
+        """
+        Update an annotation with a single UPDATE ... RETURNING.
+        Returns the updated annotation, or None if no row matched.
+        """
+        try:
+            if not values:
+                return await self.get_by_id(annotation_id)
+
+            stmt = (
+                update(AnnotationModel)
+                .where(AnnotationModel.id == annotation_id)
+                .values(**values)
+                .returning(AnnotationModel)
+                .execution_options(populate_existing=True)
+            )
+            result = await self.session.scalars(stmt)
+            return result.one_or_none()
+        except Exception as e:
+            logger.error(f"Error updating annotation: {e}")
+            raise
+
+    async def delete_returning_document(self, annotation_id: str) -> Optional[str]:
+        """
+        Delete one annotation with DELETE ... RETURNING.
+        Returns the owning document_id, or None if no row matched.
+        """
+        try:
+            stmt = (
+                delete(AnnotationModel)
+                .where(AnnotationModel.id == annotation_id)
+                .returning(AnnotationModel.document_id)
+            )
+            result = await self.session.execute(stmt)
+            return result.scalar_one_or_none()
+        except Exception as e:
+            logger.error(f"Error deleting annotation: {e}")
+            raise
+
+    async def delete_by_document(self, document_id: str) -> int:
+        """
+        Delete every annotation of a document in one statement.
+        Returns the number of deleted annotations.
+        """
+        try:
+            stmt = delete(AnnotationModel).where(
+                AnnotationModel.document_id == document_id
+            )
+            result = await self.session.execute(stmt)
+            return result.rowcount
+        except Exception as e:
+            logger.error(f"Error deleting annotations by document: {e}")
             raise
 
     async def get_by_page(
@@ -8,7 +8,7 @@ by specific repositories to provide type-safe database operations.
 from typing import Generic, TypeVar, Type, Optional, List, Any, Dict
 from uuid import UUID
 
-from sqlalchemy import select, update, delete, func
+from sqlalchemy import select, update, delete, func, exists
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import DeclarativeBase
 
@@ -196,12 +196,11 @@ class BaseRepository(Generic[ModelType]):
         # CRITICAL FIX: Convert UUID to string for SQLite compatibility
         id_str = str(id) if isinstance(id, UUID) else id
 
+        # SELECT EXISTS stops at the first match and loads no relationships
         result = await self.session.execute(
-            select(func.count()).select_from(
-                self.model).where(self.model.id == id_str)
+            select(exists().where(self.model.id == id_str))
         )
-        count = result.scalar_one()
-        return count > 0
+        return bool(result.scalar_one())
 
     async def commit(self) -> None:
         """
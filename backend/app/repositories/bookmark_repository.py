@@ -4,8 +4,10 @@ Bookmark repository for database operations.
 This module provides data access methods for bookmark entities.
 """
 
-from typing import Optional, List
-from sqlalchemy import select, and_
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Optional, List, Tuple
+from sqlalchemy import select, insert, update, delete, and_, or_, func, tuple_, bindparam
+from sqlalchemy.engine import RowMapping
 
 from .base_repository import BaseRepository
 from ..models.db import BookmarkModel
@@ -26,6 +28,308 @@ class BookmarkRepository(BaseRepository[BookmarkModel]):
         """
         super().__init__(BookmarkModel, session)
 
+    @staticmethod
+    def _user_conditions(
+        user_id: str,
+        document_id: Optional[str] = None,
+        page_number: Optional[int] = None,
+        search_text: Optional[str] = None
+    ) -> list:
+        """Build the WHERE clause shared by listing, search and counting."""
+        conditions = [BookmarkModel.user_id == user_id]
+        if document_id:
+            conditions.append(BookmarkModel.document_id == document_id)
+            if page_number is not None:
+                conditions.append(BookmarkModel.page_number == page_number)
+        if search_text:
+            # On PostgreSQL each column has a pg_trgm GIN index (migration
+            # 007), so these substring matches are index lookups
+            search_pattern = f"%{search_text}%"
+            conditions.append(or_(
+                BookmarkModel.selected_text.ilike(search_pattern),
+                BookmarkModel.ai_summary.ilike(search_pattern),
+                BookmarkModel.title.ilike(search_pattern),
+                BookmarkModel.user_notes.ilike(search_pattern)
+            ))
+        return conditions
+
+    async def list_for_user(
+        self,
+        user_id: str,
+        document_id: Optional[str] = None,
+        page_number: Optional[int] = None,
+        search_text: Optional[str] = None,
+        limit: int = 100,
+        after: Optional[Tuple[datetime, str]] = None
+    ) -> List[RowMapping]:
+        """
+        Get a page of a user's bookmarks, newest first.
+
+        Selects the table's columns rather than the entity, so no ORM
+        objects are built; each row maps column names to values.
+
+        Args:
+            user_id: User ID
+            document_id: Optional document filter
+            page_number: Optional page filter (with document_id)
+            search_text: Optional text to search for
+            limit: Maximum number of results
+            after: Optional (created_at, id) keyset cursor; only rows
+                older than it are returned
+
+        Returns:
+            List of column-name mappings
+        """
+        try:
+            stmt = self._listing_statement(
+                user_id, document_id, page_number, search_text, after
+            ).with_only_columns(*BookmarkModel.__table__.columns).limit(limit)
+            result = await self.session.execute(stmt)
+            bookmarks = list(result.mappings().all())
+
+            logger.info("Found {} bookmarks for user: {}",
+                        len(bookmarks), user_id)
+            return bookmarks
+        except Exception as e:
+            logger.error(f"Error listing bookmarks: {e}")
+            raise
+
+    async def stream_for_user(
+        self,
+        user_id: str,
+        document_id: Optional[str] = None,
+        page_number: Optional[int] = None,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[datetime, str]] = None,
+        batch_size: int = 100
+    ) -> AsyncIterator[BookmarkModel]:
+        """
+        Stream a user's bookmarks, newest first, without loading them all.
+
+        Rows are fetched from a server-side cursor batch_size at a time.
+
+        Args:
+            user_id: User ID
+            document_id: Optional document filter
+            page_number: Optional page filter (with document_id)
+            limit: Optional maximum number of results
+            after: Optional (created_at, id) keyset cursor
+            batch_size: Rows fetched per round trip
+
+        Yields:
+            Bookmark models
+        """
+        stmt = self._listing_statement(
+            user_id, document_id, page_number, None, after
+        ).limit(limit).execution_options(yield_per=batch_size)
+        result = await self.session.stream_scalars(stmt)
+        async for bookmark in result:
+            yield bookmark
+
+    @staticmethod
+    def _listing_statement(
+        user_id: str,
+        document_id: Optional[str],
+        page_number: Optional[int],
+        search_text: Optional[str],
+        after: Optional[Tuple[datetime, str]]
+    ):
+        """Build the newest-first SELECT shared by listing and streaming."""
+        conditions = BookmarkRepository._user_conditions(
+            user_id, document_id, page_number, search_text)
+        if after is not None:
+            conditions.append(
+                tuple_(BookmarkModel.created_at, BookmarkModel.id) < tuple_(*after))
+        return (
+            select(BookmarkModel)
+            .where(and_(*conditions))
+            .order_by(BookmarkModel.created_at.desc(), BookmarkModel.id.desc())
+        )
+
+    async def count_for_user(
+        self,
+        user_id: str,
+        document_id: Optional[str] = None,
+        page_number: Optional[int] = None,
+        search_text: Optional[str] = None
+    ) -> int:
+        """
+        Count a user's bookmarks matching the listing filters.
+
+        Args:
+            user_id: User ID
+            document_id: Optional document filter
+            page_number: Optional page filter (with document_id)
+            search_text: Optional text to search for
+
+        Returns:
+            Total count
+        """
+        try:
+            conditions = self._user_conditions(
+                user_id, document_id, page_number, search_text)
+            stmt = select(func.count()).select_from(BookmarkModel).where(
+                and_(*conditions)
+            )
+            result = await self.session.execute(stmt)
+            return result.scalar() or 0
+        except Exception as e:
+            logger.error(f"Error counting bookmarks: {e}")
+            raise
+
+    async def bulk_create(self, rows: List[Dict[str, Any]]) -> List[BookmarkModel]:
+        """
+        Insert many bookmarks with one multi-row INSERT ... RETURNING.
+
+        Args:
+            rows: Column values of each bookmark
+
+        Returns:
+            Created bookmarks in input order
+        """
+        try:
+            stmt = insert(BookmarkModel).returning(
+                BookmarkModel, sort_by_parameter_order=True)
+            result = await self.session.scalars(stmt, rows)
+            bookmarks = list(result.all())
+            logger.info("Bulk inserted {} bookmarks", len(bookmarks))
+            return bookmarks
+        except Exception as e:
+            logger.error(f"Error in bulk create: {e}")
+            raise
+
+    async def bulk_update_summaries(
+        self,
+        summaries: Dict[str, str],
+        ai_status: str
+    ) -> None:
+        """
+        Store the AI summaries of many bookmarks in one executemany UPDATE.
+
+        Args:
+            summaries: AI summary per bookmark ID
+            ai_status: AI status to set on every row
+        """
+        if not summaries:
+            return
+        try:
+            table = BookmarkModel.__table__
+            stmt = (
+                update(table)
+                .where(table.c.id == bindparam("b_id"))
+                .values(ai_summary=bindparam("b_summary"), ai_status=ai_status)
+            )
+            await self.session.execute(stmt, [
+                {"b_id": bookmark_id, "b_summary": summary}
+                for bookmark_id, summary in summaries.items()
+            ])
+        except Exception as e:
+            logger.error(f"Error updating bookmark summaries: {e}")
+            raise
+
+    async def get_many(self, bookmark_ids: List[str]) -> List[BookmarkModel]:
+        """
+        Get the bookmarks with the given IDs in one query.
+
+        Args:
+            bookmark_ids: Bookmark IDs
+
+        Returns:
+            Bookmarks that exist, in no particular order
+        """
+        try:
+            stmt = select(BookmarkModel).where(
+                BookmarkModel.id.in_(bookmark_ids)
+            ).execution_options(populate_existing=True)
+            result = await self.session.execute(stmt)
+            return list(result.scalars().all())
+        except Exception as e:
+            logger.error(f"Error getting bookmarks: {e}")
+            raise
+
+    async def get_for_user(
+        self,
+        bookmark_id: str,
+        user_id: str
+    ) -> Optional[BookmarkModel]:
+        """
+        Get a bookmark only if it belongs to the user.
+
+        Args:
+            bookmark_id: Bookmark ID
+            user_id: Owner user ID
+
+        Returns:
+            Bookmark, or None if missing or owned by someone else
+        """
+        try:
+            stmt = select(BookmarkModel).where(
+                BookmarkModel.id == bookmark_id,
+                BookmarkModel.user_id == user_id
+            )
+            result = await self.session.execute(stmt)
+            return result.scalar_one_or_none()
+        except Exception as e:
+            logger.error(f"Error getting bookmark: {e}")
+            raise
+
+    async def update_for_user(
+        self,
+        bookmark_id: str,
+        user_id: str,
+        values: Dict[str, Any]
+    ) -> Optional[BookmarkModel]:
+        """
+        Update a user's bookmark with a single UPDATE ... RETURNING.
+
+        Args:
+            bookmark_id: Bookmark ID
+            user_id: Owner user ID
+            values: Column values to set
+
+        Returns:
+            Updated bookmark, or None if missing or owned by someone else
+        """
+        try:
+            if not values:
+                return await self.get_for_user(bookmark_id, user_id)
+
+            stmt = (
+                update(BookmarkModel)
+                .where(BookmarkModel.id == bookmark_id,
+                       BookmarkModel.user_id == user_id)
+                .values(**values)
+                .returning(BookmarkModel)
+                .execution_options(populate_existing=True)
+            )
+            result = await self.session.scalars(stmt)
+            return result.one_or_none()
+        except Exception as e:
+            logger.error(f"Error updating bookmark: {e}")
+            raise
+
+    async def delete_for_user(self, bookmark_id: str, user_id: str) -> bool:
+        """
+        Delete a user's bookmark with a single DELETE.
+
+        Args:
+            bookmark_id: Bookmark ID
+            user_id: Owner user ID
+
+        Returns:
+            True if deleted, False if missing or owned by someone else
+        """
+        try:
+            stmt = delete(BookmarkModel).where(
+                BookmarkModel.id == bookmark_id,
+                BookmarkModel.user_id == user_id
+            )
+            result = await self.session.execute(stmt)
+            return result.rowcount > 0
+        except Exception as e:
+            logger.error(f"Error deleting bookmark: {e}")
+            raise
+
     async def get_by_user(
         self,
         user_id: str,
@@ -52,8 +356,8 @@ class BookmarkRepository(BaseRepository[BookmarkModel]):
             result = await self.session.execute(stmt)
             bookmarks = result.scalars().all()
 
-            logger.info(
-                f"Found {len(bookmarks)} bookmarks for user: {user_id}")
+            logger.info("Found {} bookmarks for user: {}",
+                        len(bookmarks), user_id)
             return list(bookmarks)
         except Exception as e:
             logger.error(f"Error getting bookmarks by user: {e}")
@@ -88,8 +392,8 @@ class BookmarkRepository(BaseRepository[BookmarkModel]):
             result = await self.session.execute(stmt)
             bookmarks = result.scalars().all()
 
-            logger.info(
-                f"Found {len(bookmarks)} bookmarks for document: {document_id}")
+            logger.info("Found {} bookmarks for document: {}",
+                        len(bookmarks), document_id)
             return list(bookmarks)
         except Exception as e:
             logger.error(f"Error getting bookmarks by document: {e}")
@@ -128,8 +432,8 @@ class BookmarkRepository(BaseRepository[BookmarkModel]):
             result = await self.session.execute(stmt)
             bookmarks = result.scalars().all()
 
-            logger.info(
-                f"Found {len(bookmarks)} bookmarks for page {page_number}")
+            logger.info("Found {} bookmarks for page {}",
+                        len(bookmarks), page_number)
             return list(bookmarks)
         except Exception as e:
             logger.error(f"Error getting bookmarks by page: {e}")
@@ -161,8 +465,8 @@ class BookmarkRepository(BaseRepository[BookmarkModel]):
             result = await self.session.execute(stmt)
             bookmarks = result.scalars().all()
 
-            logger.info(
-                f"Found {len(bookmarks)} bookmarks for user {user_id} in document {document_id}")
+            logger.info("Found {} bookmarks for user {} in document {}",
+                        len(bookmarks), user_id, document_id)
             return list(bookmarks)
         except Exception as e:
             logger.error(f"Error getting bookmarks by user and document: {e}")
@@ -210,8 +514,8 @@ class BookmarkRepository(BaseRepository[BookmarkModel]):
             result = await self.session.execute(stmt)
             bookmarks = result.scalars().all()
 
-            logger.info(
-                f"Found {len(bookmarks)} bookmarks matching '{search_text}'")
+            logger.info("Found {} bookmarks matching '{}'",
+                        len(bookmarks), search_text)
             return list(bookmarks)
         except Exception as e:
             logger.error(f"Error searching bookmarks: {e}")
@@ -235,7 +539,7 @@ class BookmarkRepository(BaseRepository[BookmarkModel]):
             result = await self.session.execute(stmt)
             count = result.scalar()
 
-            logger.info(f"User {user_id} has {count} bookmarks")
+            logger.info("User {} has {} bookmarks", user_id, count)
             return count or 0
         except Exception as e:
             logger.error(f"Error counting bookmarks: {e}")
@@ -265,7 +569,7 @@ class BookmarkRepository(BaseRepository[BookmarkModel]):
             result = await self.session.execute(stmt)
             count = result.scalar()
 
-            logger.info(f"Document {document_id} has {count} bookmarks")
+            logger.info("Document {} has {} bookmarks", document_id, count)
             return count or 0
         except Exception as e:
             logger.error(f"Error counting document bookmarks: {e}")
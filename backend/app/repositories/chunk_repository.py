@@ -5,12 +5,12 @@ This module provides data access methods for Chunk entities,
 including CRUD operations and custom queries.
 """
 
-from typing import Optional, List
+from typing import AsyncIterator, Optional, List, Tuple
 from uuid import UUID
 
-from sqlalchemy import select, and_
+from sqlalchemy import select, and_, exists
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import lazyload, selectinload
 
 from .base_repository import BaseRepository
 # Import from __init__ to use the correct models
@@ -65,11 +65,177 @@ class ChunkRepository(BaseRepository[ChunkModel]):
             .order_by(ChunkModel.chunk_index)
             .offset(skip)
             .limit(limit)
+            .options(lazyload(ChunkModel.document))
         )
         chunks = result.scalars().all()
         logger.debug(f"Found {len(chunks)} chunks for document: {document_id}")
         return list(chunks)
 
+    async def stream_by_document_id(
+        self,
+        document_id: UUID,
+        batch_size: int = 100
+    ) -> AsyncIterator[ChunkModel]:
+        """
+        Stream all chunks of a document in order, without loading them all.
+
+        Rows are fetched from a server-side cursor batch_size at a time.
+
+        Args:
+            document_id: Document UUID
+            batch_size: Rows fetched per round trip
+
+        Yields:
+            Chunk models
+        """
+        # CRITICAL FIX: Convert UUID to string for SQLite compatibility
+        doc_id_str = str(document_id) if isinstance(
+            document_id, UUID) else document_id
+
+        # The parent document (and through it every chunk) would otherwise
+        # be eager-loaded with the first batch
+        stmt = (
+            select(ChunkModel)
+            .where(ChunkModel.document_id == doc_id_str)
+            .order_by(ChunkModel.chunk_index)
+            .options(lazyload(ChunkModel.document))
+            .execution_options(yield_per=batch_size)
+        )
+        result = await self.session.stream_scalars(stmt)
+        async for chunk in result:
+            yield chunk
+
+    async def get_page_for_document(
+        self,
+        document_id: UUID,
+        skip: int = 0,
+        limit: int = 1000
+    ) -> Optional[List[ChunkModel]]:
+        """
+        Get a page of a document's chunks, checking the document exists.
+
+        The document is outer-joined to its chunks, so an existing document
+        always yields rows (a chunk-less one if it has no chunks) and the
+        check costs no extra query. Only a page past the last chunk comes
+        back empty, and then existence is checked separately.
+
+        Args:
+            document_id: Document UUID
+            skip: Number of records to skip
+            limit: Maximum number of records to return
+
+        Returns:
+            List of chunks on the page, or None if the document does not exist
+        """
+        # CRITICAL FIX: Convert UUID to string for SQLite compatibility
+        doc_id_str = str(document_id) if isinstance(
+            document_id, UUID) else document_id
+
+        result = await self.session.execute(
+            select(DocumentModel.id, ChunkModel)
+            .outerjoin(ChunkModel, ChunkModel.document_id == DocumentModel.id)
+            .where(DocumentModel.id == doc_id_str)
+            .order_by(ChunkModel.chunk_index)
+            .offset(skip)
+            .limit(limit)
+            .options(lazyload(ChunkModel.document))
+        )
+        rows = result.all()
+
+        if not rows:
+            if skip and await self.session.scalar(
+                    select(exists().where(DocumentModel.id == doc_id_str))):
+                return []
+            return None
+
+        chunks = [chunk for _, chunk in rows if chunk is not None]
+        logger.debug(f"Found {len(chunks)} chunks for document: {document_id}")
+        return chunks
+
+    async def get_covering_page(
+        self,
+        document_id: UUID,
+        page: int
+    ) -> Optional[List[ChunkModel]]:
+        """
+        Get a document's chunks whose page range includes a page.
+
+        Served by the (document_id, start_page, end_page) index. As in
+        get_page_for_document, the document is outer-joined so its
+        existence is checked in the same query.
+
+        Args:
+            document_id: Document UUID
+            page: Page number (1-based)
+
+        Returns:
+            List of chunks covering the page, or None if the document does
+            not exist
+        """
+        # CRITICAL FIX: Convert UUID to string for SQLite compatibility
+        doc_id_str = str(document_id) if isinstance(
+            document_id, UUID) else document_id
+
+        result = await self.session.execute(
+            select(DocumentModel.id, ChunkModel)
+            .outerjoin(
+                ChunkModel,
+                and_(
+                    ChunkModel.document_id == DocumentModel.id,
+                    ChunkModel.start_page <= page,
+                    ChunkModel.end_page >= page
+                )
+            )
+            .where(DocumentModel.id == doc_id_str)
+            .order_by(ChunkModel.chunk_index)
+            # ChunkModel.document is selectin-loaded by default, and the
+            # document in turn selectin-loads every one of its chunks
+            .options(lazyload(ChunkModel.document))
+        )
+        rows = result.all()
+
+        if not rows:
+            return None
+        return [chunk for _, chunk in rows if chunk is not None]
+
+    async def get_in_document(
+        self,
+        document_id: UUID,
+        chunk_id: UUID
+    ) -> Tuple[bool, Optional[ChunkModel]]:
+        """
+        Get a chunk of a document, checking the document exists.
+
+        Args:
+            document_id: Document UUID
+            chunk_id: Chunk UUID
+
+        Returns:
+            Tuple of (document exists, chunk or None if not in the document)
+        """
+        # CRITICAL FIX: Convert UUID to string for SQLite compatibility
+        doc_id_str = str(document_id) if isinstance(
+            document_id, UUID) else document_id
+        chunk_id_str = str(chunk_id) if isinstance(
+            chunk_id, UUID) else chunk_id
+
+        result = await self.session.execute(
+            select(DocumentModel.id, ChunkModel)
+            .outerjoin(
+                ChunkModel,
+                and_(
+                    ChunkModel.document_id == DocumentModel.id,
+                    ChunkModel.id == chunk_id_str
+                )
+            )
+            .where(DocumentModel.id == doc_id_str)
+            .options(lazyload(ChunkModel.document))
+        )
+        row = result.one_or_none()
+        if row is None:
+            return False, None
+        return True, row[1]
+
     async def get_by_vector_id(self, vector_id: str) -> Optional[ChunkModel]:
         """
         Get chunk by vector database ID.
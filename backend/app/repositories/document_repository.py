@@ -9,7 +9,7 @@ from typing import Optional, List
 from uuid import UUID
 from datetime import datetime
 
-from sqlalchemy import select, func
+from sqlalchemy import select, func, Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from .base_repository import BaseRepository
@@ -62,6 +62,48 @@ class DocumentRepository(BaseRepository[DocumentModel]):
 
         return doc
 
+    async def get_file_info(self, id: UUID) -> Optional[Row]:
+        """
+        Get the stored file of a document.
+
+        Selects only the file columns, so the document's chunks are not
+        loaded along with it.
+
+        Args:
+            id: Document UUID
+
+        Returns:
+            Row with file_path, filename, content_hash and doc_metadata,
+            or None if not found
+        """
+        # CRITICAL FIX: Convert UUID to string for SQLite compatibility
+        id_str = str(id) if isinstance(id, UUID) else id
+
+        result = await self.session.execute(
+            select(DocumentModel.file_path, DocumentModel.filename,
+                   DocumentModel.content_hash, DocumentModel.doc_metadata)
+            .where(DocumentModel.id == id_str)
+        )
+        return result.one_or_none()
+
+    async def get_updated_at(self, id: UUID) -> Optional[datetime]:
+        """
+        Get when a document was last modified.
+
+        Args:
+            id: Document UUID
+
+        Returns:
+            updated_at timestamp or None if not found
+        """
+        # CRITICAL FIX: Convert UUID to string for SQLite compatibility
+        id_str = str(id) if isinstance(id, UUID) else id
+
+        result = await self.session.execute(
+            select(DocumentModel.updated_at).where(DocumentModel.id == id_str)
+        )
+        return result.scalar_one_or_none()
+
     async def get_by_filename(self, filename: str) -> Optional[DocumentModel]:
         """
         Get document by filename.
@@ -152,6 +194,28 @@ class DocumentRepository(BaseRepository[DocumentModel]):
         """
         return await self.update(id, {"chunk_count": chunk_count})
 
+    async def get_rows(self, skip: int = 0, limit: int = 100) -> List[Row]:
+        """
+        Get a page of documents as plain rows.
+
+        Selects the table's columns rather than ORM entities: listings
+        need no identity map or change tracking, and the entities would
+        selectin-load every chunk of every document on the page.
+
+        Args:
+            skip: Number of records to skip
+            limit: Maximum number of records to return
+
+        Returns:
+            Rows keyed by column name (doc_metadata as "metadata")
+        """
+        result = await self.session.execute(
+            select(DocumentModel.__table__).offset(skip).limit(limit)
+        )
+        rows = result.all()
+        logger.debug(f"Retrieved {len(rows)} document rows")
+        return list(rows)
+
     async def get_recent(self, limit: int = 10) -> List[DocumentModel]:
         """
         Get recently uploaded documents.
@@ -0,0 +1,108 @@
+"""
+Embedding cache repository for database operations.
+
+This module stores and looks up embedding vectors by the SHA-256 of the
+text they encode, packed as float16 to halve their size.
+"""
+
+from typing import Dict, Iterable, List, Mapping
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.db import EmbeddingCacheModel
+from ..core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Vectors are stored little-endian so the bytes are portable
+_VECTOR_DTYPE = np.dtype("<f2")
+
+# Rows per INSERT, well under SQLite's bound-parameter limit
+_INSERT_BATCH = 500
+
+
+class EmbeddingCacheRepository:
+    """
+    Repository for the embedding cache.
+
+    Rows are immutable: a (text_hash, model) pair always maps to the same
+    vector, so writes only ever insert.
+    """
+
+    def __init__(self, session: AsyncSession):
+        """
+        Initialize embedding cache repository.
+
+        Args:
+            session: Async database session
+        """
+        self.session = session
+
+    async def get_many(
+        self,
+        text_hashes: Iterable[str],
+        model: str
+    ) -> Dict[str, np.ndarray]:
+        """
+        Look up cached vectors in one query.
+
+        Args:
+            text_hashes: SHA-256 hex digests of the texts
+            model: Embedding model name
+
+        Returns:
+            Mapping of text hash to float32 vector, for the hashes found
+        """
+        hashes = list(set(text_hashes))
+        if not hashes:
+            return {}
+
+        result = await self.session.execute(
+            select(EmbeddingCacheModel.text_hash, EmbeddingCacheModel.vector)
+            .where(
+                EmbeddingCacheModel.model == model,
+                EmbeddingCacheModel.text_hash.in_(hashes)
+            )
+        )
+        vectors = {
+            text_hash: np.frombuffer(vector, dtype=_VECTOR_DTYPE).astype(np.float32)
+            for text_hash, vector in result.all()
+        }
+        logger.debug(f"Embedding cache hits: {len(vectors)}/{len(hashes)}")
+        return vectors
+
+    async def put_many(
+        self,
+        vectors: Mapping[str, np.ndarray],
+        model: str
+    ) -> None:
+        """
+        Store vectors, skipping any already cached.
+
+        Args:
+            vectors: Mapping of text hash to vector
+            model: Embedding model name
+        """
+        if not vectors:
+            return
+
+        rows: List[dict] = [
+            {
+                "text_hash": text_hash,
+                "model": model,
+                "vector": np.asarray(vector, dtype=_VECTOR_DTYPE).tobytes(),
+            }
+            for text_hash, vector in vectors.items()
+        ]
+        insert = (pg_insert if self.session.get_bind().dialect.name == "postgresql"
+                  else sqlite_insert)
+        for i in range(0, len(rows), _INSERT_BATCH):
+            await self.session.execute(
+                insert(EmbeddingCacheModel)
+                .values(rows[i:i + _INSERT_BATCH])
+                .on_conflict_do_nothing()
+            )
@@ -5,7 +5,7 @@ Handles validation and serialization for annotation API endpoints.
 
 from datetime import datetime
 from typing import Optional, List, Dict, Any
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, validator
 
 
 # Base schemas for annotation data structures (matching frontend types)
@@ -73,12 +73,23 @@ class AnnotationCreate(AnnotationCreateBase):
 
 
 class AnnotationUpdate(BaseModel):
-    """Schema for updating annotation"""
+    """
+    Schema for updating annotation.
+    Only fields present in the request are applied; content and color
+    may be cleared with an explicit null.
+    """
     data: Optional[Dict[str, Any]] = None
     content: Optional[str] = None
     color: Optional[str] = None
     tags: Optional[List[str]] = None
 
+    @validator('data', 'tags')
+    def not_null(cls, v):
+        """Reject explicit null for non-nullable columns."""
+        if v is None:
+            raise ValueError('Field cannot be null')
+        return v
+
     class Config:
         extra = "forbid"
 
@@ -106,10 +117,33 @@ class AnnotationResponse(BaseModel):
 class AnnotationListResponse(BaseModel):
     """Schema for paginated annotation list"""
     annotations: List[AnnotationResponse]
-    total: int
+    total: Optional[int] = None
+    page: int = 1
+    page_size: int = 50
+    has_more: bool = False
+    next_cursor: Optional[str] = None
+
+
+class AnnotationSummary(BaseModel):
+    """Slim annotation projection with only the fields needed for rendering"""
+    id: str
+    page_number: int
+    annotation_type: str
+    color: Optional[str] = None
+    data: Dict[str, Any]
+
+    class Config:
+        from_attributes = True
+
+
+class AnnotationSummaryListResponse(BaseModel):
+    """Schema for paginated annotation summary list"""
+    annotations: List[AnnotationSummary]
+    total: Optional[int] = None
     page: int = 1
     page_size: int = 50
     has_more: bool = False
+    next_cursor: Optional[str] = None
 
 
 # Annotation reply schemas
@@ -138,6 +172,24 @@ class AnnotationReplyResponse(BaseModel):
 
 
 # Batch operation schemas
+class AnnotationBatchItem(AnnotationCreateBase):
+    """Schema for one item of a PDF.js batch create"""
+    annotation_type: str = "pdfjs"
+
+
+class AnnotationBatchCreate(BaseModel):
+    """Schema for batch creating annotations; items are validated one by one"""
+    annotations: List[Dict[str, Any]]
+
+
+class AnnotationBatchResult(BaseModel):
+    """Schema for batch create result"""
+    status: str
+    created: int
+    total: int
+    errors: Optional[List[str]] = None
+
+
 class AnnotationBatchDelete(BaseModel):
     """Schema for deleting multiple annotations"""
     annotation_ids: List[str]
@@ -73,6 +73,8 @@ class BookmarkResponse(BaseModel):
     position_height: float = Field(..., description="Selection height")
 
     ai_summary: str = Field(..., description="AI-generated summary")
+    ai_status: str = Field(
+        "completed", description="AI summary state: pending or completed")
     title: Optional[str] = Field(None, description="Bookmark title")
     user_notes: Optional[str] = Field(None, description="User notes")
     tags: Optional[List[str]] = Field(default=[], description="User tags")
@@ -93,7 +95,10 @@ class BookmarkListResponse(BaseModel):
 
     bookmarks: List[BookmarkResponse] = Field(...,
                                               description="List of bookmarks")
-    total: int = Field(..., description="Total count")
+    total: Optional[int] = Field(
+        None, description="Total count (only when include_total is set)")
+    next_cursor: Optional[str] = Field(
+        None, description="Cursor for the next page, if any")
 
 
 # ==================== Search Request ====================
@@ -104,6 +109,11 @@ class BookmarkSearchRequest(BaseModel):
     query: str = Field(..., min_length=1, description="Search query")
     document_id: Optional[str] = Field(
         None, description="Optional document filter")
+    limit: int = Field(100, ge=1, le=500, description="Max results")
+    cursor: Optional[str] = Field(
+        None, description="next_cursor of the previous page")
+    include_total: bool = Field(
+        False, description="Also count all matches")
 
 
 # ==================== AI Generate Request ====================
@@ -8,7 +8,7 @@ from typing import Optional, Dict, Any, List
 from datetime import datetime
 from uuid import UUID
 
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import AliasChoices, AliasPath, BaseModel, Field, ConfigDict, field_validator
 
 from ..models.domain.chunk import ChunkType
 
@@ -55,12 +55,35 @@ class ChunkInDB(ChunkBase):
     end_page: int
     token_count: int
     vector_id: Optional[str] = None
-    chunk_metadata: Optional[Dict[str, Any]] = Field(None, alias="metadata")
+    # ORM rows expose the column as chunk_metadata; their `metadata`
+    # attribute is SQLAlchemy's table MetaData, so it is only a fallback
+    chunk_metadata: Dict[str, Any] = Field(
+        default_factory=dict,
+        validation_alias=AliasChoices("chunk_metadata", "metadata"),
+        serialization_alias="metadata",
+    )
+    # Stored inside chunk_metadata by the position-aware chunker
+    bounding_boxes: List[BoundingBox] = Field(
+        default_factory=list,
+        description="Bounding boxes for chunk position",
+        validation_alias=AliasChoices(
+            "bounding_boxes", AliasPath("chunk_metadata", "bounding_boxes")),
+    )
     created_at: datetime
     updated_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
 
+    @field_validator("chunk_metadata", mode="before")
+    @classmethod
+    def _default_metadata(cls, value: Any) -> Any:
+        return value or {}
+
+    @field_validator("bounding_boxes", mode="before")
+    @classmethod
+    def _default_bounding_boxes(cls, value: Any) -> Any:
+        return value or []
+
 
 class ChunkResponse(ChunkInDB):
     """
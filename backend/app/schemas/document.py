@@ -8,7 +8,7 @@ from typing import Optional, Dict, Any, List
 from datetime import datetime
 from uuid import UUID
 
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import AliasChoices, BaseModel, Field, ConfigDict, field_validator
 
 from ..models.domain.document import DocumentStatus
 
@@ -46,6 +46,14 @@ class DocumentInDB(DocumentBase):
     """
     Document schema as stored in database.
     """
+    # ORM rows expose the column as doc_metadata; their `metadata`
+    # attribute is SQLAlchemy's table MetaData, so it is only a fallback
+    doc_metadata: Dict[str, Any] = Field(
+        default_factory=dict,
+        description="Document metadata",
+        validation_alias=AliasChoices("doc_metadata", "metadata"),
+        serialization_alias="metadata",
+    )
     id: UUID
     file_path: str
     file_size: int
@@ -60,6 +68,11 @@ class DocumentInDB(DocumentBase):
 
     model_config = ConfigDict(from_attributes=True)
 
+    @field_validator("doc_metadata", mode="before")
+    @classmethod
+    def _default_metadata(cls, value: Any) -> Any:
+        return value or {}
+
 
 class DocumentResponse(DocumentInDB):
     """
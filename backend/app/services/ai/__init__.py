@@ -1,9 +1,9 @@
 """AI services"""
 
 from .embeddings import EmbeddingsService
-from .retrieval import RetrievalService
-from .llm import LLMService
+from .retrieval import RetrievalService, get_retrieval_service
+from .llm import LLMService, get_llm_service
 from .technical_rag import TechnicalDocRAG
 
-__all__ = ['EmbeddingsService', 'RetrievalService',
-           'LLMService', 'TechnicalDocRAG']
+__all__ = ['EmbeddingsService', 'RetrievalService', 'get_retrieval_service',
+           'LLMService', 'get_llm_service', 'TechnicalDocRAG']
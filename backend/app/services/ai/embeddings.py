@@ -3,6 +3,7 @@ AI Embeddings 服务
 使用 sentence-transformers 生成文本向量嵌入
 """
 from typing import List, Dict, Any, Optional
+import threading
 import numpy as np
 
 from loguru import logger
@@ -30,18 +31,26 @@ class EmbeddingsService:
         self.device = device
         self.model: Optional[SentenceTransformer] = None
         self.embedding_dim: Optional[int] = None
+        # 共享实例会在多个工作线程中使用，避免重复加载模型
+        self._load_lock = threading.Lock()
 
         logger.info(
             f"Initializing Embeddings service with model: {model_name}")
 
     def _load_model(self):
         """延迟加载模型"""
-        if self.model is None:
+        if self.model is not None:
+            return
+        with self._load_lock:
+            if self.model is not None:
+                return
             try:
                 logger.info(f"Loading embedding model: {self.model_name}")
-                self.model = SentenceTransformer(
+                model = SentenceTransformer(
                     self.model_name, device=self.device)
-                self.embedding_dim = self.model.get_sentence_embedding_dimension()
+                self.embedding_dim = model.get_sentence_embedding_dimension()
+                # 最后发布模型，其他线程看到 model 时维度已就绪
+                self.model = model
                 logger.info(
                     f"Model loaded successfully, embedding dimension: {self.embedding_dim}")
             except Exception as e:
@@ -8,7 +8,7 @@ from loguru import logger
 
 from ...infrastructure.ai.gemini_client import get_gemini_client
 from ...core.exceptions import AIServiceError
-from .retrieval import RetrievalService
+from .retrieval import RetrievalService, get_retrieval_service
 
 
 class LLMService:
@@ -126,7 +126,8 @@ Rules:
         document_id: Optional[str] = None,
         n_contexts: int = 3,
         language: str = "zh",
-        temperature: float = 0.7
+        temperature: float = 0.7,
+        context_chunks: Optional[List[Dict[str, Any]]] = None
     ) -> Dict[str, Any]:
         """
         回答问题（RAG）
@@ -137,6 +138,7 @@ Rules:
             n_contexts: 检索的上下文数量
             language: 语言
             temperature: 生成温度
+            context_chunks: 调用方已检索到的上下文（提供时不再重复检索）
 
         Returns:
             回答结果
@@ -144,18 +146,19 @@ Rules:
         try:
             logger.info(f"Answering question: {question[:50]}...")
 
-            # 1. 检索相关文档块
-            if document_id:
-                context_chunks = self.retrieval_service.search_by_document(
-                    question,
-                    document_id,
-                    n_results=n_contexts
-                )
-            else:
-                context_chunks = self.retrieval_service.search(
-                    question,
-                    n_results=n_contexts
-                )
+            # 1. 检索相关文档块（调用方已检索时直接使用）
+            if context_chunks is None:
+                if document_id:
+                    context_chunks = self.retrieval_service.search_by_document(
+                        question,
+                        document_id,
+                        n_results=n_contexts
+                    )
+                else:
+                    context_chunks = self.retrieval_service.search(
+                        question,
+                        n_results=n_contexts
+                    )
 
             if not context_chunks:
                 return {
@@ -454,3 +457,20 @@ Keywords:"""
         except Exception as e:
             logger.error(f"Error extracting keywords: {e}")
             raise AIServiceError(f"Failed to extract keywords: {str(e)}")
+
+
+# 全局 LLM 服务实例
+_llm_service: Optional[LLMService] = None
+
+
+def get_llm_service() -> LLMService:
+    """
+    获取 LLM 服务单例（使用共享的检索服务）
+
+    Returns:
+        LLMService 实例
+    """
+    global _llm_service
+    if _llm_service is None:
+        _llm_service = LLMService(retrieval_service=get_retrieval_service())
+    return _llm_service
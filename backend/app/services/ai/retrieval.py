@@ -5,6 +5,7 @@
 from typing import List, Dict, Any, Optional
 import uuid
 
+import numpy as np
 from loguru import logger
 
 from ...infrastructure.vector_db.client import get_chroma_client
@@ -146,7 +147,8 @@ class RetrievalService:
         self,
         query_text: str,
         n_results: int = 5,
-        filter_dict: Optional[Dict[str, Any]] = None
+        filter_dict: Optional[Dict[str, Any]] = None,
+        query_embedding: Optional[np.ndarray] = None
     ) -> List[Dict[str, Any]]:
         """
         搜索相关文档
@@ -155,6 +157,7 @@ class RetrievalService:
             query_text: 查询文本
             n_results: 返回结果数量
             filter_dict: 过滤条件
+            query_embedding: 已计算好的查询向量，提供时不再重复编码
 
         Returns:
             搜索结果列表
@@ -164,8 +167,9 @@ class RetrievalService:
 
             # 生成查询向量
             logger.info(f"Searching for: {query_text[:50]}...")
-            query_embedding = self.embeddings_service.encode_text(
-                query_text, show_progress=False)
+            if query_embedding is None:
+                query_embedding = self.embeddings_service.encode_text(
+                    query_text, show_progress=False)
 
             # 执行查询
             results = self.collection.query(
@@ -211,7 +215,8 @@ class RetrievalService:
         self,
         query_text: str,
         document_id: str,
-        n_results: int = 5
+        n_results: int = 5,
+        query_embedding: Optional[np.ndarray] = None
     ) -> List[Dict[str, Any]]:
         """
         在特定文档中搜索
@@ -220,12 +225,14 @@ class RetrievalService:
             query_text: 查询文本
             document_id: 文档ID
             n_results: 返回结果数量
+            query_embedding: 已计算好的查询向量，提供时不再重复编码
 
         Returns:
             搜索结果列表
         """
         filter_dict = {"document_id": document_id}
-        return self.search(query_text, n_results, filter_dict)
+        return self.search(query_text, n_results, filter_dict,
+                           query_embedding=query_embedding)
 
     def get_document_chunks(
         self,
@@ -345,3 +352,22 @@ class RetrievalService:
         except Exception as e:
             logger.error(f"Error clearing collection: {e}")
             raise AIServiceError(f"Failed to clear collection: {str(e)}")
+
+
+# 全局检索服务实例
+_retrieval_service: Optional[RetrievalService] = None
+
+
+def get_retrieval_service() -> RetrievalService:
+    """
+    获取检索服务单例
+
+    嵌入模型和 ChromaDB 集合在首次使用时加载，之后所有请求共享
+
+    Returns:
+        RetrievalService 实例
+    """
+    global _retrieval_service
+    if _retrieval_service is None:
+        _retrieval_service = RetrievalService()
+    return _retrieval_service
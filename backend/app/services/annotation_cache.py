@@ -0,0 +1,46 @@
+"""
+Redis cache-aside layer for annotation listings.
+
+Serialized listing responses are cached per query under
+ann:{document_id}:..., grouped by document so a write can drop all of a
+document's listings at once.
+"""
+
+from typing import Iterable, Optional
+
+from ..core.config import get_settings
+from ..infrastructure.cache import ResponseCache
+
+settings = get_settings()
+
+_cache = ResponseCache("ann", settings.annotation_cache_ttl)
+
+
+def listing_key(
+    document_id: str,
+    view: str,
+    page_number: Optional[int],
+    annotation_type: Optional[str],
+    limit: int,
+    offset: int,
+    cursor: Optional[str] = None,
+    include_total: bool = False
+) -> str:
+    """Build the cache key of one annotation listing query."""
+    return _cache.key(document_id, view, page_number, annotation_type,
+                      limit, offset, cursor, int(include_total))
+
+
+async def get_listing(key: str) -> Optional[bytes]:
+    """Return a cached listing body, or None on miss or Redis failure."""
+    return await _cache.get(key)
+
+
+async def set_listing(document_id: str, key: str, body: bytes) -> None:
+    """Cache a listing body and register its key for invalidation."""
+    await _cache.set(document_id, key, body)
+
+
+async def invalidate_documents(document_ids: Iterable[str]) -> None:
+    """Drop every cached listing of the given documents."""
+    await _cache.invalidate(document_ids)
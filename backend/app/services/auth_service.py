@@ -4,8 +4,10 @@ Authentication service for user registration and login.
 This service handles user authentication operations.
 """
 
-from typing import Optional, Tuple
+from typing import Dict, Optional, Tuple
 from datetime import timedelta
+import asyncio
+import time
 
 from ..core.auth import AuthUtils
 from ..core.logging import get_logger
@@ -15,6 +17,36 @@ from ..repositories.user_repository import UserRepository
 
 logger = get_logger(__name__)
 
+# Short-lived per-process cache of authenticated users: user_id -> (expires_at, user).
+# Cached instances are detached from their session and only read column attributes.
+_USER_CACHE_TTL = 30.0
+_USER_CACHE_MAXSIZE = 2048
+_user_cache: Dict[str, Tuple[float, UserModel]] = {}
+
+
+def _get_cached_user(user_id: str) -> Optional[UserModel]:
+    """Return a cached user if present and not expired."""
+    entry = _user_cache.get(user_id)
+    if entry is None:
+        return None
+    expires_at, user = entry
+    if expires_at <= time.monotonic():
+        _user_cache.pop(user_id, None)
+        return None
+    return user
+
+
+def _cache_user(user: UserModel) -> None:
+    """Store a user, evicting the oldest entry when the cache is full."""
+    if len(_user_cache) >= _USER_CACHE_MAXSIZE:
+        _user_cache.pop(next(iter(_user_cache)), None)
+    _user_cache[user.id] = (time.monotonic() + _USER_CACHE_TTL, user)
+
+
+def invalidate_cached_user(user_id: str) -> None:
+    """Drop a user from the cache after a credential or status change."""
+    _user_cache.pop(user_id, None)
+
 
 class AuthService:
     """Service for user authentication operations."""
@@ -66,8 +98,10 @@ class AuthService:
         if await self.user_repo.check_email_exists(email):
             raise ValidationError(f"Email '{email}' already registered")
 
-        # Hash password
-        hashed_password = self.auth_utils.hash_password(password)
+        # Hash password; bcrypt releases the GIL, so a worker thread keeps
+        # the event loop free while it runs
+        hashed_password = await asyncio.to_thread(
+            self.auth_utils.hash_password, password)
 
         # Create user
         user = UserModel(
@@ -124,7 +158,8 @@ class AuthService:
             raise AuthenticationError("User account is inactive")
 
         # Verify password
-        if not self.auth_utils.verify_password(password, user.hashed_password):
+        if not await asyncio.to_thread(
+                self.auth_utils.verify_password, password, user.hashed_password):
             logger.warning(f"Invalid password for user: {username}")
             raise AuthenticationError("Invalid username or password")
 
@@ -163,10 +198,13 @@ class AuthService:
             if user_id is None:
                 raise AuthenticationError("Invalid token payload")
 
-            # Get user from database
-            user = await self.user_repo.get_by_id(user_id)
+            # Get user from cache, falling back to the database
+            user = _get_cached_user(user_id)
             if user is None:
-                raise AuthenticationError("User not found")
+                user = await self.user_repo.get_by_id(user_id)
+                if user is None:
+                    raise AuthenticationError("User not found")
+                _cache_user(user)
 
             if not user.is_active:
                 raise AuthenticationError("User account is inactive")
@@ -209,15 +247,18 @@ class AuthService:
             raise AuthenticationError("User not found")
 
         # Verify old password
-        if not self.auth_utils.verify_password(old_password, user.hashed_password):
+        if not await asyncio.to_thread(
+                self.auth_utils.verify_password, old_password, user.hashed_password):
             raise AuthenticationError("Incorrect current password")
 
         # Hash new password
-        hashed_password = self.auth_utils.hash_password(new_password)
+        hashed_password = await asyncio.to_thread(
+            self.auth_utils.hash_password, new_password)
 
         # Update user
         await self.user_repo.update(user_id, {"hashed_password": hashed_password})
         await self.user_repo.commit()
+        invalidate_cached_user(user_id)
 
         logger.info(f"Password changed for user: {user_id}")
         return True
@@ -0,0 +1,49 @@
+"""
+Redis cache-aside layer for bookmark reads.
+
+Single bookmarks and listings are cached per user under bm:{user_id}:...,
+so the key itself scopes a body to its owner and any write by that user
+drops all of their cached bookmark responses at once.
+"""
+
+from typing import Optional
+
+from ..core.config import get_settings
+from ..infrastructure.cache import ResponseCache
+
+settings = get_settings()
+
+_cache = ResponseCache("bm", settings.bookmark_cache_ttl)
+
+
+def item_key(user_id: str, bookmark_id: str) -> str:
+    """Build the cache key of one bookmark."""
+    return _cache.key(user_id, "item", bookmark_id)
+
+
+def list_key(
+    user_id: str,
+    document_id: Optional[str],
+    page_number: Optional[int],
+    limit: int,
+    cursor: Optional[str],
+    include_total: bool
+) -> str:
+    """Build the cache key of one bookmark listing query."""
+    return _cache.key(user_id, "list", document_id, page_number,
+                      limit, cursor, int(include_total))
+
+
+async def get_response(key: str) -> Optional[bytes]:
+    """Return a cached body, or None on miss or Redis failure."""
+    return await _cache.get(key)
+
+
+async def set_response(user_id: str, key: str, body: bytes) -> None:
+    """Cache a body under the user's group."""
+    await _cache.set(user_id, key, body)
+
+
+async def invalidate_user(user_id: str) -> None:
+    """Drop every cached bookmark response of a user."""
+    await _cache.invalidate([user_id])
@@ -0,0 +1,71 @@
+"""
+Redis notifications for bookmarks summarized in the background.
+
+When a pending bookmark's AI summary is stored, its serialized response is
+published on bookmark:{id}:ready and also kept under the same key for a
+short while, so a subscriber that connects after the publish still gets it.
+"""
+
+import asyncio
+from typing import Optional
+
+from redis.exceptions import RedisError
+
+from ..core.logging import get_logger
+from ..infrastructure.cache import get_redis_client
+
+logger = get_logger(__name__)
+
+# How long a finished summary stays readable for late subscribers
+READY_TTL = 300
+
+
+def _channel(bookmark_id: str) -> str:
+    return f"bookmark:{bookmark_id}:ready"
+
+
+async def publish_ready(bookmark_id: str, body: bytes) -> None:
+    """Announce that a bookmark's AI summary is available."""
+    channel = _channel(bookmark_id)
+    try:
+        redis = await get_redis_client()
+        await redis.set(channel, body, ex=READY_TTL)
+        await redis.publish(channel, body)
+    except RedisError as e:
+        logger.warning(f"Failed to publish bookmark {bookmark_id} summary: {e}")
+
+
+async def wait_ready(bookmark_id: str, timeout: float) -> Optional[bytes]:
+    """
+    Wait for a bookmark's AI summary to be published.
+
+    Args:
+        bookmark_id: Bookmark ID
+        timeout: Maximum seconds to wait
+
+    Returns:
+        Serialized bookmark response, or None on timeout
+
+    Raises:
+        RedisError: If Redis is unreachable
+    """
+    channel = _channel(bookmark_id)
+    redis = await get_redis_client()
+    pubsub = redis.pubsub(ignore_subscribe_messages=True)
+    try:
+        await pubsub.subscribe(channel)
+        # The summary may have been published before the subscription
+        body = await redis.get(channel)
+        if body is not None:
+            return body
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while (remaining := deadline - loop.time()) > 0:
+            message = await pubsub.get_message(timeout=remaining)
+            if message is not None and message["type"] == "message":
+                return message["data"]
+        return None
+    finally:
+        await pubsub.unsubscribe(channel)
+        await pubsub.aclose()
@@ -4,17 +4,55 @@ Bookmark service for managing bookmarks with AI-generated summaries.
 This service handles bookmark CRUD operations and AI summary generation.
 """
 
-from typing import Optional, List, Dict, Any
+import asyncio
+from datetime import datetime
+from typing import Optional, List, Dict, Any, Tuple
 from uuid import UUID
 
+from sqlalchemy.engine import RowMapping
+
 from ..core.logging import get_logger
-from ..core.exceptions import ValidationError, ProcessingError
-from ..models.db import BookmarkModel
+from ..core.exceptions import ValidationError, ProcessingError, BookmarkNotFoundError
+from ..models.db import BookmarkModel, AI_STATUS_COMPLETED, AI_STATUS_PENDING
 from ..repositories.bookmark_repository import BookmarkRepository
 from ..infrastructure.ai.gemini_client import GeminiClient
 
 logger = get_logger(__name__)
 
+# Concurrent Gemini calls when summarizing a batch of bookmarks
+SUMMARY_CONCURRENCY = 8
+
+# Gemini prompt for bookmark summaries, parsed once and filled per call
+SUMMARY_SYSTEM_INSTRUCTION = "你是一个专业的知识总结助手，擅长提炼文档中的核心要点。"
+_SUMMARY_PROMPT = """请基于以下选中的文本内容生成一个简洁的书签摘要。
+
+选中文本：
+{selected_text}
+
+{history}
+要求：
+1. 总结核心知识点（50-100字）
+2. 如果有对话历史，结合对话内容提炼关键信息
+3. 使用清晰、专业的语言
+4. 突出重点概念和要点
+
+请生成书签摘要："""
+
+# Conversation messages included in the summary prompt
+_SUMMARY_HISTORY_MESSAGES = 5
+
+# Per-process cache of generated summaries: prompt inputs -> summary.
+# Re-bookmarking the same passage with the same context skips Gemini.
+_SUMMARY_CACHE_MAXSIZE = 2048
+_summary_cache: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], str] = {}
+
+
+def _cache_summary(key: Tuple[str, Tuple[Tuple[str, str], ...]], summary: str) -> None:
+    """Store a summary, evicting the oldest entry when the cache is full."""
+    if len(_summary_cache) >= _SUMMARY_CACHE_MAXSIZE:
+        _summary_cache.pop(next(iter(_summary_cache)), None)
+    _summary_cache[key] = summary
+
 
 class BookmarkService:
     """Service for bookmark operations and AI summary generation."""
@@ -78,16 +116,11 @@ class BookmarkService:
             ProcessingError: If AI generation fails
         """
         try:
-            # Validate inputs
-            if not selected_text or len(selected_text.strip()) == 0:
-                raise ValidationError("Selected text cannot be empty")
-
-            if page_number < 0:
-                raise ValidationError("Page number must be non-negative")
+            self._validate_selection(selected_text, page_number)
 
             # Generate AI summary
-            logger.info(
-                f"Generating AI summary for bookmark on page {page_number}")
+            logger.info("Generating AI summary for bookmark on page {}",
+                        page_number)
             ai_summary = await self._generate_bookmark_summary(
                 selected_text=selected_text,
                 conversation_history=conversation_history
@@ -117,8 +150,77 @@ class BookmarkService:
             created_bookmark = await self.bookmark_repo.create(bookmark)
             await self.bookmark_repo.commit()
 
-            logger.info(
-                f"Created bookmark {created_bookmark.id} for user {user_id}")
+            logger.info("Created bookmark {} for user {}",
+                        created_bookmark.id, user_id)
+            return created_bookmark
+
+        except ValidationError:
+            raise
+        except Exception as e:
+            logger.error(f"Error creating bookmark: {e}", exc_info=True)
+            raise ProcessingError(f"Failed to create bookmark: {str(e)}")
+
+    async def create_pending_bookmark(
+        self,
+        user_id: str,
+        document_id: str,
+        selected_text: str,
+        page_number: int,
+        position_x: float,
+        position_y: float,
+        position_width: float,
+        position_height: float,
+        conversation_history: Optional[List[Dict[str, str]]] = None,
+        chunk_id: Optional[str] = None,
+        color: str = "#FCD34D"
+    ) -> BookmarkModel:
+        """
+        Create a bookmark whose AI summary is generated later.
+
+        The row is stored with ai_status "pending" and the selected text as
+        a provisional summary; complete_bookmark_summaries fills in the
+        real one.
+
+        Args:
+            user_id: User ID
+            document_id: Document ID
+            selected_text: Selected text content
+            page_number: Page number
+            position_x: X coordinate
+            position_y: Y coordinate
+            position_width: Width
+            position_height: Height
+            conversation_history: Optional chat history
+            chunk_id: Optional associated chunk ID
+            color: Highlight color
+
+        Returns:
+            Created bookmark model
+
+        Raises:
+            ValidationError: If input is invalid
+            ProcessingError: If the bookmark cannot be saved
+        """
+        try:
+            bookmark = BookmarkModel(**self._pending_values(
+                user_id=user_id,
+                document_id=document_id,
+                selected_text=selected_text,
+                page_number=page_number,
+                position_x=position_x,
+                position_y=position_y,
+                position_width=position_width,
+                position_height=position_height,
+                conversation_history=conversation_history,
+                chunk_id=chunk_id,
+                color=color
+            ))
+
+            created_bookmark = await self.bookmark_repo.create(bookmark)
+            await self.bookmark_repo.commit()
+
+            logger.info("Created pending bookmark {} for user {}",
+                        created_bookmark.id, user_id)
             return created_bookmark
 
         except ValidationError:
@@ -127,6 +229,143 @@ class BookmarkService:
             logger.error(f"Error creating bookmark: {e}", exc_info=True)
             raise ProcessingError(f"Failed to create bookmark: {str(e)}")
 
+    async def create_pending_bookmarks(
+        self,
+        user_id: str,
+        items: List[Dict[str, Any]]
+    ) -> List[BookmarkModel]:
+        """
+        Create many bookmarks in one INSERT, summarized later.
+
+        Args:
+            user_id: User ID
+            items: Keyword arguments of create_bookmark for each bookmark
+
+        Returns:
+            Created bookmarks in input order
+
+        Raises:
+            ValidationError: If any item is invalid
+            ProcessingError: If the bookmarks cannot be saved
+        """
+        try:
+            rows = [self._pending_values(user_id=user_id, **item)
+                    for item in items]
+            bookmarks = await self.bookmark_repo.bulk_create(rows)
+            await self.bookmark_repo.commit()
+
+            logger.info("Created {} pending bookmarks for user {}",
+                        len(bookmarks), user_id)
+            return bookmarks
+
+        except ValidationError:
+            raise
+        except Exception as e:
+            logger.error(f"Error bulk creating bookmarks: {e}", exc_info=True)
+            raise ProcessingError(f"Failed to create bookmarks: {str(e)}")
+
+    def _pending_values(
+        self,
+        user_id: str,
+        document_id: str,
+        selected_text: str,
+        page_number: int,
+        position_x: float,
+        position_y: float,
+        position_width: float,
+        position_height: float,
+        conversation_history: Optional[List[Dict[str, str]]] = None,
+        chunk_id: Optional[str] = None,
+        title: Optional[str] = None,
+        user_notes: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        color: str = "#FCD34D"
+    ) -> Dict[str, Any]:
+        """
+        Build the column values of a bookmark awaiting its AI summary.
+
+        The selected text stands in as a provisional summary.
+
+        Raises:
+            ValidationError: If input is invalid
+        """
+        self._validate_selection(selected_text, page_number)
+        return {
+            'user_id': user_id,
+            'document_id': document_id,
+            'chunk_id': chunk_id,
+            'selected_text': selected_text,
+            'page_number': page_number,
+            'position_x': position_x,
+            'position_y': position_y,
+            'position_width': position_width,
+            'position_height': position_height,
+            'ai_summary': self._truncate(selected_text),
+            'ai_status': AI_STATUS_PENDING,
+            'title': title or self._generate_title(selected_text),
+            'user_notes': user_notes,
+            'conversation_context': self._format_conversation(
+                conversation_history),
+            'tags': tags or [],
+            'color': color,
+        }
+
+    async def complete_bookmark_summaries(
+        self,
+        bookmarks: List[Tuple[str, str, Optional[List[Dict[str, str]]]]]
+    ) -> List[BookmarkModel]:
+        """
+        Generate the AI summaries of many pending bookmarks and store them.
+
+        Gemini is called concurrently (at most SUMMARY_CONCURRENCY at a
+        time); all summaries are then written with one batched UPDATE.
+
+        Args:
+            bookmarks: (bookmark_id, selected_text, conversation_history)
+                of each pending bookmark
+
+        Returns:
+            Updated bookmarks that still exist
+        """
+        semaphore = asyncio.Semaphore(SUMMARY_CONCURRENCY)
+
+        async def summarize(selected_text, conversation_history):
+            async with semaphore:
+                return await self._generate_bookmark_summary(
+                    selected_text=selected_text,
+                    conversation_history=conversation_history
+                )
+
+        # _generate_bookmark_summary falls back instead of raising
+        summaries = await asyncio.gather(*(
+            summarize(selected_text, history)
+            for _, selected_text, history in bookmarks
+        ))
+        ids = [bookmark_id for bookmark_id, _, _ in bookmarks]
+        await self.bookmark_repo.bulk_update_summaries(
+            dict(zip(ids, summaries)), AI_STATUS_COMPLETED)
+        await self.bookmark_repo.commit()
+
+        logger.info("Completed AI summaries of {} bookmarks", len(ids))
+        return await self.bookmark_repo.get_many(ids)
+
+    def _validate_selection(self, selected_text: str, page_number: int) -> None:
+        """
+        Validate the selection a bookmark is created from.
+
+        Raises:
+            ValidationError: If input is invalid
+        """
+        if not selected_text or len(selected_text.strip()) == 0:
+            raise ValidationError("Selected text cannot be empty")
+
+        if page_number < 0:
+            raise ValidationError("Page number must be non-negative")
+
+    def _truncate(self, text: str, max_length: int = 200) -> str:
+        """Shorten text to max_length characters with an ellipsis."""
+        return text[:max_length] + "..." if len(text) > max_length else text
+
     async def _generate_bookmark_summary(
         self,
         selected_text: str,
@@ -145,49 +384,42 @@ class BookmarkService:
         Raises:
             ProcessingError: If AI generation fails
         """
-        try:
-            # Build prompt
-            prompt = f"""请基于以下选中的文本内容生成一个简洁的书签摘要。
-
-选中文本：
-{selected_text}
-
-"""
-
-            # Add conversation context if available
-            if conversation_history and len(conversation_history) > 0:
-                prompt += "\n相关对话历史：\n"
-                for msg in conversation_history[-5:]:  # Last 5 messages
-                    role = "用户" if msg.get('role') == 'user' else "助手"
-                    content = msg.get('content', '')
-                    prompt += f"{role}: {content}\n"
-
-            prompt += """
-要求：
-1. 总结核心知识点（50-100字）
-2. 如果有对话历史，结合对话内容提炼关键信息
-3. 使用清晰、专业的语言
-4. 突出重点概念和要点
+        messages = tuple(
+            ("用户" if msg.get('role') == 'user' else "助手",
+             msg.get('content', ''))
+            for msg in (conversation_history or [])[-_SUMMARY_HISTORY_MESSAGES:]
+        )
+        cache_key = (selected_text, messages)
+        cached = _summary_cache.get(cache_key)
+        if cached is not None:
+            return cached
 
-请生成书签摘要："""
+        try:
+            history = ""
+            if messages:
+                history = "\n相关对话历史：\n" + "".join(
+                    f"{role}: {content}\n" for role, content in messages)
+            prompt = _SUMMARY_PROMPT.format(
+                selected_text=selected_text, history=history)
 
             # Call Gemini API
             summary = await self.ai_client.generate_content(
                 prompt=prompt,
-                system_instruction="你是一个专业的知识总结助手，擅长提炼文档中的核心要点。"
+                system_instruction=SUMMARY_SYSTEM_INSTRUCTION
             )
 
             if not summary or len(summary.strip()) == 0:
                 raise ProcessingError("AI generated empty summary")
 
-            logger.info(f"Generated AI summary: {summary[:100]}...")
-            return summary.strip()
+            logger.info("Generated AI summary: {}...", summary[:100])
+            summary = summary.strip()
+            _cache_summary(cache_key, summary)
+            return summary
 
         except Exception as e:
             logger.error(f"Error generating AI summary: {e}")
             # Fallback to simple truncation
-            fallback_summary = selected_text[:200] + \
-                "..." if len(selected_text) > 200 else selected_text
+            fallback_summary = self._truncate(selected_text)
             logger.warning(f"Using fallback summary due to AI error")
             return f"[摘要生成失败，显示原文] {fallback_summary}"
 
@@ -255,17 +487,9 @@ class BookmarkService:
             Updated bookmark
 
         Raises:
-            ValidationError: If bookmark not found or unauthorized
+            BookmarkNotFoundError: If the user has no such bookmark
         """
         try:
-            bookmark = await self.bookmark_repo.get_by_id(bookmark_id)
-
-            if not bookmark:
-                raise ValidationError("Bookmark not found")
-
-            if bookmark.user_id != user_id:
-                raise ValidationError("Unauthorized to update this bookmark")
-
             # Update fields
             update_data = {}
             if title is not None:
@@ -277,15 +501,19 @@ class BookmarkService:
             if color is not None:
                 update_data['color'] = color
 
+            # Ownership is part of the WHERE clause, so a bookmark of
+            # another user is indistinguishable from a missing one
+            bookmark = await self.bookmark_repo.update_for_user(
+                bookmark_id, user_id, update_data)
+            if not bookmark:
+                raise BookmarkNotFoundError(f"Bookmark not found: {bookmark_id}")
+
             if update_data:
-                updated_bookmark = await self.bookmark_repo.update(bookmark_id, update_data)
                 await self.bookmark_repo.commit()
-                logger.info(f"Updated bookmark {bookmark_id}")
-                return updated_bookmark
-
+                logger.info("Updated bookmark {}", bookmark_id)
             return bookmark
 
-        except ValidationError:
+        except BookmarkNotFoundError:
             raise
         except Exception as e:
             logger.error(f"Error updating bookmark: {e}")
@@ -303,24 +531,19 @@ class BookmarkService:
             True if deleted
 
         Raises:
-            ValidationError: If unauthorized or not found
+            BookmarkNotFoundError: If the user has no such bookmark
         """
         try:
-            bookmark = await self.bookmark_repo.get_by_id(bookmark_id)
-
-            if not bookmark:
-                raise ValidationError("Bookmark not found")
-
-            if bookmark.user_id != user_id:
-                raise ValidationError("Unauthorized to delete this bookmark")
-
-            deleted = await self.bookmark_repo.delete(bookmark_id)
+            deleted = await self.bookmark_repo.delete_for_user(
+                bookmark_id, user_id)
+            if not deleted:
+                raise BookmarkNotFoundError(f"Bookmark not found: {bookmark_id}")
             await self.bookmark_repo.commit()
 
-            logger.info(f"Deleted bookmark {bookmark_id}")
+            logger.info("Deleted bookmark {}", bookmark_id)
             return deleted
 
-        except ValidationError:
+        except BookmarkNotFoundError:
             raise
         except Exception as e:
             logger.error(f"Error deleting bookmark: {e}")
@@ -331,32 +554,30 @@ class BookmarkService:
         user_id: str,
         document_id: Optional[str] = None,
         page_number: Optional[int] = None,
-        limit: Optional[int] = None
-    ) -> List[BookmarkModel]:
+        limit: int = 100,
+        after: Optional[Tuple[datetime, str]] = None
+    ) -> List[RowMapping]:
         """
-        Get bookmarks for a user.
+        Get a page of bookmarks for a user, newest first.
 
         Args:
             user_id: User ID
             document_id: Optional document filter
             page_number: Optional page filter
-            limit: Optional limit on number of results
+            limit: Maximum number of results
+            after: Optional (created_at, id) keyset cursor
 
         Returns:
-            List of bookmarks
+            List of bookmark column mappings
         """
         try:
-            if document_id and page_number is not None:
-                bookmarks = await self.bookmark_repo.get_by_page(document_id, page_number, user_id)
-            elif document_id:
-                bookmarks = await self.bookmark_repo.get_by_user_and_document(user_id, document_id)
-            else:
-                bookmarks = await self.bookmark_repo.get_by_user(user_id)
-
-            # Apply limit if specified
-            if limit and len(bookmarks) > limit:
-                return bookmarks[:limit]
-            return bookmarks
+            return await self.bookmark_repo.list_for_user(
+                user_id,
+                document_id=document_id,
+                page_number=page_number,
+                limit=limit,
+                after=after,
+            )
         except Exception as e:
             logger.error(f"Error getting user bookmarks: {e}")
             raise ProcessingError(f"Failed to get bookmarks: {str(e)}")
@@ -365,21 +586,57 @@ class BookmarkService:
         self,
         user_id: str,
         search_text: str,
-        document_id: Optional[str] = None
-    ) -> List[BookmarkModel]:
+        document_id: Optional[str] = None,
+        limit: int = 100,
+        after: Optional[Tuple[datetime, str]] = None
+    ) -> List[RowMapping]:
         """
-        Search bookmarks by text.
+        Search bookmarks by text, newest first.
 
         Args:
             user_id: User ID
             search_text: Search query
             document_id: Optional document filter
+            limit: Maximum number of results
+            after: Optional (created_at, id) keyset cursor
 
         Returns:
-            List of matching bookmarks
+            List of matching bookmark column mappings
         """
         try:
-            return await self.bookmark_repo.search_by_text(user_id, search_text, document_id)
+            return await self.bookmark_repo.list_for_user(
+                user_id,
+                document_id=document_id,
+                search_text=search_text,
+                limit=limit,
+                after=after,
+            )
         except Exception as e:
             logger.error(f"Error searching bookmarks: {e}")
             raise ProcessingError(f"Failed to search bookmarks: {str(e)}")
+
+    async def count_bookmarks(
+        self,
+        user_id: str,
+        document_id: Optional[str] = None,
+        page_number: Optional[int] = None,
+        search_text: Optional[str] = None
+    ) -> int:
+        """
+        Count bookmarks matching the listing or search filters.
+
+        Args:
+            user_id: User ID
+            document_id: Optional document filter
+            page_number: Optional page filter
+            search_text: Optional search query
+
+        Returns:
+            Total count
+        """
+        try:
+            return await self.bookmark_repo.count_for_user(
+                user_id, document_id, page_number, search_text)
+        except Exception as e:
+            logger.error(f"Error counting bookmarks: {e}")
+            raise ProcessingError(f"Failed to count bookmarks: {str(e)}")
@@ -9,18 +9,24 @@ This service orchestrates the complete document processing workflow:
 5. Database persistence
 """
 
+import asyncio
 import hashlib
 from pathlib import Path
-from typing import Optional, List, Tuple
+from typing import Dict, Optional, List, Tuple
 from uuid import UUID
 
+import numpy as np
+from sqlalchemy.exc import SQLAlchemyError
+
+from ..core.config import get_settings
 from ..core.logging import get_logger
-from ..core.exceptions import ProcessingError
+from ..core.exceptions import PDFProcessingError, ProcessingError
 from ..models.db import DocumentModel, ChunkModel  # Import from __init__
 from ..models.domain.document import DocumentStatus
 from ..models.domain.chunk import ChunkType
 from ..repositories.document_repository import DocumentRepository
 from ..repositories.chunk_repository import ChunkRepository
+from ..repositories.embedding_cache_repository import EmbeddingCacheRepository
 from .pdf import PDFParser, PDFExtractor, SectionChunker, get_pdf_cache
 from .ai.embeddings import EmbeddingsService
 from .ai.retrieval import RetrievalService
@@ -28,6 +34,11 @@ from .ai.retrieval import RetrievalService
 logger = get_logger(__name__)
 
 
+def thumbnail_path_for(file_path: Path | str, document_id: str) -> Path:
+    """Where the first-page PNG thumbnail of a document is stored."""
+    return Path(file_path).parent / "thumbnails" / f"{document_id}.png"
+
+
 class DocumentProcessingService:
     """
     Service for orchestrating document processing pipeline.
@@ -41,6 +52,7 @@ class DocumentProcessingService:
         chunk_repo: ChunkRepository,
         embedding_service: Optional[EmbeddingsService] = None,
         retrieval_service: Optional[RetrievalService] = None,
+        embedding_cache_repo: Optional[EmbeddingCacheRepository] = None,
     ):
         """
         Initialize document processing service.
@@ -50,9 +62,13 @@ class DocumentProcessingService:
             chunk_repo: Chunk repository
             embedding_service: Optional embedding service
             retrieval_service: Optional retrieval service
+            embedding_cache_repo: Optional embedding cache repository;
+                defaults to one on the document repository's session
         """
         self.document_repo = document_repo
         self.chunk_repo = chunk_repo
+        self.embedding_cache_repo = embedding_cache_repo or EmbeddingCacheRepository(
+            document_repo.session)
         self.embedding_service = embedding_service or EmbeddingsService()
         self.retrieval_service = retrieval_service
         self.pdf_cache = get_pdf_cache()
@@ -67,11 +83,8 @@ class DocumentProcessingService:
         Returns:
             Hex digest of file hash
         """
-        sha256 = hashlib.sha256()
         with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(8192), b""):
-                sha256.update(chunk)
-        return sha256.hexdigest()
+            return hashlib.file_digest(f, "sha256").hexdigest()
 
     async def check_duplicate(self, content_hash: str) -> Optional[DocumentModel]:
         """
@@ -92,6 +105,7 @@ class DocumentProcessingService:
         use_cache: bool = True,
         chunk_strategy: str = "section",
         generate_embeddings: bool = True,
+        content_hash: Optional[str] = None,
     ) -> Tuple[DocumentModel, List[ChunkModel]]:
         """
         Process a document through the complete pipeline.
@@ -102,6 +116,7 @@ class DocumentProcessingService:
             use_cache: Whether to use PDF parsing cache
             chunk_strategy: Chunking strategy ("section", "hybrid", etc.)
             generate_embeddings: Whether to generate and store embeddings
+            content_hash: SHA-256 of the file if already known
 
         Returns:
             Tuple of (document, chunks)
@@ -109,20 +124,60 @@ class DocumentProcessingService:
         Raises:
             ProcessingError: If processing fails
         """
-        logger.info(f"Starting document processing: {filename}")
+        document, created = await self.register_document(
+            file_path, filename, content_hash=content_hash)
+        if not created:
+            chunks = await self.chunk_repo.get_by_document_id(document.id)
+            return document, chunks
+
+        chunks = await self.run_pipeline(
+            document,
+            file_path,
+            use_cache=use_cache,
+            chunk_strategy=chunk_strategy,
+            generate_embeddings=generate_embeddings,
+        )
+        return document, chunks
 
+    async def register_document(
+        self,
+        file_path: Path,
+        filename: str,
+        content_hash: Optional[str] = None,
+        file_size: Optional[int] = None,
+    ) -> Tuple[DocumentModel, bool]:
+        """
+        Create the PENDING record of an uploaded file.
+
+        When both content_hash and file_size are given, file_path is only
+        recorded and need not exist yet.
+
+        Args:
+            file_path: Path to PDF file
+            filename: Original filename
+            content_hash: SHA-256 of the file; computed from the file if
+                not given
+            file_size: Size of the file in bytes; read from the file if
+                not given
+
+        Returns:
+            Tuple of (document, created); created is False when a document
+            with the same content already exists and is returned instead
+
+        Raises:
+            ProcessingError: If the record cannot be created
+        """
         try:
-            # Step 1: Calculate hash and check for duplicates
-            file_size = file_path.stat().st_size
-            content_hash = self.calculate_file_hash(file_path)
+            if file_size is None:
+                file_size = file_path.stat().st_size
+            if content_hash is None:
+                content_hash = self.calculate_file_hash(file_path)
 
             existing_doc = await self.check_duplicate(content_hash)
             if existing_doc:
                 logger.info(f"Document already exists: {content_hash[:16]}...")
-                chunks = await self.chunk_repo.get_by_document_id(existing_doc.id)
-                return existing_doc, chunks
+                return existing_doc, False
 
-            # Step 2: Create document record
             document = DocumentModel(
                 filename=filename,
                 file_path=str(file_path),
@@ -132,19 +187,80 @@ class DocumentProcessingService:
             )
             document = await self.document_repo.create(document)
             await self.document_repo.commit()
+        except Exception as e:
+            logger.error(
+                f"Document registration failed: {str(e)}", exc_info=True)
+            raise ProcessingError(f"Failed to register document: {str(e)}")
+
+        logger.info(f"Created document record: {document.id}")
+        return document, True
+
+    async def reset_document(self, document: DocumentModel) -> None:
+        """
+        Drop a document's chunks and put it back to PENDING for reprocessing.
+
+        Args:
+            document: Document to reprocess
+        """
+        await self.chunk_repo.delete_by_document_id(document.id)
+        await self.document_repo.update_status(
+            document.id, DocumentStatus.PENDING)
+        await self.document_repo.commit()
+        logger.info(f"Reset document for reprocessing: {document.id}")
 
-            logger.info(f"Created document record: {document.id}")
+    async def run_pipeline(
+        self,
+        document: DocumentModel,
+        file_path: Path,
+        use_cache: bool = True,
+        chunk_strategy: str = "section",
+        generate_embeddings: bool = True,
+    ) -> List[ChunkModel]:
+        """
+        Parse, chunk and index a registered document.
 
-            # Step 3: Update status to PROCESSING
+        The document moves from PENDING to PROCESSING and ends up COMPLETED,
+        or FAILED with the error recorded.
+
+        Args:
+            document: Document record from register_document
+            file_path: Path to PDF file
+            use_cache: Whether to use PDF parsing cache
+            chunk_strategy: Chunking strategy ("section", "hybrid", etc.)
+            generate_embeddings: Whether to generate and store embeddings
+
+        Returns:
+            Created chunks
+
+        Raises:
+            ProcessingError: If processing fails
+        """
+        document_id, filename = document.id, document.filename
+        logger.info(f"Starting document processing: {filename}")
+
+        try:
+            # Step 1: Update status to PROCESSING
             await self.document_repo.update_status(
                 document.id,
                 DocumentStatus.PROCESSING
             )
             await self.document_repo.commit()
 
-            # Step 4: Parse PDF and extract metadata
+            # Parsing is CPU-bound and blocking, so each step runs in a
+            # worker thread to keep the event loop serving requests
+
+            # Step 2: Parse PDF and extract metadata
             parser = PDFParser(str(file_path), use_cache=use_cache)
-            metadata = parser.get_metadata()
+            metadata = dict(await asyncio.to_thread(parser.get_metadata) or {})
+
+            # A missing thumbnail is rendered on first request instead
+            try:
+                thumb_path = await asyncio.to_thread(
+                    parser.render_thumbnail,
+                    thumbnail_path_for(file_path, document_id))
+                metadata["thumbnail_path"] = str(thumb_path)
+            except PDFProcessingError as e:
+                logger.warning(f"Thumbnail not rendered for {filename}: {e}")
 
             # Update document with metadata
             if metadata:
@@ -156,13 +272,14 @@ class DocumentProcessingService:
             logger.info(
                 f"Extracted metadata: {metadata.get('pages', 0)} pages")
 
-            # Step 5: Extract structured text
+            # Step 3: Extract structured text
             extractor = PDFExtractor(str(file_path), use_cache=use_cache)
-            structured_text = extractor.extract_structured_text()
+            structured_text = await asyncio.to_thread(
+                extractor.extract_structured_text)
 
             logger.info(f"Extracted text from {len(structured_text)} pages")
 
-            # Step 6: Chunk the document
+            # Step 4: Chunk the document
             chunks_data = await self._chunk_document(
                 structured_text,
                 file_path,
@@ -172,7 +289,7 @@ class DocumentProcessingService:
 
             logger.info(f"Created {len(chunks_data)} chunks")
 
-            # Step 7: Generate embeddings and store in vector DB
+            # Step 5: Generate embeddings and store in vector DB
             # TEMPORARY: Skip vector storage due to ChromaDB compatibility issues
             if False and generate_embeddings and self.retrieval_service:
                 await self._generate_and_store_embeddings(
@@ -186,7 +303,7 @@ class DocumentProcessingService:
                 logger.info(
                     "Skipping vector storage (disabled for compatibility)")
 
-            # Step 8: Update document status
+            # Step 6: Update document status
             await self.document_repo.update_chunk_count(document.id, len(chunks_data))
             await self.document_repo.update_status(
                 document.id,
@@ -196,45 +313,41 @@ class DocumentProcessingService:
 
             logger.info(f"Document processing completed: {document.id}")
 
-            return document, chunks_data
+            return chunks_data
 
         except Exception as e:
             logger.error(
                 f"Document processing failed: {str(e)}", exc_info=True)
 
-            # Update status to FAILED if document was created
-            if 'document' in locals():
-                try:
-                    await self.document_repo.update_status(
-                        document.id,
-                        DocumentStatus.FAILED,
-                        error=str(e)
-                    )
-                    await self.document_repo.commit()
-                except Exception as update_error:
-                    logger.error(
-                        f"Failed to update error status: {update_error}")
+            try:
+                # The session may be unusable after a database error
+                await self.document_repo.rollback()
+                await self.document_repo.update_status(
+                    document_id,
+                    DocumentStatus.FAILED,
+                    error=str(e)
+                )
+                await self.document_repo.commit()
+            except Exception as update_error:
+                logger.error(
+                    f"Failed to update error status: {update_error}")
 
             raise ProcessingError(f"Failed to process document: {str(e)}")
 
-    async def _chunk_document(
-        self,
+    @staticmethod
+    def _split_chunks(
         structured_text: List[dict],
-        pdf_path: Path,
-        document_id: UUID,
-        strategy: str = "section"
-    ) -> List[ChunkModel]:
+        pdf_path: Path
+    ) -> List[dict]:
         """
-        Chunk the document using specified strategy with position information.
+        Split a document into chunk dicts (blocking; run in a worker thread).
 
         Args:
             structured_text: List of page text data
             pdf_path: Path to PDF file
-            document_id: Document UUID
-            strategy: Chunking strategy
 
         Returns:
-            List of created chunk models with bounding box information
+            Chunk dicts, with bounding boxes when positions could be extracted
         """
         # Try to extract text with positions using PyMuPDF
         try:
@@ -262,6 +375,30 @@ class DocumentProcessingService:
                 str(pdf_path)
             )
 
+        return chunks_dict
+
+    async def _chunk_document(
+        self,
+        structured_text: List[dict],
+        pdf_path: Path,
+        document_id: UUID,
+        strategy: str = "section"
+    ) -> List[ChunkModel]:
+        """
+        Chunk the document using specified strategy with position information.
+
+        Args:
+            structured_text: List of page text data
+            pdf_path: Path to PDF file
+            document_id: Document UUID
+            strategy: Chunking strategy
+
+        Returns:
+            List of created chunk models with bounding box information
+        """
+        chunks_dict = await asyncio.to_thread(
+            self._split_chunks, structured_text, pdf_path)
+
         # Convert to ChunkModel instances
         chunk_models = []
         for chunk_dict in chunks_dict:
@@ -303,6 +440,36 @@ class DocumentProcessingService:
         logger.info(f"Saved {len(created_chunks)} chunks to database")
         return created_chunks
 
+    async def _get_cached_embeddings(
+        self,
+        hashes: List[str],
+        model: str
+    ) -> Dict[str, np.ndarray]:
+        """
+        Look up cached embeddings, treating a cache failure as all misses.
+
+        Runs in a savepoint so a failed query does not abort the
+        pipeline's transaction.
+        """
+        try:
+            async with self.embedding_cache_repo.session.begin_nested():
+                return await self.embedding_cache_repo.get_many(hashes, model)
+        except SQLAlchemyError as e:
+            logger.warning(f"Embedding cache lookup failed: {e}")
+            return {}
+
+    async def _cache_embeddings(
+        self,
+        vectors: Dict[str, np.ndarray],
+        model: str
+    ) -> None:
+        """Store new embeddings, ignoring cache failures."""
+        try:
+            async with self.embedding_cache_repo.session.begin_nested():
+                await self.embedding_cache_repo.put_many(vectors, model)
+        except SQLAlchemyError as e:
+            logger.warning(f"Embedding cache update failed: {e}")
+
     async def _generate_and_store_embeddings(
         self,
         chunks: List[ChunkModel],
@@ -336,8 +503,31 @@ class DocumentProcessingService:
             for chunk in chunks
         ]
 
-        # Generate embeddings - KEY FIX: Use encode_batch instead of encode
-        embeddings = self.embedding_service.encode_batch(texts)
+        # Reuse vectors of text embedded before; only the rest is encoded.
+        # Inactive while run_pipeline skips vector storage: nothing reaches
+        # this method, so the embedding cache stays empty until it is
+        # re-enabled
+        model = self.embedding_service.model_name
+        hashes = [hashlib.sha256(text.encode()).hexdigest() for text in texts]
+        vectors = await self._get_cached_embeddings(hashes, model)
+        missing = {h: text for h, text in zip(hashes, texts) if h not in vectors}
+        logger.info(
+            f"Embedding cache: {len(texts) - len(missing)} reused, {len(missing)} to encode")
+
+        if missing:
+            # Encode in one call; the model batches internally. Encoding
+            # and the ChromaDB writes block, so they run in a thread
+            encoded = await asyncio.to_thread(
+                self.embedding_service.encode_batch,
+                list(missing.values()),
+                batch_size=get_settings().embedding_batch_size,
+                show_progress=False,
+            )
+            new_vectors = dict(zip(missing, encoded))
+            await self._cache_embeddings(new_vectors, model)
+            vectors.update(new_vectors)
+
+        embeddings = [vectors[h] for h in hashes]
 
         # Prepare chunks in the format expected by RetrievalService
         chunks_with_embeddings = [
@@ -353,7 +543,8 @@ class DocumentProcessingService:
         ]
 
         # Store in vector database - KEY FIX: RetrievalService.add_documents is not async
-        result = self.retrieval_service.add_documents(
+        result = await asyncio.to_thread(
+            self.retrieval_service.add_documents,
             chunks=chunks_with_embeddings,
             document_id=str(document_id)
         )
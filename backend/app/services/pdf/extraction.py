@@ -3,7 +3,7 @@ PDF 内容提取服务
 提供结构化的文本、表格、图片提取功能
 """
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, Iterator, List, Optional, Any, Tuple
 import re
 
 from loguru import logger
@@ -59,33 +59,10 @@ class PDFExtractor:
             structured_content = []
 
             for page_num, raw_text in text_by_page.items():
-                # 清理文本
-                text = self._clean_text(raw_text) if clean_text else raw_text
-
-                if not text.strip():
-                    continue
-
-                # 构建结构化数据
-                page_data = {
-                    'page_number': page_num + 1,  # 从 1 开始计数
-                    'page_index': page_num,
-                    'text': text,
-                    'char_count': len(text),
-                    'word_count': len(text.split()),
-                    'line_count': len(text.split('\n')),
-                    'dimensions': dimensions.get(page_num, {})
-                }
-
-                # 提取页面标题（启发式：第一行非空文本）
-                lines = [line.strip()
-                         for line in text.split('\n') if line.strip()]
-                if lines:
-                    page_data['first_line'] = lines[0]
-                    page_data['has_content'] = True
-                else:
-                    page_data['has_content'] = False
-
-                structured_content.append(page_data)
+                page_data = self._build_page_data(
+                    page_num, raw_text, dimensions.get(page_num, {}), clean_text)
+                if page_data is not None:
+                    structured_content.append(page_data)
 
             # 保存到缓存
             if self.use_cache and self.cache:
@@ -102,6 +79,98 @@ class PDFExtractor:
             raise PDFProcessingError(
                 f"Failed to extract structured text: {str(e)}")
 
+    def extract_structured_text_iter(
+        self,
+        clean_text: bool = True
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        逐页产出结构化文本，单页格式与 extract_structured_text 相同
+
+        缓存命中时直接从缓存产出；否则边解析边产出，调用方只需保留所需窗口。
+        启用缓存时，完整遍历后将各页写入缓存（提前停止则不写入）
+
+        Args:
+            clean_text: 是否清理文本
+
+        Yields:
+            单页结构化数据
+        """
+        if self.use_cache and self.cache:
+            cached_text = self.cache.load_structured_text(self.pdf_path)
+            if cached_text:
+                logger.info(
+                    f"✅ Loaded structured text from cache ({len(cached_text)} pages)")
+                yield from cached_text
+                return
+
+        # 仅在需要写入缓存时保留已产出的页面
+        structured_content = [] if self.use_cache and self.cache else None
+
+        try:
+            for page_num, raw_text, dimensions in self.parser.iter_pages():
+                page_data = self._build_page_data(
+                    page_num, raw_text, dimensions, clean_text)
+                if page_data is not None:
+                    if structured_content is not None:
+                        structured_content.append(page_data)
+                    yield page_data
+        except Exception as e:
+            logger.error(f"Error iterating structured text: {e}")
+            raise PDFProcessingError(
+                f"Failed to extract structured text: {str(e)}")
+
+        # 保存到缓存
+        if structured_content is not None:
+            self.cache.save_structured_text(self.pdf_path, structured_content)
+            logger.info(f"💾 Saved structured text to cache")
+
+    def _build_page_data(
+        self,
+        page_num: int,
+        raw_text: str,
+        dimensions: Dict[str, float],
+        clean_text: bool
+    ) -> Optional[Dict[str, Any]]:
+        """
+        构建单页结构化数据，空白页返回 None
+
+        Args:
+            page_num: 页码（从 0 开始）
+            raw_text: 原始文本
+            dimensions: 页面尺寸
+            clean_text: 是否清理文本
+
+        Returns:
+            单页结构化数据或 None
+        """
+        # 清理文本
+        text = self._clean_text(raw_text) if clean_text else raw_text
+
+        if not text.strip():
+            return None
+
+        # 构建结构化数据
+        page_data = {
+            'page_number': page_num + 1,  # 从 1 开始计数
+            'page_index': page_num,
+            'text': text,
+            'char_count': len(text),
+            'word_count': len(text.split()),
+            'line_count': len(text.split('\n')),
+            'dimensions': dimensions
+        }
+
+        # 提取页面标题（启发式：第一行非空文本）
+        lines = [line.strip()
+                 for line in text.split('\n') if line.strip()]
+        if lines:
+            page_data['first_line'] = lines[0]
+            page_data['has_content'] = True
+        else:
+            page_data['has_content'] = False
+
+        return page_data
+
     def _clean_text(self, text: str) -> str:
         """
         清理文本
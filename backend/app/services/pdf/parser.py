@@ -3,8 +3,10 @@ PDF 解析器模块
 支持多种 PDF 解析引擎：PyPDF2, pdfplumber, PyMuPDF
 """
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterator, List, Optional, Any, Tuple
+from uuid import uuid4
 import io
+import os
 
 from loguru import logger
 import PyPDF2
@@ -395,6 +397,67 @@ class PDFParser:
             logger.error(f"Error extracting images: {e}")
             raise PDFProcessingError(f"Failed to extract images: {str(e)}")
 
+    def iter_pages(self) -> Iterator[Tuple[int, str, Dict[str, float]]]:
+        """
+        使用 PyMuPDF 逐页产出 (页码, 文本, 尺寸)，不在内存中保留整份文档文本
+
+        Yields:
+            (页码, 页面文本, 页面尺寸) 元组，页码从 0 开始
+        """
+        doc = fitz.open(self.pdf_path)
+        try:
+            for page_num in range(len(doc)):
+                page = doc[page_num]
+                rect = page.rect
+
+                yield page_num, page.get_text(), {
+                    'width': rect.width,
+                    'height': rect.height,
+                    'x0': rect.x0,
+                    'y0': rect.y0,
+                    'x1': rect.x1,
+                    'y1': rect.y1
+                }
+        finally:
+            doc.close()
+
+    def render_thumbnail(self, out_path: str | Path, width: int = 256) -> Path:
+        """
+        使用 PyMuPDF 将首页渲染为 PNG 缩略图
+
+        Args:
+            out_path: PNG 输出路径
+            width: 缩略图宽度（像素），高度按页面比例缩放
+
+        Returns:
+            PNG 文件路径
+        """
+        out_path = Path(out_path)
+        try:
+            doc = fitz.open(self.pdf_path)
+            try:
+                page = doc[0]
+                scale = width / page.rect.width
+                pix = page.get_pixmap(matrix=fitz.Matrix(scale, scale))
+            finally:
+                doc.close()
+
+            out_path.parent.mkdir(parents=True, exist_ok=True)
+            # 先写临时文件再原子替换，避免并发请求读到写了一半的图片；
+            # 临时文件名唯一，并发渲染同一缩略图时互不覆盖
+            tmp_path = out_path.with_name(
+                f"{out_path.stem}.{uuid4().hex}.tmp.png")
+            try:
+                pix.save(str(tmp_path))
+                os.replace(tmp_path, out_path)
+            finally:
+                tmp_path.unlink(missing_ok=True)
+            return out_path
+
+        except Exception as e:
+            logger.error(f"Error rendering thumbnail: {e}")
+            raise PDFProcessingError(f"Failed to render thumbnail: {str(e)}")
+
     def get_page_dimensions(self) -> Dict[int, Dict[str, float]]:
         """
         获取所有页面的尺寸
@@ -15,12 +15,20 @@ from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.exceptions import RequestValidationError
 from fastapi.exception_handlers import request_validation_exception_handler
 from fastapi.requests import Request
+from fastapi.responses import JSONResponse
 
 from app.api.v1 import api_router
+from app.api.responses import OrjsonResponse
 from app.core.config import get_settings
+from app.core.exceptions import (
+    BookmarkNotFoundError,
+    UnauthorizedError,
+    ValidationError,
+)
 from app.core.logging import get_logger
 from app.infrastructure.database.session import close_engine
 from app.infrastructure.ai.gemini_client import close_gemini_client
+from app.infrastructure.cache import close_redis_client
 
 logger = get_logger(__name__)
 settings = get_settings()
@@ -61,7 +69,10 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     logger.info("Shutting down application")
     await close_engine()
     await close_gemini_client()
+    await close_redis_client()
     logger.info("Application shutdown complete")
+    # Flush messages still queued for the enqueued sinks
+    await logger.complete()
 
 
 # Initialize FastAPI application
@@ -72,6 +83,7 @@ app = FastAPI(
     docs_url="/api/docs" if not settings.is_production else None,
     redoc_url="/api/redoc" if not settings.is_production else None,
     openapi_url=f"{settings.api_v1_prefix}/openapi.json",
+    default_response_class=OrjsonResponse,
     lifespan=lifespan
 )
 
@@ -192,6 +204,54 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
     # Delegate to default handler to preserve response format
     return await request_validation_exception_handler(request, exc)
 
+
+@app.exception_handler(Exception)
+async def unhandled_exception_handler(request: Request, exc: Exception):
+    """
+    Log unexpected errors once and return a generic 500.
+    Endpoints no longer wrap their bodies in try/except, so internal error
+    messages are not leaked to clients.
+    """
+    logger.exception(
+        "Unhandled error on {} {}: {}", request.method, request.url.path, exc)
+    return JSONResponse(
+        status_code=500,
+        content={"detail": "Internal server error"},
+    )
+
+
+@app.middleware("http")
+async def unhandled_exception_middleware(request: Request, call_next):
+    """
+    Turn unexpected errors into the generic 500 inside the CORS middleware.
+    Starlette runs Exception handlers outside all user middleware, so
+    responses from unhandled_exception_handler alone lack CORS headers and
+    browsers hide them from the frontend. The handler still covers errors
+    raised by the outer middleware.
+    """
+    try:
+        return await call_next(request)
+    except Exception as exc:
+        return await unhandled_exception_handler(request, exc)
+
+
+@app.exception_handler(BookmarkNotFoundError)
+async def not_found_exception_handler(request: Request, exc: BookmarkNotFoundError):
+    """Map missing (or foreign) resources raised by services to 404."""
+    return JSONResponse(status_code=404, content={"detail": exc.message})
+
+
+@app.exception_handler(UnauthorizedError)
+async def unauthorized_exception_handler(request: Request, exc: UnauthorizedError):
+    """Map authorization failures raised by services to 403."""
+    return JSONResponse(status_code=403, content={"detail": exc.message})
+
+
+@app.exception_handler(ValidationError)
+async def service_validation_exception_handler(request: Request, exc: ValidationError):
+    """Map input rejected by services to 400."""
+    return JSONResponse(status_code=400, content={"detail": exc.message})
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,